@@ -0,0 +1,77 @@
+"""
+async_eval - 顺序求值与并发求值对比
+
+生成 N 个互不依赖的 I/O 节点（每个等待 delay 秒，模拟读文件或调用本地服务），
+每个节点的输出再经过一个 DemoNode，比较：
+- sequential: GraphProgram.execute（逐个等待）
+- async: 协程语义，Core/AsyncEvaluation.py 并发等待
+- executor: 同步阻塞语义，由 Core/AsyncEvaluation.py 放到线程池执行
+
+用法：
+    python benchmarks/async_eval.py [节点数量] [等待秒数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+"""
+
+import asyncio
+import sys
+import time
+
+from DemoPackage.Core.AsyncEvaluation import evaluateSnapshotConcurrently
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.GraphSnapshot import ConnectionRecord, GraphSnapshot, NodeRecord, PinRecord
+from DemoPackage.Core.NodeSemantics import NodeSemantics, registerSemantics
+
+
+def register(delay):
+    async def readAsync(path):
+        await asyncio.sleep(delay)
+        return {"out": len(path) % 2 == 0}
+
+    def readBlocking(path):
+        time.sleep(delay)
+        return {"out": len(path) % 2 == 0}
+
+    registerSemantics("benchReadAsync", NodeSemantics(("path",), ("out",), readAsync))
+    registerSemantics("benchReadBlocking", NodeSemantics(("path",), ("out",), readBlocking))
+
+
+def makeReads(count, typeName):
+    nodes = []
+    connections = []
+    for i in range(count):
+        pins = [PinRecord("path", "in", "StringPin", False, f"file_{i}.txt"), PinRecord("out", "out", "BoolPin")]
+        nodes.append(NodeRecord(f"r{i:06d}", f"Read_{i}", typeName, "DemoPackage", None, 0.0, i * 100.0, pins))
+        pins = [PinRecord("inp", "in", "BoolPin", False, False), PinRecord("out", "out", "BoolPin")]
+        nodes.append(NodeRecord(f"n{i:06d}", f"DemoNode_{i}", "DemoNode", "DemoPackage", None, 200.0, i * 100.0, pins))
+        connections.append(ConnectionRecord(f"r{i:06d}", "out", f"n{i:06d}", "inp"))
+    return GraphSnapshot("reads", nodes, connections)
+
+
+def measure(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(count, delay):
+    register(delay)
+    asyncSnapshot = makeReads(count, "benchReadAsync")
+    blockingSnapshot = makeReads(count, "benchReadBlocking")
+
+    print(f"{count} independent reads, {delay * 1000:.0f} ms each\n")
+    print("| mode | seconds | speedup |")
+    print("|------|---------|---------|")
+    sequential = measure(lambda: GraphProgram.build(blockingSnapshot).execute())
+    print(f"| sequential | {sequential:.3f} | 1.0x |")
+    for mode, snapshot in (("async", asyncSnapshot), ("executor", blockingSnapshot)):
+        seconds = measure(lambda: evaluateSnapshotConcurrently(snapshot))
+        print(f"| {mode} | {seconds:.3f} | {sequential / seconds:.1f}x |")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.02,
+    )
@@ -0,0 +1,70 @@
+"""
+compiled_plan - 重复求值：解释执行、闭包计划与生成代码对比
+
+在同一个图上用不同输入重复求值 repeat 次，比较：
+- interpret: GraphProgram.execute（每步构造参数字典、调用 evaluate、读取结果字典）
+- plan: CompiledPlan.execute（Core/CompiledPlan.py，内存中编译的闭包计划）
+- plan fused: compilePlan(fuse=True)，纯步骤链融合为嵌套表达式（只写入结果槽位）
+- codegen: PythonCodeGen 生成的模块（直线式代码，用于对照）
+
+用法：
+    python benchmarks/compiled_plan.py [链数] [每条链的节点数] [重复次数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+"""
+
+import sys
+import time
+
+from DemoPackage.Core.CompiledPlan import compilePlan
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.PythonCodeGen import generateModule
+from DemoPackage.Core.SyntheticGraphs import makeChains
+
+
+def run(width, length, repeat):
+    program = GraphProgram.build(makeChains(width, length))
+    start = time.perf_counter()
+    plan = compilePlan(program)
+    compileTime = time.perf_counter() - start
+    fused = compilePlan(program, fuse=True)
+    namespace = {"__name__": "compiled_plan_generated"}
+    exec(generateModule(program), namespace)
+    generated = namespace["evaluate"]
+
+    inputs = [{param.name: (i + j) % 3 == 0 for j, param in enumerate(program.params)} for i in range(8)]
+    for overrides in inputs:
+        values = program.execute(overrides)
+        assert plan.execute(overrides) == values
+        assert fused(**overrides) == plan(**overrides)
+        assert generated(**overrides) == {name: values[slot] for name, slot in program.results.items()}
+
+    cases = [
+        ("interpret", lambda overrides: program.execute(overrides)),
+        ("plan", lambda overrides: plan.execute(overrides)),
+        ("plan fused", lambda overrides: fused.execute(overrides)),
+        ("codegen", lambda overrides: generated(**overrides)),
+    ]
+    steps = len(program.steps)
+    print(f"{steps} DemoNodes ({width} chains), {repeat} evaluations, plan compiled in {compileTime * 1000:.1f} ms\n")
+    print("| mode | us/evaluation | nodes/s | speedup |")
+    print("|------|---------------|---------|---------|")
+    baseline = None
+    for mode, fn in cases:
+        start = time.perf_counter()
+        for i in range(repeat):
+            fn(inputs[i % len(inputs)])
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(
+            f"| {mode} | {seconds / repeat * 1e6:.1f} | {steps * repeat / seconds:.0f} | {baseline / seconds:.1f}x |"
+        )
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 20000,
+    )
@@ -0,0 +1,53 @@
+"""
+compression - *.demo 压缩编码对比
+
+生成一个合成的 DemoNode 链式图快照，用每种编码和级别写入内存，
+再读回，输出文件大小、压缩率和读写吞吐量（Markdown 表格）。
+
+用法：
+    python benchmarks/compression.py [节点数量]
+
+说明：
+- 吞吐量按未压缩正文大小计算（MB/s）
+- 需要能导入 DemoPackage（即已安装 uflow）
+"""
+
+import io
+import sys
+import time
+
+from DemoPackage.Core.DemoGraphFormat import readSnapshot, writeSnapshot
+from DemoPackage.Core.SyntheticGraphs import makeChain
+
+CASES = [("none", 0), ("zlib", 1), ("zlib", 6), ("zlib", 9), ("bz2", 1), ("bz2", 9), ("lzma", 0), ("lzma", 6)]
+
+
+def run(count):
+    snapshot = makeChain(count, "compression")
+    raw = io.BytesIO()
+    writeSnapshot(snapshot, raw, codec="none")
+    rawSize = raw.tell()
+
+    print(f"{count} nodes, {rawSize / 1e6:.2f} MB uncompressed\n")
+    print("| codec | level | size (MB) | ratio | write (MB/s) | read (MB/s) |")
+    print("|-------|-------|-----------|-------|--------------|-------------|")
+    for codec, level in CASES:
+        buf = io.BytesIO()
+        start = time.perf_counter()
+        writeSnapshot(snapshot, buf, codec=codec, level=level)
+        writeTime = time.perf_counter() - start
+        size = buf.tell()
+
+        buf.seek(0)
+        start = time.perf_counter()
+        readSnapshot(buf)
+        readTime = time.perf_counter() - start
+
+        print(
+            f"| {codec} | {level} | {size / 1e6:.2f} | {rawSize / size:.1f}x "
+            f"| {rawSize / 1e6 / writeTime:.1f} | {rawSize / 1e6 / readTime:.1f} |"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
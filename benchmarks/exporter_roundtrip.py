@@ -0,0 +1,184 @@
+"""
+exporter_roundtrip - DemoExporter 往返基准测试
+
+在合成图上通过 DemoExporter 的文件读写入口测量 *.demo 文件的导出和导入：
+- 导出：DemoExporter.exportSnapshot（写入临时文件 "<路径>.part"，成功后 os.replace 原子替换）
+- 导入：DemoExporter.importSnapshot（先并行校验各部分的校验和，再边解压边解析）
+
+测量内容：
+- 导出/导入耗时（多次运行取中位数）
+- 写入字节数
+- 导出/导入的内存峰值（tracemalloc，单独运行一次，不计入耗时）
+- 吞吐量（记录数/秒、MB/秒）
+
+结果保存为 JSON，可与之前的结果比较，超过阈值的性能回退以状态码 1 退出，
+适合在 CI 中作为导出器改动的性能门禁。
+
+不包含的部分（需要运行中的编辑器和真实的图对象）：
+- 导出前在主线程中的 GraphSnapshot.capture
+- 导入后在主线程中按时间片重建图（GraphBuilder）
+
+用法：
+    python benchmarks/exporter_roundtrip.py --nodes 20000 --depth 20 --fanout 3 \\
+        --codec none --codec zlib --output results.json
+    python benchmarks/exporter_roundtrip.py ... --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from DemoPackage.Core.SyntheticGraphs import makeLayered
+from DemoPackage.Exporters.DemoExporter import DemoExporter
+
+
+def exportFile(snapshot, path, codec, level):
+    return DemoExporter.exportSnapshot(path, snapshot, codec, level)
+
+
+def importFile(path):
+    return DemoExporter.importSnapshot(path)
+
+
+def measure(fn, repeat):
+    """返回 (中位耗时秒数, 最后一次的返回值)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def peakMemory(fn):
+    """返回 fn 运行期间 tracemalloc 记录的内存峰值（字节）"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(args):
+    snapshot = makeLayered(
+        args.nodes, args.depth, args.fanout, args.greet_ratio, args.payload_ratio, args.seed
+    )
+    records = len(snapshot.nodes) + len(snapshot.connections) + snapshot.valueCount()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for spec in args.codec:
+            codec, _, level = spec.partition(":")
+            level = int(level) if level else None
+            path = os.path.join(tmp, f"bench-{codec}.demo")
+
+            exportTime, _ = measure(lambda: exportFile(snapshot, path, codec, level), args.repeat)
+            size = os.path.getsize(path)
+            importTime, _ = measure(lambda: importFile(path), args.repeat)
+            results.append(
+                {
+                    "codec": spec,
+                    "bytes": size,
+                    "records": records,
+                    "exportSeconds": exportTime,
+                    "importSeconds": importTime,
+                    "exportRecordsPerSecond": records / exportTime,
+                    "importRecordsPerSecond": records / importTime,
+                    "exportMBPerSecond": size / 1e6 / exportTime,
+                    "importMBPerSecond": size / 1e6 / importTime,
+                    "exportPeakBytes": peakMemory(lambda: exportFile(snapshot, path, codec, level)),
+                    "importPeakBytes": peakMemory(lambda: importFile(path)),
+                }
+            )
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "nodes": args.nodes,
+                "depth": args.depth,
+                "fanout": args.fanout,
+                "greetRatio": args.greet_ratio,
+                "payloadRatio": args.payload_ratio,
+                "seed": args.seed,
+                "repeat": args.repeat,
+                "connections": len(snapshot.connections),
+            },
+        },
+        "results": results,
+    }
+
+
+def printTable(report):
+    print("| codec | size (MB) | export (s) | import (s) | export (rec/s) | import (rec/s) | export peak (MB) | import peak (MB) |")
+    print("|-------|-----------|------------|------------|----------------|----------------|------------------|------------------|")
+    for r in report["results"]:
+        print(
+            f"| {r['codec']} | {r['bytes'] / 1e6:.2f} | {r['exportSeconds']:.3f} | {r['importSeconds']:.3f} "
+            f"| {r['exportRecordsPerSecond']:.0f} | {r['importRecordsPerSecond']:.0f} "
+            f"| {r['exportPeakBytes'] / 1e6:.1f} | {r['importPeakBytes'] / 1e6:.1f} |"
+        )
+
+
+def compare(report, baseline, threshold):
+    """
+    与基线比较
+
+    返回：
+        list: 回退描述列表，空列表表示没有超过阈值的回退
+    """
+    if report["meta"]["params"] != baseline["meta"]["params"]:
+        print("warning: benchmark parameters differ from the baseline")
+    old = {r["codec"]: r for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        base = old.get(r["codec"])
+        if base is None:
+            continue
+        for key in ("exportSeconds", "importSeconds", "bytes", "exportPeakBytes", "importPeakBytes"):
+            if base[key] and (r[key] - base[key]) / base[key] > threshold:
+                regressions.append(f"{r['codec']} {key}: {base[key]:.4g} -> {r[key]:.4g}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--fanout", type=int, default=2)
+    parser.add_argument("--greet-ratio", type=float, default=0.05)
+    parser.add_argument("--payload-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--codec", action="append", help="codec[:level], may be repeated (default: none, zlib)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON produced by a previous run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression (default 0.10)")
+    args = parser.parse_args(argv)
+    args.codec = args.codec or ["none", "zlib"]
+
+    report = run(args)
+    printTable(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+graph_optimizer - 图优化：优化耗时、删除的节点数，并校验优化前后的结果一致
+
+在以下合成图上运行 optimizeSnapshot（Core/GraphOptimizer.py）：
+- chains: 并排的 DemoNode 链（只有纯节点）
+- chains+greet: 同样的链再加一个不相连的 demoLibGreet（纯节点和不纯节点混合）
+- dag: 含 demoLibGreet 的随机 DAG
+- chains+greet keep: 同上，只需要第一条链的末尾节点（keep，相当于在画布上选中它）：
+  其余链是死节点
+- chains nofold: 关闭常量折叠和取反链合并，只剩纯步骤融合（编译计划中每条链融合为 2 个步骤）
+
+每种图都检查：
+- 优化前后 GraphProgram 的结果（没有被下游使用的输出；给出 keep 时为 keep 中节点的输出）完全相同
+- 没有给出 keep 时，没有被下游使用的纯节点全部保留（图中有不纯的节点时也不能被当作死节点删除）
+- 融合纯步骤链的编译计划（compilePlan(fuse=True)）与解释执行的结果相同
+
+用法：
+    python benchmarks/graph_optimizer.py [链数] [每条链的节点数] [DAG 节点数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 任一检查失败时抛出 AssertionError
+"""
+
+import sys
+import time
+
+from DemoPackage.Core.CompiledPlan import compilePlan
+from DemoPackage.Core.GraphOptimizer import optimizeSnapshot
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.GraphSnapshot import GraphSnapshot, NodeRecord, PinRecord
+from DemoPackage.Core.SyntheticGraphs import makeChains, makeRandomDag
+
+
+def withGreet(snapshot):
+    pins = [
+        PinRecord("inExec", "in", "ExecPin", True),
+        PinRecord("word", "in", "StringPin", False, "hello"),
+        PinRecord("outExec", "out", "ExecPin", True),
+    ]
+    greet = NodeRecord("greet", "demoLibGreet", "demoLibGreet", "DemoPackage", "DemoLib", 0.0, -200.0, pins)
+    return GraphSnapshot(f"{snapshot.name}+greet", list(snapshot.nodes) + [greet], list(snapshot.connections))
+
+
+def terminals(snapshot):
+    sources = {c.srcNode for c in snapshot.connections}
+    return {n.uid for n in snapshot.nodes if n.type == "DemoNode" and n.uid not in sources}
+
+
+def check(snapshot, keep=(), **options):
+    start = time.perf_counter()
+    result = optimizeSnapshot(snapshot, keep=keep, **options)
+    seconds = time.perf_counter() - start
+
+    needed = set(keep) or terminals(snapshot)
+    missing = needed - {n.uid for n in result.snapshot.nodes}
+    assert not missing, f"{snapshot.name}: {len(missing)} result nodes removed ({result.report.summary()})"
+    names = {f"{n.name}.out" for n in snapshot.nodes if n.uid in needed}
+    before = GraphProgram.build(snapshot).interpret()
+    program = GraphProgram.build(result.snapshot)
+    after = program.interpret()
+    assert {k: v for k, v in before.items() if k in names} == {k: v for k, v in after.items() if k in names}, (
+        f"{snapshot.name}: results changed ({result.report.summary()})"
+    )
+    assert compilePlan(program, fuse=True)() == after, f"{snapshot.name}: fused plan results differ"
+    return result.report, seconds
+
+
+def run(width, length, dagSize):
+    chains = makeChains(width, length)
+    first = min(terminals(chains))
+    cases = [
+        ("chains", chains, (), {}),
+        ("chains+greet", withGreet(chains), (), {}),
+        ("dag", makeRandomDag(dagSize, fanIn=2, fanOut=2, greetRatio=0.2), (), {}),
+        ("chains+greet keep", withGreet(chains), (first,), {}),
+        ("chains nofold", chains, (), {"constants": False, "negations": False}),
+    ]
+    print("| graph | nodes | removed | dead | folded | collapsed | fused | steps | optimize ms |")
+    print("|-------|-------|---------|------|--------|-----------|-------|-------|-------------|")
+    for label, snapshot, keep, options in cases:
+        report, seconds = check(snapshot, keep, **options)
+        print(
+            f"| {label} | {report.nodesBefore} | {report.removed} | {report.dead} | {report.folded} | "
+            f"{report.collapsed} | {report.fused} | {report.stepsBefore} -> {report.stepsAfter} | {seconds * 1000:.1f} |"
+        )
+    print("\nall results preserved")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 2000,
+    )
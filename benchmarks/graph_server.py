@@ -0,0 +1,78 @@
+"""
+graph_server - 小请求的冷启动求值与常驻服务对比
+
+把合成图保存为 *.demo 文件，用不同输入对它求值 requests 次，比较每次请求的耗时：
+- cold: 每次启动一个 demo-batch 进程（解释器启动、导入、读取和编译图都计入）
+- warm: GraphClient.evaluate，每个请求一次往返（Core/GraphServer.py，连接池复用连接）
+- pipelined: GraphClient.evaluateMany，同一连接上连续发送多个请求再依次读取响应
+- batch: GraphClient.evaluateBatch，所有记录放在一个请求中
+
+用法：
+    python benchmarks/graph_server.py [请求数] [工作进程数] [tcp|unix]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 服务在本进程的后台线程中运行；工作进程数为 0 时在服务线程中直接求值
+- cold 只运行前 5 个请求（每个请求需要数百毫秒）
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from DemoPackage.Core.DemoGraphFormat import writeSnapshot
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.GraphServer import GraphClient, GraphServer
+from DemoPackage.Core.SyntheticGraphs import makeChains
+
+
+def run(count, workers, transport):
+    snapshot = makeChains(4, 25)
+    program = GraphProgram.build(snapshot)
+    rows = [{param.name: (i + j) % 3 == 0 for j, param in enumerate(program.params)} for i in range(count)]
+    expected = [program.interpret(**row) for row in rows]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "graph.demo")
+        with open(path, "wb") as f:
+            writeSnapshot(snapshot, f)
+        address = f"unix:{os.path.join(directory, 'graphs.sock')}" if transport == "unix" else "127.0.0.1:0"
+        server = GraphServer({"bench": path}, address, workers).start()
+        client = GraphClient(server.address)
+        try:
+            print(f"{count} requests, {len(program.steps)} nodes, {workers} workers, {server.address}\n")
+            print("| mode | us/request |")
+            print("|------|------------|")
+
+            cold = rows[:5]
+            start = time.perf_counter()
+            for row in cold:
+                line = "{" + ", ".join(f'"{k}": {str(v).lower()}' for k, v in row.items()) + "}\n"
+                command = [sys.executable, "-m", "DemoPackage.Core.BatchRunner", path, "--no-verify"]
+                subprocess.run(command, input=line, capture_output=True, text=True, check=True)
+            print(f"| cold | {(time.perf_counter() - start) / len(cold) * 1e6:.0f} |")
+
+            cases = [
+                ("warm", lambda: [client.evaluate("bench", row) for row in rows]),
+                ("pipelined", lambda: client.evaluateMany("bench", rows)),
+                ("batch", lambda: client.evaluateBatch("bench", rows)),
+            ]
+            for name, fn in cases:
+                start = time.perf_counter()
+                results = fn()
+                seconds = time.perf_counter() - start
+                assert results == expected
+                print(f"| {name} | {seconds / count * 1e6:.0f} |")
+        finally:
+            client.close()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2,
+        sys.argv[3] if len(sys.argv) > 3 else "tcp",
+    )
@@ -0,0 +1,69 @@
+"""
+incremental - 增量求值与完整求值对比
+
+在 count 个 DemoNode 组成的图上，每一帧修改一个随机选择的输入，比较：
+- full: 每帧完整执行 GraphProgram（GraphProgram.execute）
+- incremental: IncrementalEngine.update()，只计算受影响的下游锥（Core/IncrementalEvaluation.py）
+
+用法：
+    python benchmarks/incremental.py [节点数量] [帧数] [链长度]
+
+图的形状：count / length 条并排的 DemoNode 链，每条 length 个节点；
+修改一条链的输入时，受影响的下游锥是该链上被修改节点之后的部分。
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 每帧结束后校验增量结果与完整求值一致（校验不计入耗时）
+"""
+
+import random
+import sys
+import time
+
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.IncrementalEvaluation import IncrementalEngine
+from DemoPackage.Core.SyntheticGraphs import makeChains
+
+
+def run(count, ticks, length):
+    program = GraphProgram.build(makeChains(max(1, count // length), length))
+    engine = IncrementalEngine(program)
+    start = time.perf_counter()
+    engine.evaluate()
+    initial = time.perf_counter() - start
+
+    rng = random.Random(0)
+    overrides = {param.name: param.default for param in program.params}
+    fullTime = incrementalTime = 0.0
+    recomputed = 0
+    for _ in range(ticks):
+        param = rng.choice(program.params)
+        overrides[param.name] = not overrides[param.name]
+
+        start = time.perf_counter()
+        expected = program.execute(overrides)
+        fullTime += time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.setInput(param.name, overrides[param.name])
+        recomputed += engine.update()
+        incrementalTime += time.perf_counter() - start
+        assert engine.values == expected
+
+    steps = len(program.steps)
+    print(f"{steps} DemoNodes in chains of {length}, {ticks} ticks, initial evaluation {initial:.3f}s\n")
+    print("| mode | ms/tick | nodes/tick | speedup |")
+    print("|------|---------|------------|---------|")
+    print(f"| full | {fullTime / ticks * 1000:.2f} | {steps} | 1.0x |")
+    print(
+        f"| incremental | {incrementalTime / ticks * 1000:.3f} | {recomputed / ticks:.1f} "
+        f"| {fullTime / incrementalTime:.0f}x |"
+    )
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 100,
+    )
@@ -0,0 +1,61 @@
+"""
+parallel_scaling - 按依赖关系并行求值的线程扩展性
+
+在两种图上用 1 到 N 个线程运行 Core/ParallelEvaluation.py，输出耗时和相对顺序求值的加速比：
+- chains: width 条并排的 DemoNode 链（每条 length 个节点），互不相连
+- tree: 同样节点数的 DemoNode 树（扇出 4），只有一个连通分量，靠就绪集合并行
+
+用法：
+    python benchmarks/parallel_scaling.py [链数] [每条链的节点数] [最大线程数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 只有自由线程版本（如 python3.13t）才能看到加速；GIL 版本中多线程不会更快，
+  结果用于确认并行路径的额外开销
+- 每个配置运行 repeat 次取最小值
+"""
+
+import os
+import sys
+import time
+
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.ParallelEvaluation import executeParallel, isFreeThreaded
+from DemoPackage.Core.SyntheticGraphs import makeChains, makeTree
+
+
+def measure(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(width, length, maxThreads):
+    print(f"{width * length} DemoNodes, free-threaded: {isFreeThreaded()}, {os.cpu_count()} CPUs\n")
+    print("| graph | threads | seconds | nodes/s | speedup |")
+    print("|-------|---------|---------|---------|---------|")
+    for label, snapshot in (("chains", makeChains(width, length)), ("tree", makeTree(width * length, fanOut=4))):
+        program = GraphProgram.build(snapshot)
+        expected = program.execute()
+        serial = measure(program.execute)
+        print(f"| {label} | serial | {serial:.3f} | {len(program.steps) / serial:.0f} | 1.0x |")
+        threads = 1
+        while threads <= maxThreads:
+            assert executeParallel(program, workers=threads, parallel=True) == expected
+            seconds = measure(lambda: executeParallel(program, workers=threads, parallel=True))
+            print(
+                f"| {label} | {threads} | {seconds:.3f} | {len(program.steps) / seconds:.0f} | {serial / seconds:.1f}x |"
+            )
+            threads *= 2
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 64,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1),
+    )
@@ -0,0 +1,72 @@
+"""
+process_offload - CPU 密集节点的线程池与进程池对比
+
+生成 N 个互不依赖的 CPU 密集节点（纯 Python 循环，持有 GIL），比较：
+- sequential: GraphProgram.execute（逐个计算）
+- threads: 同步阻塞语义，Core/AsyncEvaluation.py 放到线程池执行（受 GIL 限制）
+- processes: offloadSemantics()，在常驻进程池中计算（Core/ProcessOffload.py）
+
+用法：
+    python benchmarks/process_offload.py [节点数量] [每个节点的迭代次数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 进程池在计时前预热（warmUp），计时不包含工作进程的启动时间
+"""
+
+import os
+import sys
+import time
+
+from DemoPackage.Core.AsyncEvaluation import evaluateSnapshotConcurrently
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.GraphSnapshot import GraphSnapshot, NodeRecord, PinRecord
+from DemoPackage.Core.NodeSemantics import NodeSemantics, registerSemantics
+from DemoPackage.Core.ProcessOffload import offloadSemantics, warmUp
+
+
+def burn(iterations):
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return {"out": total}
+
+
+def makeBurns(count, iterations, typeName):
+    nodes = []
+    for i in range(count):
+        pins = [PinRecord("iterations", "in", "IntPin", False, iterations), PinRecord("out", "out", "IntPin")]
+        nodes.append(NodeRecord(f"b{i:06d}", f"Burn_{i}", typeName, "DemoPackage", None, 0.0, i * 100.0, pins))
+    return GraphSnapshot("burns", nodes, [])
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(count, iterations):
+    registerSemantics("benchBurn", NodeSemantics(("iterations",), ("out",), burn))
+    registerSemantics("benchBurnOffload", offloadSemantics(burn, ("iterations",), ("out",)))
+    workers = warmUp()
+
+    print(f"{count} independent nodes, {iterations} iterations each, {os.cpu_count()} CPUs, {workers} workers\n")
+    print("| mode | seconds | speedup |")
+    print("|------|---------|---------|")
+    snapshot = makeBurns(count, iterations, "benchBurn")
+    program = GraphProgram.build(snapshot)
+    sequential, expected = measure(lambda: program.outputValues(program.execute()))
+    print(f"| sequential | {sequential:.3f} | 1.0x |")
+    for mode, typeName in (("threads", "benchBurn"), ("processes", "benchBurnOffload")):
+        snapshot = makeBurns(count, iterations, typeName)
+        seconds, values = measure(lambda: evaluateSnapshotConcurrently(snapshot))
+        assert values == expected
+        print(f"| {mode} | {seconds:.3f} | {sequential / seconds:.1f}x |")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000000,
+    )
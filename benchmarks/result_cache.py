@@ -0,0 +1,81 @@
+"""
+result_cache - 持久化结果缓存的冷启动、命中与部分失效对比
+
+在并排的链上（每个节点是一个耗时的纯计算），比较：
+- plain: GraphProgram.execute（不使用缓存）
+- cold: executeCached，空缓存（计算所有步骤并写入缓存）
+- warm: executeCached，新打开同一个数据库（模拟新会话），所有结果都已缓存
+- one-input: 修改一条链的输入，只有这条链需要重新计算
+
+用法：
+    python benchmarks/result_cache.py [链数] [每条链的节点数] [每个节点的迭代次数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 缓存数据库放在临时目录中，运行结束后删除
+- 迭代次数为 0 时节点几乎没有计算量，可以看到缓存本身的开销（哈希、查询、写入）
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.NodeSemantics import NodeSemantics, registerSemantics
+from DemoPackage.Core.ResultCache import ResultCache, executeCached
+from DemoPackage.Core.SyntheticGraphs import makeChains
+
+
+def makeCostly(iterations):
+    def evaluate(inp):
+        total = 0
+        for i in range(iterations):
+            total += i % 7
+        return {"out": not inp}
+
+    return evaluate
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(width, length, iterations):
+    registerSemantics("benchCostly", NodeSemantics(("inp",), ("out",), makeCostly(iterations)))
+    chains = makeChains(width, length)
+    for node in chains.nodes:
+        node.type = "benchCostly"
+    program = GraphProgram.build(chains)
+    results = list(program.results.values())
+    # 每条链的输入不同，避免相同的链互相命中
+    inputs = {param.name: index for index, param in enumerate(program.params)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.sqlite")
+        plain, expected = measure(lambda: program.execute(inputs))
+        cold, values = measure(lambda: executeCached(program, ResultCache(path), inputs))
+        assert [values[s] for s in results] == [expected[s] for s in results]
+        warm, values = measure(lambda: executeCached(program, ResultCache(path), inputs))
+        assert [values[s] for s in results] == [expected[s] for s in results]
+        changedInputs = dict(inputs, **{program.params[0].name: -1})
+        changed, values = measure(lambda: executeCached(program, ResultCache(path), changedInputs))
+        expected = program.execute(changedInputs)
+        assert [values[s] for s in results] == [expected[s] for s in results]
+        stats = ResultCache(path).stats()
+
+    print(f"{width} chains x {length} nodes, {iterations} iterations per node, {stats['entries']} cached entries\n")
+    print("| mode | ms | speedup |")
+    print("|------|----|---------|")
+    for name, seconds in (("plain", plain), ("cold", cold), ("warm", warm), ("one-input", changed)):
+        print(f"| {name} | {seconds * 1000:.1f} | {plain / seconds:.1f}x |")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 2000,
+    )
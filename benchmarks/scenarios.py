@@ -0,0 +1,66 @@
+"""
+scenarios - 多场景求值：逐个场景解释执行与进程池列式求值对比
+
+在同一个图上求值 count 组输入（每组随机设置所有参数），比较：
+- loop: 逐个场景调用 GraphProgram.execute（相当于 "修改引脚再求值" 的循环，只用一个核心）
+- plan: ScenarioPool(workers=1)，当前进程中的编译计划（Core/Scenarios.py）
+- pool: ScenarioPool(workers=N)，N 个工作进程，每个持有一份编译好的图（计时前已预热）
+
+用法：
+    python benchmarks/scenarios.py [场景数] [工作进程数] [链数] [每条链的节点数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 进程池的加速比取决于 CPU 核心数；单核机器上只能看到编译计划本身的收益
+"""
+
+import os
+import random
+import sys
+import time
+
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.Scenarios import ScenarioPool
+from DemoPackage.Core.SyntheticGraphs import makeChains
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(count, workers, width, length):
+    snapshot = makeChains(width, length)
+    program = GraphProgram.build(snapshot)
+    rng = random.Random(0)
+    scenarios = [{param.name: rng.random() < 0.5 for param in program.params} for _ in range(count)]
+
+    def loop():
+        columns = {name: [] for name in program.results}
+        for scenario in scenarios:
+            values = program.execute(scenario)
+            for name, slot in program.results.items():
+                columns[name].append(values[slot])
+        return columns
+
+    print(f"{count} scenarios, {len(program.steps)} nodes, {workers} workers, {os.cpu_count()} CPUs\n")
+    print("| mode | seconds | scenarios/s | speedup |")
+    print("|------|---------|-------------|---------|")
+    baseline, expected = measure(loop)
+    print(f"| loop | {baseline:.3f} | {count / baseline:.0f} | 1.0x |")
+    with ScenarioPool(snapshot, workers=1) as inline, ScenarioPool(snapshot, workers=workers) as pool:
+        pool.evaluate(scenarios[: workers * 64])
+        for name, target in (("plan", inline), ("pool", pool)):
+            seconds, columns = measure(lambda: target.evaluate(scenarios))
+            assert {name: list(column) for name, column in columns.items()} == expected
+            print(f"| {name} | {seconds:.3f} | {count / seconds:.0f} | {baseline / seconds:.1f}x |")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1),
+        int(sys.argv[3]) if len(sys.argv) > 3 else 8,
+        int(sys.argv[4]) if len(sys.argv) > 4 else 25,
+    )
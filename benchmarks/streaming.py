@@ -0,0 +1,106 @@
+"""
+streaming - 流式流水线与逐批求值的对比
+
+两组测量：
+- I/O 阶段重叠：一条由 N 个阻塞节点（每条记录等待 delay 秒，模拟读文件或调用本地服务）组成的链，
+  比较逐条 CompiledPlan.execute（阶段依次等待）与 StreamPipeline（每个节点一个阶段，阶段之间重叠）
+- 内存：一条 DemoNode 链处理大量记录，比较先生成全部记录和结果的列表（materialized）
+  与流式处理（streaming）的内存峰值
+
+用法：
+    python benchmarks/streaming.py [阻塞记录数] [阻塞节点数] [等待秒数] [内存测量记录数]
+
+说明：
+- 需要能导入 DemoPackage（即已安装 uflow）
+- 内存峰值用 tracemalloc 测量，只包含 Python 分配
+"""
+
+import sys
+import time
+import tracemalloc
+
+from DemoPackage.Core.CompiledPlan import compilePlan
+from DemoPackage.Core.GraphProgram import GraphProgram
+from DemoPackage.Core.NodeSemantics import NodeSemantics, registerSemantics
+from DemoPackage.Core.Streaming import StreamPipeline
+from DemoPackage.Core.SyntheticGraphs import makeChains
+
+
+def register(delay):
+    def read(inp):
+        time.sleep(delay)
+        return {"out": not inp}
+
+    registerSemantics("benchStreamRead", NodeSemantics(("inp",), ("out",), read))
+
+
+def measure(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def peakMemory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def runBlocking(count, length, delay):
+    register(delay)
+    chain = makeChains(1, length)
+    for node in chain.nodes:
+        node.type = "benchStreamRead"
+    program = GraphProgram.build(chain)
+    plan = compilePlan(program)
+    name = program.params[0].name
+    pipeline = StreamPipeline(program, [name], chunkSize=8)
+    records = [{name: i % 2 == 0} for i in range(count)]
+    (result,) = pipeline.select
+    slot = program.results[result]
+
+    sequential, expected = measure(lambda: [plan.execute(record)[slot] for record in records])
+    streamed, rows = measure(lambda: [row[result] for row in pipeline.run(records)])
+    assert rows == expected
+
+    print(f"{count} records x {length} blocking nodes, {delay * 1000:.1f} ms per node, {len(pipeline.stages)} stages\n")
+    print("| mode | s | records/s | speedup |")
+    print("|------|---|-----------|---------|")
+    for mode, seconds in (("sequential", sequential), ("pipeline", streamed)):
+        print(f"| {mode} | {seconds:.3f} | {count / seconds:.0f} | {sequential / seconds:.1f}x |")
+
+
+def runMemory(count):
+    program = GraphProgram.build(makeChains(1, 20))
+    plan = compilePlan(program)
+    name = program.params[0].name
+    pipeline = StreamPipeline(program, [name])
+    (result,) = pipeline.select
+    slot = program.results[result]
+
+    def materialized():
+        records = [{name: i % 2 == 0} for i in range(count)]
+        values = [plan.execute(record)[slot] for record in records]
+        return sum(values)
+
+    def streaming():
+        return sum(row[result] for row in pipeline.run({name: i % 2 == 0} for i in range(count)))
+
+    print(f"\n{count} records through 20 DemoNodes\n")
+    print("| mode | s | peak MB |")
+    print("|------|---|---------|")
+    for mode, fn in (("materialized", materialized), ("streaming", streaming)):
+        seconds, _ = measure(fn)
+        print(f"| {mode} | {seconds:.2f} | {peakMemory(fn) / 1e6:.1f} |")
+
+
+if __name__ == "__main__":
+    runBlocking(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.001,
+    )
+    runMemory(int(sys.argv[4]) if len(sys.argv) > 4 else 500000)
@@ -0,0 +1,308 @@
+"""
+AsyncEvaluation - 基于 asyncio 的并发求值
+
+GraphProgram.execute 按拓扑顺序逐个执行步骤：图中有 50 个互不依赖的文件读取或
+本地服务调用时，总耗时是 50 次等待之和。这里在 asyncio 事件循环上求值同一个程序：
+- 每个步骤是一个 asyncio 任务，只等待产生其输入槽位的上游步骤，
+  互不依赖的分支同时等待，总耗时接近最长的一条依赖链
+- 语义的 evaluate 是协程函数（async def）时直接 await
+- 同步语义通过线程池执行（run_in_executor），不会阻塞事件循环；
+  NodeSemantics.blocking 为 False 的廉价节点（如 DemoNode）直接在事件循环中执行
+- 有副作用的步骤（pure=False，如 demoLibGreet）之间保持程序顺序，不会并发
+
+类节点的异步 compute：
+- 继承 AsyncComputeMixin 的节点类可以声明 async def compute，
+  框架同步调用 compute 时由 runCoroutine() 执行到完成
+- 节点类同时声明 computeInputs/computeOutputs（数据引脚名称）时，
+  自动按 compute 生成并注册协程语义（computeSemantics），在快照上并发求值时直接 await 节点的 compute，
+  不需要另外编写 evaluate
+
+使用方式：
+    values = await evaluateSnapshotAsync(snapshot)          # 已在事件循环中
+    values = evaluateSnapshotConcurrently(snapshot, token)  # 普通线程（如 BackgroundTask）
+
+注意：
+- 本模块不依赖 Qt；事件循环运行在调用线程中，不要在界面线程中调用 evaluateSnapshotConcurrently
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+
+from . import Instrumentation
+from .GraphProgram import GraphProgram
+from .NodeSemantics import NodeSemantics, registerSemantics, standInNode
+from .Tasks import TaskCancelled
+
+#: 检查取消令牌的间隔（秒）
+CANCEL_POLL_INTERVAL = 0.05
+
+_loops = threading.local()
+
+
+class _ThreadLoop(object):
+    """线程专用的事件循环：线程结束时线程局部存储被释放，事件循环随之关闭（不泄漏文件描述符）"""
+
+    def __init__(self):
+        super(_ThreadLoop, self).__init__()
+        self.loop = asyncio.new_event_loop()
+
+    def close(self):
+        if not self.loop.is_closed():
+            self.loop.close()
+
+    def __del__(self):
+        self.close()
+
+
+def closeThreadLoop():
+    """
+    关闭 runCoroutine() 为当前线程创建的事件循环（没有时不做任何事）
+
+    线程结束时会自动关闭；长期运行、之后不再求值的线程（如 BackgroundTask 的工作线程）可以提前调用。
+    """
+    holder = getattr(_loops, "holder", None)
+    if holder is not None:
+        _loops.holder = None
+        holder.close()
+
+
+def runCoroutine(coroutine):
+    """
+    在同步代码中执行协程并返回结果
+
+    参数：
+        coroutine: 协程对象
+
+    返回：
+        协程的返回值
+
+    说明：
+    - 当前线程没有运行中的事件循环时，使用该线程专用的事件循环（复用，避免每次创建；
+      线程结束或调用 closeThreadLoop() 时关闭）
+    - 当前线程已有运行中的事件循环时（不能嵌套），每次调用都在一个新的辅助线程中
+      用 asyncio.run 执行并等待结果（事件循环随辅助线程一起关闭）；协程中再次调用 runCoroutine 时同样处理，
+      不会因为等待同一个辅助线程而死锁
+    - 辅助线程继承调用方的上下文（currentToken() 等 contextvars）
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        holder = getattr(_loops, "holder", None)
+        if holder is None or holder.loop.is_closed():
+            holder = _loops.holder = _ThreadLoop()
+        return holder.loop.run_until_complete(coroutine)
+
+    outcome = {}
+    context = contextvars.copy_context()
+
+    def run():
+        try:
+            outcome["result"] = context.run(asyncio.run, coroutine)
+        except BaseException as e:
+            outcome["error"] = e
+
+    helper = threading.Thread(target=run, name="DemoAsyncHelper", daemon=True)
+    helper.start()
+    helper.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def computeSemantics(cls, inputs, outputs, pure=True, version=1):
+    """
+    根据类节点的 async def compute 生成协程语义
+
+    与 NodeSemantics.classSemantics 相同：在 standInNode() 创建的实例上 await 节点的 compute，
+    然后读取输出引脚的值（compute 只能访问声明过的引脚）。
+
+    参数：
+        cls (type): 继承 AsyncComputeMixin 的节点类
+        inputs (tuple): 数据输入引脚名称
+        outputs (tuple): 数据输出引脚名称
+        pure (bool): 是否是纯节点
+        version (int): 语义版本
+
+    返回：
+        NodeSemantics
+    """
+    compute = cls.computeAsync
+
+    async def evaluate(**kwargs):
+        node, pins = standInNode(cls, inputs, outputs, kwargs)
+        await compute(node)
+        return {name: pin.value for name, pin in pins.items()}
+
+    return NodeSemantics(inputs, outputs, evaluate, pure=pure, version=version)
+
+
+class AsyncComputeMixin(object):
+    """
+    允许类节点声明 async def compute
+
+    框架同步调用 compute，协程函数会被替换为一个同步包装，
+    由 runCoroutine() 执行到完成；原协程函数保存为 computeAsync。
+
+    声明 computeInputs（可以为空元组）时，还会用 computeSemantics() 按 compute 生成协程语义，
+    以类名注册：快照上的求值器直接 await 节点的 compute，互不依赖的节点同时等待。
+
+    属性：
+    - computeInputs (tuple): 数据输入引脚名称，None 表示不注册语义
+    - computeOutputs (tuple): 数据输出引脚名称
+    - computePure (bool): compute 是否没有副作用
+
+    使用方式：
+        class FileReaderNode(AsyncComputeMixin, NodeBase):
+            computeInputs = ("path",)
+            computeOutputs = ("out",)
+
+            async def compute(self, *args, **kwargs):
+                text = await asyncio.to_thread(readText, self.path.getData())
+                self.out.setData(text)
+    """
+
+    computeInputs = None
+    computeOutputs = ()
+    computePure = True
+
+    def __init_subclass__(cls, **kwargs):
+        super(AsyncComputeMixin, cls).__init_subclass__(**kwargs)
+        compute = cls.__dict__.get("compute")
+        if not inspect.iscoroutinefunction(compute):
+            return
+
+        @functools.wraps(compute)
+        def computeSync(self, *args, **kwargs):
+            return runCoroutine(self.computeAsync(*args, **kwargs))
+
+        cls.computeAsync = compute
+        cls.compute = computeSync
+        if cls.computeInputs is not None:
+            registerSemantics(
+                cls.__name__, computeSemantics(cls, cls.computeInputs, cls.computeOutputs, cls.computePure)
+            )
+
+
+async def _watchToken(token, tasks):
+    while not token.isCancelled():
+        await asyncio.sleep(CANCEL_POLL_INTERVAL)
+    for task in tasks:
+        task.cancel()
+
+
+async def executeAsync(program, overrides=None, token=None, report=None, executor=None):
+    """
+    在当前事件循环上并发执行程序
+
+    参数：
+        program (GraphProgram): 图程序
+        overrides (dict): 参数名 -> 值，覆盖快照中的默认值
+        token (CancellationToken): 可选的取消令牌（定期检查，等待中的步骤会被取消）
+        report (callable): 可选的进度回调 report(done, total, message)
+        executor: 同步语义使用的执行器，默认为事件循环的默认线程池
+
+    返回：
+        list: 槽位值列表，与 GraphProgram.execute 相同
+
+    异常：
+        TaskCancelled: 令牌被取消
+    """
+    loop = asyncio.get_running_loop()
+    overrides = overrides or {}
+    values = [None] * program.slotCount
+    for param in program.params:
+        values[param.slot] = overrides.get(param.name, param.default)
+    total = len(program.steps)
+    finished = [0]
+    listeners = Instrumentation.stepListeners()
+
+    async def run(step, dependencies):
+        if dependencies:
+            await asyncio.gather(*dependencies)
+        if token is not None:
+            token.raiseIfCancelled()
+        semantics = step.semantics
+        kwargs = {name: values[slot] for name, slot in step.args.items()}
+        if listeners:
+            start = time.perf_counter_ns()
+        if semantics.isAsync:
+            out = await semantics.evaluate(**kwargs)
+        elif semantics.blocking:
+            out = await loop.run_in_executor(executor, functools.partial(semantics.evaluate, **kwargs))
+        else:
+            out = semantics.evaluate(**kwargs)
+        if listeners:
+            Instrumentation.recordStep(listeners, step, start)
+        for name, slot in step.outSlots.items():
+            values[slot] = out.get(name)
+        finished[0] += 1
+        if report is not None:
+            report(finished[0], total, "Evaluating")
+
+    producers = {}
+    lastEffect = None
+    tasks = []
+    for step in program.steps:
+        dependencies = {producers[slot] for slot in step.args.values() if slot in producers}
+        if not step.semantics.pure and lastEffect is not None:
+            # 副作用按程序顺序执行（与执行链顺序一致）
+            dependencies.add(lastEffect)
+        task = loop.create_task(run(step, dependencies))
+        for slot in step.outSlots.values():
+            producers[slot] = task
+        if not step.semantics.pure:
+            lastEffect = task
+        tasks.append(task)
+
+    watcher = loop.create_task(_watchToken(token, tasks)) if token is not None else None
+    try:
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        if token is not None and token.isCancelled():
+            # 令牌说明取消原因（超过时间预算时抛出 BudgetExceeded）
+            token.raiseIfCancelled()
+            raise TaskCancelled()
+        raise
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return values
+
+
+async def evaluateSnapshotAsync(snapshot, token=None, report=None, executor=None):
+    """
+    在快照上并发求值图（协程）
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+        token (CancellationToken): 可选的取消令牌
+        report (callable): 可选的进度回调 report(done, total, message)
+        executor: 同步语义使用的执行器
+
+    返回：
+        dict: (节点 uid, 输出引脚名) -> 值，与 Evaluation.evaluateSnapshot 相同
+
+    异常：
+        UnsupportedNodeError: 存在未注册语义的节点类型
+        GraphCycleError: 存在环
+        TaskCancelled: 令牌被取消
+    """
+    program = GraphProgram.build(snapshot)
+    values = await executeAsync(program, token=token, report=report, executor=executor)
+    return program.outputValues(values)
+
+
+def evaluateSnapshotConcurrently(snapshot, token=None, report=None, executor=None):
+    """
+    在快照上并发求值图（同步接口，在调用线程中运行事件循环）
+
+    参数和返回值同 evaluateSnapshotAsync
+    """
+    return runCoroutine(evaluateSnapshotAsync(snapshot, token, report, executor))
@@ -0,0 +1,491 @@
+"""
+BatchRunner - 无界面的批量求值命令行
+
+读取保存的 *.demo 图（不需要 Qt），把每条输入记录的字段绑定到图的参数，
+求值后把结果逐条写出。用于在生产任务中处理无法通过界面完成的大量数据：
+- 图只编译一次（Core/CompiledPlan.py 的 PlanCache，loadPlan()），每条记录只是一次 plan.execute()
+- 输入逐批读取、逐批写出：同时在内存中的记录数不超过 批大小 x (2 x 工作进程数 + 1)，
+  与输入总行数无关
+- --workers 大于 1 时使用 spawn 进程池，每个工作进程读取并编译一次图，
+  之后只传输记录批次；输出顺序与输入顺序相同
+
+输入和输出格式：
+- JSONL：每行一个 JSON 对象；值按 DemoGraphFormat.decodeValue/encodeValue 编解码
+- CSV：第一行是列名；字段按参数默认值的类型转换（bool/int/float/str），空字段使用默认值
+
+绑定：
+- 默认按名称绑定：字段名与参数名（GraphProgram.params，如 DemoNode_0_inp）相同时绑定
+- --bind 参数名=字段名 显式指定；没有对应字段的参数使用图中保存的值
+- --list 列出图的参数和结果名
+
+使用方式：
+    demo-batch graph.demo --list
+    demo-batch graph.demo -i rows.jsonl -o results.jsonl --batch-size 2000 --workers 8
+    cat rows.csv | demo-batch graph.demo --format csv --bind DemoNode_0_inp=flag --keep id > out.csv
+    python -m DemoPackage.Core.BatchRunner graph.demo -i rows.jsonl
+
+退出码：
+- 0：全部记录成功
+- 1：有记录求值失败（--on-error skip 时其余记录仍然写出）
+- 2：参数错误或图无法加载
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .CompiledPlan import PlanCache, compilePlan
+from .DemoGraphFormat import DemoFormatError, decodeValue, encodeValue, readSnapshot, verifyFile
+from .GraphProgram import GraphProgram
+
+FORMATS = ("jsonl", "csv")
+TRUE_STRINGS = frozenset(("1", "true", "yes", "on"))
+FALSE_STRINGS = frozenset(("0", "false", "no", "off"))
+
+_job = None
+_plans = PlanCache()
+
+
+class BatchError(Exception):
+    """记录求值失败（带有记录编号，从 1 开始）"""
+
+    def __init__(self, index, message):
+        super(BatchError, self).__init__(f"record {index}: {message}")
+        self.index = index
+        self.message = message
+
+    def __reduce__(self):
+        # 从工作进程传回时按构造参数重建（默认的异常序列化只保存格式化后的信息）
+        return (type(self), (self.index, self.message))
+
+
+def loadSnapshot(path, verify=True):
+    """
+    读取 *.demo 文件
+
+    参数：
+        path (str): 文件路径
+        verify (bool): 是否先校验各部分的校验和
+
+    返回：
+        GraphSnapshot
+
+    异常：
+        OSError: 文件无法读取
+        DemoFormatError: 文件格式错误或校验失败
+    """
+    if verify:
+        bad = [r.name for r in verifyFile(path) if not r.ok]
+        if bad:
+            raise DemoFormatError(f"corrupt sections {', '.join(bad)}")
+    with open(path, "rb") as f:
+        return readSnapshot(f)
+
+
+def loadProgram(path, verify=True):
+    """
+    读取 *.demo 文件并构建图程序
+
+    参数：
+        path (str): 文件路径
+        verify (bool): 是否先校验各部分的校验和
+
+    返回：
+        GraphProgram
+
+    异常：
+        OSError: 文件无法读取
+        DemoFormatError: 文件格式错误或校验失败
+        UnsupportedNodeError: 存在未注册语义的节点类型
+    """
+    return GraphProgram.build(loadSnapshot(path, verify))
+
+
+def loadPlan(path, verify=True, cache=None):
+    """
+    读取 *.demo 文件并取得融合的执行计划（只读取结果槽位的调用方使用）
+
+    参数：
+        path (str): 文件路径
+        verify (bool): 是否先校验各部分的校验和
+        cache (PlanCache): 计划缓存，默认为本模块共享的缓存；
+            文件重新读取后拓扑不变时复用已编译的计划，只更新参数默认值
+
+    返回：
+        CompiledPlan: program 属性是（融合后的）图程序
+
+    异常：
+        OSError: 文件无法读取
+        DemoFormatError: 文件格式错误或校验失败
+        UnsupportedNodeError: 存在未注册语义的节点类型
+    """
+    return (cache or _plans).get(loadSnapshot(path, verify), fuse=True)
+
+
+def coerceText(text, default):
+    """
+    把 CSV 字段转换为与参数默认值相同的类型
+
+    参数：
+        text (str): 字段文本
+        default: 参数默认值
+
+    返回：
+        转换后的值；默认值不是 bool/int/float/str 时按 JSON 解析
+
+    异常：
+        ValueError: 文本不能转换为该类型
+    """
+    if isinstance(default, bool):
+        lowered = text.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+        raise ValueError(f"not a boolean: {text!r}")
+    if isinstance(default, int):
+        return int(text)
+    if isinstance(default, float):
+        return float(text)
+    if default is None or isinstance(default, str):
+        return text
+    return decodeValue(json.loads(text))
+
+
+class BatchJob(object):
+    """
+    一个工作进程（或 --workers 1 时的当前进程）中的求值任务
+
+    关键属性：
+    - plan (CompiledPlan): 编译后的执行计划
+    - bindings (tuple): (参数名, 字段名, 默认值)
+    - results (tuple): (结果名, 槽位)
+    - keep (tuple): 原样复制到输出的输入字段
+
+    关键方法：
+    - runBatch(start, records): 求值一批记录，返回输出行和错误
+    """
+
+    def __init__(self, program, bindings, select=None, keep=(), csvInput=False, skipErrors=False, plan=None):
+        """
+        参数：
+            program (GraphProgram): 图程序
+            bindings (dict): 参数名 -> 字段名（见 bindFields）
+            select (list): 输出的结果名，默认为所有结果
+            keep (iterable): 原样复制到输出的输入字段
+            csvInput (bool): 记录是否是 CSV 文本（按参数默认值的类型转换）
+            skipErrors (bool): 跳过失败的记录，而不是抛出 BatchError
+            plan (CompiledPlan): 已编译的计划（如 loadPlan() 的结果），默认按 program 编译
+        """
+        super(BatchJob, self).__init__()
+        # 每条记录只读取结果槽位：融合纯步骤链
+        self.plan = plan if plan is not None else compilePlan(program, fuse=True)
+        defaults = self.plan.paramDefaults()
+        self.bindings = tuple((name, field, defaults[name]) for name, field in bindings.items())
+        names = select or list(program.results)
+        self.results = tuple((name, program.results[name]) for name in names)
+        self.keep = tuple(keep)
+        self.csvInput = csvInput
+        self.skipErrors = skipErrors
+
+    def runBatch(self, start, records):
+        """
+        求值一批记录
+
+        参数：
+            start (int): 第一条记录的编号（从 1 开始，用于错误信息）
+            records (list): 字段名 -> 值（CSV 为文本，JSONL 为已解码的 JSON 数据）
+
+        返回：
+            tuple: (输出行列表, 错误信息列表)
+
+        异常：
+            BatchError: 有记录失败且没有开启 skipErrors
+        """
+        execute = self.plan.execute
+        rows = []
+        errors = []
+        for index, record in enumerate(records, start):
+            try:
+                overrides = {}
+                for name, field, default in self.bindings:
+                    value = record.get(field)
+                    if value is None or (self.csvInput and value == ""):
+                        continue
+                    overrides[name] = coerceText(value, default) if self.csvInput else decodeValue(value)
+                values = execute(overrides)
+            except Exception as e:
+                if not self.skipErrors:
+                    raise BatchError(index, f"{type(e).__name__}: {e}") from None
+                errors.append(f"record {index}: {type(e).__name__}: {e}")
+                continue
+            row = {field: record.get(field) for field in self.keep}
+            for name, slot in self.results:
+                row[name] = values[slot]
+            rows.append(row)
+        return rows, errors
+
+
+def bindFields(program, fields, explicit):
+    """
+    确定参数与字段的对应关系
+
+    参数：
+        program (GraphProgram): 图程序
+        fields (list): 输入的字段名；None 表示未知（JSONL），此时所有参数按同名字段绑定
+        explicit (dict): --bind 指定的 参数名 -> 字段名
+
+    返回：
+        dict: 参数名 -> 字段名
+
+    异常：
+        KeyError: --bind 中的参数名不存在
+    """
+    params = {param.name for param in program.params}
+    for name in explicit:
+        if name not in params:
+            raise KeyError(name)
+    bindings = {}
+    for param in program.params:
+        field = explicit.get(param.name, param.name)
+        if fields is None or field in fields or param.name in explicit:
+            bindings[param.name] = field
+    return bindings
+
+
+def _initWorker(path, verify, bindings, select, keep, csvInput, skipErrors):
+    global _job
+    plan = loadPlan(path, verify)
+    _job = BatchJob(plan.program, bindings, select, keep, csvInput, skipErrors, plan=plan)
+
+
+def _runWorkerBatch(start, records):
+    return _job.runBatch(start, records)
+
+
+def iterBatches(records, batchSize):
+    """
+    把记录流切分为批次
+
+    参数：
+        records: 记录迭代器
+        batchSize (int): 每批的记录数
+
+    返回：
+        生成器：(第一条记录的编号, 记录列表)
+    """
+    start = 1
+    while True:
+        batch = list(islice(records, batchSize))
+        if not batch:
+            return
+        yield start, batch
+        start += len(batch)
+
+
+def readJsonl(stream):
+    """逐行读取 JSON 对象（跳过空行）"""
+    for line in stream:
+        if line.strip():
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"expected a JSON object per line, got {type(record).__name__}")
+            yield record
+
+
+class JsonlWriter(object):
+    """逐行写出 JSON 对象"""
+
+    def __init__(self, stream, fields):
+        super(JsonlWriter, self).__init__()
+        self.stream = stream
+
+    def write(self, rows):
+        self.stream.write("".join(json.dumps(encodeValue(row), ensure_ascii=False) + "\n" for row in rows))
+
+
+class CsvWriter(object):
+    """逐行写出 CSV（第一行是列名）；非标量值写为 JSON 文本"""
+
+    def __init__(self, stream, fields):
+        super(CsvWriter, self).__init__()
+        self.fields = fields
+        self.writer = csv.writer(stream, lineterminator="\n")
+        self.writer.writerow(fields)
+
+    def write(self, rows):
+        self.writer.writerows([_csvCell(row.get(field)) for field in self.fields] for row in rows)
+
+
+def _csvCell(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return json.dumps(encodeValue(value), ensure_ascii=False)
+
+
+def _guessFormat(path, fallback="jsonl"):
+    if path and path != "-" and path.lower().endswith(".csv"):
+        return "csv"
+    return fallback
+
+
+def _parseBindings(parser, items):
+    bindings = {}
+    for item in items:
+        name, sep, field = item.partition("=")
+        if not sep or not name or not field:
+            parser.error(f"--bind expects PARAM=FIELD, got {item!r}")
+        bindings[name] = field
+    return bindings
+
+
+def runBatches(batches, job=None, pool=None, maxPending=1):
+    """
+    按输入顺序产生每批的求值结果
+
+    参数：
+        batches: iterBatches() 的生成器
+        job (BatchJob): 在当前进程中求值时使用
+        pool (ProcessPoolExecutor): 在工作进程中求值时使用（工作进程已通过初始化函数创建任务）
+        maxPending (int): 进程池中同时未完成的批次数上限（限制内存占用）
+
+    返回：
+        生成器：(输出行列表, 错误信息列表)
+    """
+    if pool is None:
+        for start, records in batches:
+            yield job.runBatch(start, records)
+        return
+
+    pending = deque()
+    for start, records in batches:
+        pending.append(pool.submit(_runWorkerBatch, start, records))
+        if len(pending) >= maxPending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def main(argv=None):
+    """
+    命令行入口（pyproject.toml 中注册为 demo-batch）
+
+    参数：
+        argv (list): 命令行参数，默认为 sys.argv[1:]
+
+    返回：
+        int: 退出码
+    """
+    parser = argparse.ArgumentParser(prog="demo-batch", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("graph", help="saved graph (*.demo)")
+    parser.add_argument("-i", "--input", default="-", help="input file, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from extension, else jsonl)")
+    parser.add_argument("--output-format", choices=FORMATS, help="output format (default: from extension, else input format)")
+    parser.add_argument("--bind", action="append", default=[], metavar="PARAM=FIELD", help="bind a graph input to a record field")
+    parser.add_argument("--select", action="append", metavar="RESULT", help="result to write (default: all results)")
+    parser.add_argument("--keep", action="append", default=[], metavar="FIELD", help="copy an input field to the output")
+    parser.add_argument("--batch-size", type=int, default=1000, help="records per batch (default: 1000)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes; 1 evaluates in-process (default: 1)")
+    parser.add_argument("--on-error", choices=("stop", "skip"), default="stop", help="stop at the first failing record, or skip it")
+    parser.add_argument("--no-verify", action="store_true", help="skip the checksum verification of the graph file")
+    parser.add_argument("--list", action="store_true", help="list the graph inputs and results and exit")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.workers < 1:
+        parser.error("--batch-size and --workers must be at least 1")
+
+    try:
+        plan = loadPlan(args.graph, not args.no_verify)
+    except Exception as e:
+        print(f"demo-batch: cannot load {args.graph}: {type(e).__name__}: {e}", file=sys.stderr)
+        return 2
+
+    program = plan.program
+    if args.list:
+        for param in program.params:
+            print(f"input  {param.name} = {param.default!r}")
+        for name in program.results:
+            print(f"result {name}")
+        return 0
+
+    select = args.select or list(program.results)
+    unknown = [name for name in select if name not in program.results]
+    if unknown:
+        parser.error(f"unknown result {', '.join(unknown)} (see --list)")
+    explicit = _parseBindings(parser, args.bind)
+    inputFormat = args.format or _guessFormat(args.input)
+    outputFormat = args.output_format or _guessFormat(args.output, inputFormat)
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    pool = None
+    failed = 0
+    written = 0
+    began = time.perf_counter()
+    try:
+        if inputFormat == "csv":
+            reader = csv.DictReader(source)
+            fields = reader.fieldnames or []
+            records = iter(reader)
+        else:
+            fields = None
+            records = readJsonl(source)
+        try:
+            bindings = bindFields(program, fields, explicit)
+        except KeyError as e:
+            parser.error(f"unknown input {e.args[0]} (see --list)")
+
+        writer = (CsvWriter if outputFormat == "csv" else JsonlWriter)(sink, list(args.keep) + select)
+        options = (bindings, select, args.keep, inputFormat == "csv", args.on_error == "skip")
+        if args.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=args.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initWorker,
+                initargs=(os.path.abspath(args.graph), False) + options,
+            )
+            job = None
+        else:
+            job = BatchJob(program, *options, plan=plan)
+
+        batches = iterBatches(records, args.batch_size)
+        for rows, errors in runBatches(batches, job, pool, 2 * args.workers):
+            writer.write(rows)
+            written += len(rows)
+            failed += len(errors)
+            for message in errors:
+                print(f"demo-batch: {message}", file=sys.stderr)
+        sink.flush()
+    except BatchError as e:
+        print(f"demo-batch: {e}", file=sys.stderr)
+        return 1
+    except (ValueError, csv.Error) as e:
+        print(f"demo-batch: bad input: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # 下游提前关闭（如 | head）：丢弃剩余输出，避免解释器退出时再次报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    seconds = time.perf_counter() - began
+    rate = written / seconds if seconds > 0 else 0.0
+    print(f"demo-batch: {written} records written, {failed} failed, {seconds:.2f} s ({rate:.0f} records/s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Codecs - 流式压缩编解码
+
+为 *.demo 文件提供基于标准库的流式压缩（zlib、bz2、lzma）。
+写入时边序列化边压缩，读取时边解压边解析，
+任何时刻内存中都只有一个固定大小的数据块，不会持有完整的未压缩内容。
+
+支持的编码：
+- "none": 不压缩
+- "zlib": 速度快，压缩率中等（级别 0-9，默认 6）
+- "bz2":  速度较慢，压缩率较高（级别 1-9，默认 9）
+- "lzma": 速度最慢，压缩率最高（预设 0-9，默认 6）
+
+使用方式：
+    raw = open(path, "wb")
+    body = openWriter(raw, "zlib", 6)      # 返回二进制可写流
+    body.write(b"...")
+    body.close()                           # 刷新压缩器（不会关闭 raw）
+
+    raw = open(path, "rb")
+    body = openReader(raw, "zlib")         # 返回二进制可读流（支持 readline）
+"""
+
+import bz2
+import io
+import lzma
+import zlib
+
+#: 支持的编码名称
+CODECS = ("none", "zlib", "bz2", "lzma")
+
+#: 各编码的 (最小级别, 最大级别, 默认级别)
+LEVELS = {
+    "none": (0, 0, 0),
+    "zlib": (0, 9, 6),
+    "bz2": (1, 9, 9),
+    "lzma": (0, 9, 6),
+}
+
+#: 每次从底层流读取的压缩数据块大小
+CHUNK_SIZE = 64 * 1024
+
+
+def normalizeLevel(codec, level=None):
+    """
+    校验并规范化压缩级别
+
+    参数：
+        codec (str): 编码名称
+        level (int): 压缩级别，None 表示使用默认值
+
+    返回：
+        int: 限制在合法范围内的级别
+
+    异常：
+        ValueError: 未知的编码名称
+    """
+    if codec not in LEVELS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {CODECS}")
+    low, high, default = LEVELS[codec]
+    if level is None:
+        return default
+    return max(low, min(high, int(level)))
+
+
+def _compressor(codec, level):
+    if codec == "zlib":
+        return zlib.compressobj(level)
+    if codec == "bz2":
+        return bz2.BZ2Compressor(level)
+    if codec == "lzma":
+        return lzma.LZMACompressor(preset=level)
+    return None
+
+
+class _CompressingWriter(io.RawIOBase):
+    """把写入的数据增量压缩后写到底层流"""
+
+    def __init__(self, raw, codec, level):
+        super(_CompressingWriter, self).__init__()
+        self._raw = raw
+        self._compressor = _compressor(codec, level)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        if self._compressor is None:
+            self._raw.write(data)
+        else:
+            out = self._compressor.compress(data)
+            if out:
+                self._raw.write(out)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            if self._compressor is not None:
+                self._raw.write(self._compressor.flush())
+                self._compressor = None
+            self._raw.flush()
+        super(_CompressingWriter, self).close()
+
+
+class _DecompressingReader(io.RawIOBase):
+    """从底层流读取压缩数据并按需增量解压"""
+
+    def __init__(self, raw, codec):
+        super(_DecompressingReader, self).__init__()
+        self._raw = raw
+        self._codec = codec
+        if codec == "zlib":
+            self._decompressor = zlib.decompressobj()
+        elif codec == "bz2":
+            self._decompressor = bz2.BZ2Decompressor()
+        elif codec == "lzma":
+            self._decompressor = lzma.LZMADecompressor()
+        else:
+            self._decompressor = None
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = len(buffer)
+        if self._decompressor is None:
+            data = self._raw.read(size)
+        else:
+            data = self._decompress(size)
+        buffer[: len(data)] = data
+        return len(data)
+
+    def _decompress(self, size):
+        d = self._decompressor
+        while not self._eof:
+            if self._codec == "zlib":
+                pending = d.unconsumed_tail
+                chunk = pending if pending else self._raw.read(CHUNK_SIZE)
+                data = d.decompress(chunk, size)
+                if d.eof or (not chunk and not data):
+                    self._eof = True
+                    data += d.flush()
+            else:
+                chunk = self._raw.read(CHUNK_SIZE) if d.needs_input else b""
+                if d.needs_input and not chunk:
+                    self._eof = True
+                    return b""
+                data = d.decompress(chunk, size)
+                if d.eof:
+                    self._eof = True
+            if data:
+                return data
+        return b""
+
+
+def openWriter(raw, codec="none", level=None):
+    """
+    打开压缩写入流
+
+    参数：
+        raw: 底层二进制可写流（如 open(path, "wb")）
+        codec (str): 编码名称
+        level (int): 压缩级别
+
+    返回：
+        BufferedWriter: 二进制可写流，close() 时刷新压缩器但不关闭 raw
+    """
+    level = normalizeLevel(codec, level)
+    return io.BufferedWriter(_CompressingWriter(raw, codec, level), CHUNK_SIZE)
+
+
+def openReader(raw, codec="none"):
+    """
+    打开解压读取流
+
+    参数：
+        raw: 底层二进制可读流，位置应在压缩数据的开头
+        codec (str): 编码名称
+
+    返回：
+        BufferedReader: 二进制可读流，支持 read() 和 readline()
+    """
+    normalizeLevel(codec)
+    return io.BufferedReader(_DecompressingReader(raw, codec), CHUNK_SIZE)
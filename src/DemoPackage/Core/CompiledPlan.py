@@ -0,0 +1,290 @@
+"""
+CompiledPlan - 内存中的闭包执行计划
+
+PythonCodeGen 把图编译为 Python 文件；这里在内存中完成同样的事情，
+用于同一拓扑、不同输入的大量重复求值：
+- 每个步骤编译为一个预先绑定的可调用对象 op(values)，槽位编号在编译时确定
+- 有表达式模板的单输出步骤（如 DemoNode 的 "(not {inp})"）编译为直接读写槽位的小函数，
+  不再构造参数字典和结果字典
+- 其他步骤编译为绑定了 evaluate、参数槽位和输出槽位的闭包
+- 运行时只是 "复制默认值数组，写入参数，依次调用 op"，没有引脚查找、脏标记和分发
+- fuse=True 时先把首尾相接的单输入单输出纯步骤融合为一个 op（GraphOptimizer.fusePureChains），
+  DemoNode 链编译为一个嵌套的表达式；只有结果槽位被写入，按步骤读取中间值的调用方
+  （Streaming、outputValues 写回图）不要使用
+
+拓扑变化时自动重新编译（PlanCache）：
+- 缓存键是拓扑签名：节点 (uid, 名称, 类型, 引脚集合) 和连接，不包含引脚值
+- 拓扑相同、只有输入值不同的快照复用已编译的 op，返回的计划参数默认值取自这个快照（rebind）
+- BatchRunner、Scenarios、Streaming 和 GraphServer 通过 PlanCache 取得计划：
+  图文件修改或快照重新读取时，拓扑不变就不重新编译
+
+使用方式：
+    plan = compilePlan(GraphProgram.build(snapshot))
+    for row in rows:
+        results = plan(**row)                     # 结果名 -> 值
+
+    cache = PlanCache()
+    plan = cache.get(snapshot)                    # 拓扑未变化时不重新编译
+    values = plan.execute()                       # 默认值取自 snapshot
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from . import Instrumentation
+from .GraphOptimizer import fusePureChains
+from .GraphProgram import GraphProgram
+
+
+def topologySignature(snapshot):
+    """
+    快照的拓扑签名（可哈希，不包含引脚值）
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+
+    返回：
+        tuple: 节点 (uid, 名称, 类型, 引脚集合) 和连接，均已排序
+
+    说明：
+    - 节点名称决定参数名和结果名，引脚集合决定参数和槽位，二者变化时都必须重新编译
+    """
+    nodes = tuple(
+        sorted(
+            (
+                node.uid,
+                node.name,
+                node.type,
+                tuple(sorted((pin.name, pin.direction, pin.dataType, pin.isExec) for pin in node.pins)),
+            )
+            for node in snapshot.nodes
+        )
+    )
+    connections = tuple(sorted(c.key() for c in snapshot.connections))
+    return (nodes, connections)
+
+
+def _compileExpression(step, namespace):
+    semantics = step.semantics
+    (outSlot,) = step.outSlots.values()
+    args = {name: f"v[{slot}]" for name, slot in step.args.items()}
+    source = f"def op(v):\n    v[{outSlot}] = {semantics.render(semantics.expression, args)}\n"
+    local = {}
+    exec(compile(source, f"<plan step {step.name}>", "exec"), namespace, local)
+    return local["op"]
+
+
+def _compileGeneric(step):
+    evaluate = step.semantics.evaluate
+    argItems = tuple(step.args.items())
+    outItems = tuple(step.outSlots.items())
+    if step.semantics.isAsync:
+        from .AsyncEvaluation import runCoroutine
+
+        asyncEvaluate = evaluate
+
+        def evaluate(**kwargs):
+            return runCoroutine(asyncEvaluate(**kwargs))
+
+    if len(argItems) == 1 and len(outItems) == 1:
+        ((argName, argSlot),) = argItems
+        ((outName, outSlot),) = outItems
+
+        def op(v):
+            v[outSlot] = evaluate(**{argName: v[argSlot]}).get(outName)
+
+        return op
+
+    def op(v):
+        out = evaluate(**{name: v[slot] for name, slot in argItems})
+        for name, slot in outItems:
+            v[slot] = out.get(name)
+
+    return op
+
+
+class CompiledPlan(object):
+    """
+    编译后的执行计划
+
+    关键属性：
+    - program (GraphProgram): 编译来源（fuse=True 时是融合后的程序）
+    - ops (list): 按执行顺序排列的 op(values)
+
+    关键方法：
+    - execute(overrides): 执行，返回槽位值列表（与 GraphProgram.execute 相同）
+    - __call__(**params): 执行，返回结果字典（与 GraphProgram.interpret 相同）
+    - bindSnapshot(snapshot): 从拓扑相同的快照读取参数值
+    - rebind(snapshot): 共享 op、参数默认值取自拓扑相同的快照的计划
+    - paramDefaults(): 参数名 -> 默认值
+    """
+
+    def __init__(self, program, ops):
+        super(CompiledPlan, self).__init__()
+        self.program = program
+        self.ops = ops
+        self._defaults = [None] * program.slotCount
+        for param in program.params:
+            self._defaults[param.slot] = param.default
+        self._paramSlots = {param.name: param.slot for param in program.params}
+        self._results = tuple(program.results.items())
+
+    def execute(self, overrides=None):
+        """
+        执行计划
+
+        参数：
+            overrides (dict): 参数名 -> 值，覆盖编译时的默认值
+
+        返回：
+            list: 槽位值列表
+
+        异常：
+            KeyError: 参数名不存在
+        """
+        values = self._defaults.copy()
+        if overrides:
+            paramSlots = self._paramSlots
+            for name, value in overrides.items():
+                values[paramSlots[name]] = value
+        listeners = Instrumentation.stepListeners()
+        if listeners:
+            for step, op in zip(self.program.steps, self.ops):
+                start = time.perf_counter_ns()
+                op(values)
+                Instrumentation.recordStep(listeners, step, start)
+            return values
+        for op in self.ops:
+            op(values)
+        return values
+
+    def __call__(self, **params):
+        values = self.execute(params)
+        return {name: values[slot] for name, slot in self._results}
+
+    def bindSnapshot(self, snapshot):
+        """
+        从拓扑相同的快照读取参数值
+
+        参数：
+            snapshot (GraphSnapshot): 快照（拓扑必须与编译来源相同）
+
+        返回：
+            dict: 参数名 -> 值（可直接传给 execute）
+        """
+        overrides = {}
+        for param in self.program.params:
+            node = snapshot.getNode(param.nodeUid)
+            pin = node.getPin(param.pinName, "in") if node is not None else None
+            if pin is not None:
+                overrides[param.name] = pin.value
+        return overrides
+
+    def rebind(self, snapshot):
+        """
+        返回共享 op 的计划，参数默认值取自拓扑相同的快照（不重新编译）
+
+        参数：
+            snapshot (GraphSnapshot): 快照（拓扑必须与编译来源相同）
+
+        返回：
+            CompiledPlan
+        """
+        plan = copy.copy(self)
+        plan._defaults = self._defaults.copy()
+        for name, value in self.bindSnapshot(snapshot).items():
+            plan._defaults[self._paramSlots[name]] = value
+        return plan
+
+    def paramDefaults(self):
+        """参数名 -> 默认值（rebind() 之后与 program.params 中的默认值可能不同）"""
+        return {name: self._defaults[slot] for name, slot in self._paramSlots.items()}
+
+    def outputValues(self, values):
+        """槽位值 -> (节点 uid, 输出引脚名) 字典（与 GraphProgram.outputValues 相同）"""
+        return self.program.outputValues(values)
+
+
+def compilePlan(program, fuse=False):
+    """
+    把程序编译为执行计划
+
+    参数：
+        program (GraphProgram): 图程序
+        fuse (bool): 是否融合纯步骤链（只保证结果槽位被写入）
+
+    返回：
+        CompiledPlan
+    """
+    if fuse:
+        program = fusePureChains(program)
+    namespace = {}
+    imported = set()
+    ops = []
+    for step in program.steps:
+        semantics = step.semantics
+        if semantics.expression is not None and len(semantics.outputs) == 1 and not semantics.isAsync:
+            for statement in semantics.imports:
+                if statement not in imported:
+                    imported.add(statement)
+                    exec(statement, namespace)
+            ops.append(_compileExpression(step, namespace))
+        else:
+            ops.append(_compileGeneric(step))
+    return CompiledPlan(program, ops)
+
+
+class PlanCache(object):
+    """
+    按拓扑签名缓存执行计划（最近最少使用淘汰）
+
+    关键方法：
+    - get(snapshot, fuse): 返回拓扑相同的计划（默认值取自 snapshot），没有时编译
+
+    线程安全：可以在多个线程中共享（编译在锁外进行，同一拓扑同时编译时保留先完成的一个）
+    """
+
+    def __init__(self, maxSize=8):
+        super(PlanCache, self).__init__()
+        self.maxSize = maxSize
+        self.compiles = 0
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, snapshot, fuse=False):
+        """
+        获取快照对应的执行计划
+
+        参数：
+            snapshot (GraphSnapshot): 图快照
+            fuse (bool): 是否融合纯步骤链（见 compilePlan），融合与否分别缓存
+
+        返回：
+            CompiledPlan: 参数默认值取自 snapshot
+
+        异常：
+            UnsupportedNodeError: 存在未注册语义的节点类型
+            GraphCycleError: 存在环
+        """
+        key = (topologySignature(snapshot), fuse)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+        if plan is not None:
+            return plan.rebind(snapshot)
+        plan = compilePlan(GraphProgram.build(snapshot), fuse)
+        with self._lock:
+            self.compiles += 1
+            plan = self._plans.setdefault(key, plan)
+            self._plans.move_to_end(key)
+            if len(self._plans) > self.maxSize:
+                self._plans.popitem(last=False)
+        return plan.rebind(snapshot)
+
+    def clear(self):
+        """清空缓存（例如注册了新的节点语义之后）"""
+        with self._lock:
+            self._plans.clear()
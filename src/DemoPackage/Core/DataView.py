@@ -0,0 +1,230 @@
+"""
+DataView - 大数据的按需表格视图
+
+把任意引脚数据包装为"行 x 列"的只读表格接口，供虚拟化的表格模型使用。
+所有访问都是按行进行的，不会复制或展开整个数据：
+- 序列（list、tuple、array、numpy 数组、range 等）：按下标直接访问，
+  元素本身是序列时（如二维数组、元组列表）按元素展开为多列
+- 字节数据（bytes、bytearray、memoryview、mmap）：每行 16 字节的十六进制视图
+- 字典：两列（键、值）；集合等有长度的可迭代对象：单列。
+  两者都按需读取：只把迭代器推进到请求过的最大行号，缓存已读到的键/元素引用（不复制值）
+- 迭代器、生成器等没有长度的对象不会被迭代（会耗尽数据），和标量一样显示为一个值
+- 标量、0 维数组和其它对象：单行单列（None 为空表格）
+
+格式化：
+- formatCell(value, style) 把单元格格式化为字符串，style 见 FORMAT_STYLES
+
+搜索：
+- iterSearch() 是生成器，从指定行开始逐行匹配，每隔一批行 yield 一次进度，
+  配合 TimeSlicedJob 在主线程中分段执行
+"""
+
+import itertools
+import mmap
+import numbers
+import operator
+from collections.abc import Iterable, Iterator, Mapping, Sequence, Sized
+
+#: 字节数据每行显示的字节数
+BYTES_PER_ROW = 16
+
+#: 探测列数时检查的行数
+PROBE_ROWS = 32
+
+#: 单元格格式
+FORMAT_STYLES = ("Auto", "Fixed", "Scientific", "Hex")
+
+
+def _isBytes(data):
+    return isinstance(data, (bytes, bytearray, memoryview, mmap.mmap))
+
+
+def _isRow(value):
+    if isinstance(value, (str, bytes, bytearray)):
+        return False
+    if hasattr(value, "shape"):
+        return len(value.shape) == 1
+    return isinstance(value, (Sequence, tuple))
+
+
+class DataView(object):
+    """
+    只读表格视图
+
+    关键方法：
+    - rowCount()/columnCount(): 表格大小
+    - header(column): 列标题
+    - cell(row, column): 单元格的原始值
+    - rowText(row): 一行的文字（用于搜索）
+    """
+
+    def __init__(self, data):
+        """
+        包装数据
+
+        参数：
+            data: 任意引脚数据
+        """
+        super(DataView, self).__init__()
+        self.data = data
+        self.kind = "scalar"
+        self._rows = None
+        self._rowIterator = None
+        self._columns = 1
+        self._headers = ("Value",)
+        self._multiColumn = False
+
+        if data is None:
+            self.kind = "empty"
+        elif _isBytes(data):
+            self.kind = "bytes"
+            self._columns = BYTES_PER_ROW + 1
+            self._headers = tuple(f"{i:02X}" for i in range(BYTES_PER_ROW)) + ("ASCII",)
+        elif isinstance(data, Mapping):
+            self.kind = "mapping"
+            self._rows = []
+            self._rowIterator = iter(data)
+            self._columns = 2
+            self._headers = ("Key", "Value")
+        elif hasattr(data, "shape") and hasattr(data, "__getitem__"):
+            # 0 维数组没有行（len() 和迭代都会抛出 TypeError），按标量显示
+            shape = data.shape
+            if len(shape) >= 1:
+                self.kind = "sequence"
+                if len(shape) >= 2:
+                    self._setColumns(shape[1])
+        elif isinstance(data, Sequence) and not isinstance(data, str):
+            self.kind = "sequence"
+            self._probeColumns()
+        elif isinstance(data, Iterable) and isinstance(data, Sized) and not isinstance(data, Iterator):
+            self.kind = "sequence"
+            self._rows = []
+            self._rowIterator = iter(data)
+            self._probeColumns()
+
+    def _row(self, row):
+        # 按需推进迭代器，只读取到请求的行为止
+        if self._rows is None:
+            return self.data[row]
+        rows = self._rows
+        if row >= len(rows):
+            rows.extend(itertools.islice(self._rowIterator, row + 1 - len(rows)))
+        return rows[row]
+
+    def _probeColumns(self):
+        count = min(PROBE_ROWS, len(self.data))
+        widths = [len(value) for value in (self._row(i) for i in range(count)) if _isRow(value)]
+        if widths:
+            self._setColumns(max(widths))
+
+    def _setColumns(self, count):
+        self._columns = count
+        self._headers = tuple(str(i) for i in range(count))
+        self._multiColumn = True
+
+    def rowCount(self):
+        """行数"""
+        if self.kind == "bytes":
+            return (len(self.data) + BYTES_PER_ROW - 1) // BYTES_PER_ROW
+        if self.kind in ("mapping", "sequence"):
+            return len(self.data)
+        return 0 if self.kind == "empty" else 1
+
+    def columnCount(self):
+        """列数"""
+        return self._columns
+
+    def header(self, column):
+        """列标题"""
+        return self._headers[column] if column < len(self._headers) else str(column)
+
+    def cell(self, row, column):
+        """
+        单元格的原始值
+
+        参数：
+            row (int): 行号
+            column (int): 列号
+
+        返回：
+            单元格值（超出该行宽度时返回 None）
+        """
+        if self.kind == "bytes":
+            start = row * BYTES_PER_ROW
+            chunk = bytes(self.data[start : start + BYTES_PER_ROW])
+            if column == BYTES_PER_ROW:
+                return "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+            return f"{chunk[column]:02X}" if column < len(chunk) else None
+        if self.kind == "mapping":
+            key = self._row(row)
+            return key if column == 0 else self.data[key]
+        if self.kind == "sequence":
+            value = self._row(row)
+            if not self._multiColumn:
+                return value
+            if _isRow(value):
+                return value[column] if column < len(value) else None
+            return value if column == 0 else None
+        return self.data
+
+    def rowText(self, row):
+        """一行的文字（各列的 str 用制表符连接）"""
+        return "\t".join(str(self.cell(row, column)) for column in range(self._columns))
+
+
+def formatCell(value, style="Auto", precision=6):
+    """
+    格式化单元格
+
+    参数：
+        value: 单元格值
+        style (str): FORMAT_STYLES 之一
+        precision (int): 浮点数精度
+
+    返回：
+        str: 显示文字
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    try:
+        if style == "Fixed":
+            return f"{float(value):.{precision}f}"
+        if style == "Scientific":
+            return f"{float(value):.{precision}e}"
+        if style == "Hex" and hasattr(value, "__index__"):
+            return f"0x{operator.index(value):X}"
+        if isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral):
+            return f"{float(value):.{precision}g}"
+    except (TypeError, ValueError):
+        pass
+    text = str(value)
+    return text if len(text) <= 200 else text[:197] + "..."
+
+
+def iterSearch(view, text, start=0, batch=2048):
+    """
+    从 start 行开始查找包含 text 的行（到末尾后从头继续，生成器）
+
+    参数：
+        view (DataView): 表格视图
+        text (str): 要查找的文字（不区分大小写）
+        start (int): 起始行
+        batch (int): 每检查多少行 yield 一次进度
+
+    生成：
+        (已检查行数, 总行数) 进度元组
+
+    返回：
+        int: 匹配的行号，没有匹配时返回 -1（通过 StopIteration.value）
+    """
+    needle = text.lower()
+    total = view.rowCount()
+    for checked in range(total):
+        row = (start + checked) % total
+        if needle in view.rowText(row).lower():
+            return row
+        if checked % batch == batch - 1:
+            yield (checked + 1, total)
+    return -1
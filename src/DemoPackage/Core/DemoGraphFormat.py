@@ -0,0 +1,516 @@
+"""
+DemoGraphFormat - Demo 图文件格式（*.demo）
+
+DemoExporter 使用的文件格式读写实现，不依赖 Qt，可在工作线程中运行。
+
+文件结构：
+- 第 1 行：文件头（JSON，始终不压缩，导入时据此自动识别压缩编码）
+  {"format": "DemoGraph", "version": "1.3.0", "created": ..., "graph": 名称,
+   "codec": "zlib", "level": 6, "sections": true,
+   "counts": {"nodes": N, "connections": C, "values": V}}
+- 三个部分（section），每个部分是一个独立的压缩帧，帧内是 JSON Lines 记录：
+  * nodes：       {"k": "n", "uid", "name", "type", "package", "lib", "x", "y", "pins"}
+  * connections： {"k": "c", "src", "srcPin", "dst", "dstPin"}
+  * values：      {"k": "v", "node", "pin", "value"}
+- 索引行（JSON，不压缩）：
+  {"sections": [{"name", "offset", "length", "records", "blake2b"}, ...]}
+  校验和针对压缩后的字节计算，校验时无需解压
+- 定长尾部："DEMOIDX " + 20 位索引行偏移 + 换行
+
+完整性校验：
+- verifyFile() 用线程池并行读取各部分并计算校验和，不解压、不构建图
+- DemoExporter 导入前先校验，损坏的文件在创建任何节点之前就被拒绝
+- 命令行仅校验模式：python -m DemoPackage.Core.DemoGraphFormat *.demo
+
+逐行读写的好处：
+- 写入时无需在内存中拼接整个文件，压缩也是边写边做
+- 读取时可以边解压、边解析、边上报进度、响应取消
+
+兼容性：
+- 1.1.0 文件没有 codec 字段，按 "none" 读取
+- 1.2.0 及更早的文件是单个压缩流、没有校验和，可以读取但无法校验
+
+引脚值编码：
+- JSON 原生类型直接保存
+- tuple 保存为 {"$type": "tuple", "items": [...]}
+- FakeTypeATWXP（DemoPin 的数据类型）保存为 {"$type": "FakeTypeATWXP", "value": ...}
+- 其他无法编码的值保存为 None 并打印警告
+"""
+
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from .Codecs import normalizeLevel, openReader, openWriter
+from .GraphSnapshot import ConnectionRecord, GraphSnapshot, NodeRecord, PinRecord
+
+FORMAT_NAME = "DemoGraph"
+FORMAT_VERSION = "1.3.0"
+
+#: 每处理多少条记录检查一次取消并上报进度
+CHECK_INTERVAL = 256
+
+#: 各部分使用的校验和算法（hashlib 名称）
+CHECKSUM = "blake2b"
+
+#: 校验时每次读取的数据块大小
+VERIFY_CHUNK = 1024 * 1024
+
+#: 文件尾部：魔数 + 20 位十进制索引偏移 + 换行
+TRAILER_MAGIC = "DEMOIDX "
+TRAILER_FORMAT = TRAILER_MAGIC + "{:020d}\n"
+TRAILER_SIZE = len(TRAILER_MAGIC) + 21
+
+
+class DemoFormatError(Exception):
+    """文件不是合法的 Demo 图文件，或版本不兼容"""
+
+
+def encodeValue(value):
+    """
+    把引脚值编码为 JSON 兼容的数据
+
+    参数：
+        value: 引脚值
+
+    返回：
+        JSON 兼容的数据
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [encodeValue(v) for v in value]
+    if isinstance(value, tuple):
+        return {"$type": "tuple", "items": [encodeValue(v) for v in value]}
+    if isinstance(value, dict):
+        return {str(k): encodeValue(v) for k, v in value.items()}
+    if type(value).__name__ == "FakeTypeATWXP":
+        return {"$type": "FakeTypeATWXP", "value": encodeValue(value.value)}
+    print(f"DemoGraphFormat: value of type {type(value).__name__} is not serializable, saved as None")
+    return None
+
+
+def decodeValue(data):
+    """
+    把 encodeValue() 的结果还原为引脚值
+
+    参数：
+        data: JSON 数据
+
+    返回：
+        引脚值
+    """
+    if isinstance(data, list):
+        return [decodeValue(v) for v in data]
+    if isinstance(data, dict):
+        tag = data.get("$type")
+        if tag == "tuple":
+            return tuple(decodeValue(v) for v in data["items"])
+        if tag == "FakeTypeATWXP":
+            # 延迟导入：只有文件中确实包含 DemoPin 数据时才需要 uflow
+            from ..Pins.DemoPin import FakeTypeATWXP
+
+            return FakeTypeATWXP(decodeValue(data["value"]))
+        return {k: decodeValue(v) for k, v in data.items()}
+    return data
+
+
+def _nodeToRecord(node):
+    return {
+        "k": "n",
+        "uid": node.uid,
+        "name": node.name,
+        "type": node.type,
+        "package": node.package,
+        "lib": node.lib,
+        "x": node.x,
+        "y": node.y,
+        "pins": [[p.name, p.direction, p.dataType, p.isExec] for p in node.pins],
+    }
+
+
+def _recordToNode(record):
+    pins = [PinRecord(name, direction, dataType, isExec) for name, direction, dataType, isExec in record["pins"]]
+    return NodeRecord(
+        record["uid"],
+        record["name"],
+        record["type"],
+        record.get("package"),
+        record.get("lib"),
+        record.get("x", 0.0),
+        record.get("y", 0.0),
+        pins,
+    )
+
+
+def makeHeader(snapshot, created="", codec="none", level=None):
+    """
+    生成文件头
+
+    参数：
+        snapshot (GraphSnapshot): 要写入的快照
+        created (str): 创建时间字符串
+        codec (str): 正文压缩编码
+        level (int): 压缩级别
+
+    返回：
+        dict: 文件头
+    """
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "created": created,
+        "graph": snapshot.name,
+        "codec": codec,
+        "level": normalizeLevel(codec, level),
+        "sections": True,
+        "counts": {
+            "nodes": len(snapshot.nodes),
+            "connections": len(snapshot.connections),
+            "values": snapshot.valueCount(),
+        },
+    }
+
+
+def iterSections(snapshot):
+    """
+    按文件顺序生成快照的各个部分
+
+    参数：
+        snapshot (GraphSnapshot): 快照
+
+    返回：
+        list: [(部分名称, 记录数量, 记录生成器), ...]，顺序为 nodes、connections、values
+    """
+    values = list(snapshot.iterValues())
+    return [
+        ("nodes", len(snapshot.nodes), (_nodeToRecord(n) for n in snapshot.nodes)),
+        (
+            "connections",
+            len(snapshot.connections),
+            (
+                {"k": "c", "src": c.srcNode, "srcPin": c.srcPin, "dst": c.dstNode, "dstPin": c.dstPin}
+                for c in snapshot.connections
+            ),
+        ),
+        (
+            "values",
+            len(values),
+            ({"k": "v", "node": uid, "pin": pin, "value": encodeValue(v)} for uid, pin, v in values),
+        ),
+    ]
+
+
+class _HashingWriter(io.RawIOBase):
+    """透传写入的数据，同时计算校验和与长度"""
+
+    def __init__(self, raw):
+        super(_HashingWriter, self).__init__()
+        self._raw = raw
+        self.hash = hashlib.new(CHECKSUM)
+        self.length = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._raw.write(data)
+        self.hash.update(data)
+        self.length += len(data)
+        return len(data)
+
+    def flush(self):
+        self._raw.flush()
+
+
+class _BoundedReader(io.RawIOBase):
+    """只读取底层流中 [offset, offset + length) 范围内的数据"""
+
+    def __init__(self, raw, offset, length):
+        super(_BoundedReader, self).__init__()
+        self._raw = raw
+        self._raw.seek(offset)
+        self._remaining = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._raw.read(size)
+        buffer[: len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def writeSnapshot(snapshot, stream, created="", codec="none", level=None, token=None, report=None):
+    """
+    把快照写入二进制流
+
+    参数：
+        snapshot (GraphSnapshot): 快照
+        stream: 可写且可定位（seekable）的二进制流（如 open(path, "wb")）
+        created (str): 创建时间字符串
+        codec (str): 压缩编码（"none"、"zlib"、"bz2"、"lzma"）
+        level (int): 压缩级别，None 表示使用编码的默认级别
+        token (CancellationToken): 可选的取消令牌
+        report (callable): 可选的进度回调 report(done, total, message)
+
+    返回：
+        int: 写入的记录数量（不含文件头）
+
+    说明：
+    - 每个部分是独立的压缩帧，写入时同时计算压缩后数据的校验和
+    - 所有部分写完后追加索引行和定长尾部
+    """
+    header = makeHeader(snapshot, created, codec, level)
+    total = sum(header["counts"].values())
+    stream.write((json.dumps(header) + "\n").encode("utf-8"))
+
+    index = []
+    done = 0
+    for name, count, records in iterSections(snapshot):
+        offset = stream.tell()
+        hasher = _HashingWriter(stream)
+        body = io.TextIOWrapper(openWriter(hasher, codec, header["level"]), encoding="utf-8", newline="\n")
+        try:
+            for record in records:
+                body.write(json.dumps(record, separators=(",", ":")) + "\n")
+                done += 1
+                if done % CHECK_INTERVAL == 0:
+                    if token is not None:
+                        token.raiseIfCancelled()
+                    if report is not None:
+                        report(done, total, "Writing")
+        finally:
+            # 刷新并结束该部分的压缩帧，底层 stream 由调用方关闭
+            body.close()
+        index.append(
+            {"name": name, "offset": offset, "length": hasher.length, "records": count, CHECKSUM: hasher.hash.hexdigest()}
+        )
+
+    indexOffset = stream.tell()
+    stream.write((json.dumps({"sections": index}) + "\n").encode("utf-8"))
+    stream.write(TRAILER_FORMAT.format(indexOffset).encode("ascii"))
+    if report is not None:
+        report(done, total, "Writing")
+    return done
+
+
+def readHeader(line):
+    """
+    解析并校验文件头
+
+    参数：
+        line (str): 文件第一行
+
+    返回：
+        dict: 文件头
+
+    异常：
+        DemoFormatError: 不是 Demo 图文件或主版本不兼容
+    """
+    try:
+        header = json.loads(line)
+    except ValueError:
+        raise DemoFormatError("Not a DemoGraph file")
+    if not isinstance(header, dict) or header.get("format") != FORMAT_NAME:
+        raise DemoFormatError("Not a DemoGraph file")
+    major = str(header.get("version", "")).split(".")[0]
+    if major != FORMAT_VERSION.split(".")[0]:
+        raise DemoFormatError(f"Unsupported DemoGraph version {header.get('version')}")
+    return header
+
+
+def readIndex(stream):
+    """
+    读取文件头和部分索引
+
+    参数：
+        stream: 可读且可定位的二进制流
+
+    返回：
+        tuple: (header, sections)，1.3.0 之前的文件 sections 为 None
+
+    异常：
+        DemoFormatError: 文件格式错误或尾部损坏
+    """
+    stream.seek(0)
+    header = readHeader(stream.readline().decode("utf-8"))
+    if not header.get("sections"):
+        return header, None
+
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    if size < TRAILER_SIZE:
+        raise DemoFormatError("Truncated DemoGraph file")
+    stream.seek(size - TRAILER_SIZE)
+    trailer = stream.read(TRAILER_SIZE).decode("ascii", "replace")
+    if not trailer.startswith(TRAILER_MAGIC) or not trailer[len(TRAILER_MAGIC) :].strip().isdigit():
+        raise DemoFormatError("Truncated DemoGraph file (missing index)")
+    stream.seek(int(trailer[len(TRAILER_MAGIC) :]))
+    try:
+        sections = json.loads(stream.readline().decode("utf-8"))["sections"]
+    except (ValueError, KeyError, UnicodeDecodeError):
+        raise DemoFormatError("Corrupt DemoGraph index")
+    return header, sections
+
+
+class SectionResult(object):
+    """
+    单个部分的校验结果
+
+    属性：
+    - name (str): 部分名称（nodes、connections、values）
+    - ok (bool): 校验是否通过
+    - expected (str): 索引中记录的校验和
+    - actual (str): 实际计算的校验和
+    """
+
+    __slots__ = ("name", "ok", "expected", "actual")
+
+    def __init__(self, name, ok, expected, actual):
+        self.name = name
+        self.ok = ok
+        self.expected = expected
+        self.actual = actual
+
+
+def _hashSection(path, section, token):
+    h = hashlib.new(CHECKSUM)
+    with open(path, "rb") as f:
+        f.seek(section["offset"])
+        remaining = section["length"]
+        while remaining > 0:
+            if token is not None and token.isCancelled():
+                return None
+            data = f.read(min(VERIFY_CHUNK, remaining))
+            if not data:
+                break
+            h.update(data)
+            remaining -= len(data)
+    return h.hexdigest() if remaining == 0 else "truncated"
+
+
+def verifyFile(path, workers=None, token=None):
+    """
+    校验文件各部分的完整性（不解压、不构建图）
+
+    参数：
+        path (str): 文件路径
+        workers (int): 并行线程数，None 表示每个部分一个线程
+        token (CancellationToken): 可选的取消令牌
+
+    返回：
+        list: SectionResult 列表；1.3.0 之前没有校验和的文件返回空列表
+
+    异常：
+        DemoFormatError: 文件头或索引损坏
+        TaskCancelled: 校验被取消
+
+    说明：
+    - 各部分在独立线程中用独立的文件句柄读取并计算校验和
+    - hashlib 在计算大块数据时会释放 GIL，多个部分可以真正并行
+    """
+    with open(path, "rb") as f:
+        _, sections = readIndex(f)
+    if not sections:
+        return []
+
+    with ThreadPoolExecutor(max_workers=workers or len(sections)) as pool:
+        digests = list(pool.map(lambda s: _hashSection(path, s, token), sections))
+    if token is not None:
+        token.raiseIfCancelled()
+    return [SectionResult(s["name"], s[CHECKSUM] == d, s[CHECKSUM], d) for s, d in zip(sections, digests)]
+
+
+def _applyRecord(snapshot, values, record):
+    kind = record.get("k")
+    if kind == "n":
+        snapshot.nodes.append(_recordToNode(record))
+    elif kind == "c":
+        snapshot.connections.append(ConnectionRecord(record["src"], record["srcPin"], record["dst"], record["dstPin"]))
+    elif kind == "v":
+        values[(record["node"], record["pin"])] = decodeValue(record["value"])
+    else:
+        raise DemoFormatError(f"Unknown record kind {kind!r}")
+
+
+def readSnapshot(stream, token=None, report=None):
+    """
+    从二进制流读取快照
+
+    参数：
+        stream: 可读且可定位的二进制流（如 open(path, "rb")）
+        token (CancellationToken): 可选的取消令牌
+        report (callable): 可选的进度回调
+
+    返回：
+        GraphSnapshot: 读取到的快照
+
+    异常：
+        DemoFormatError: 文件格式错误
+
+    说明：
+    - 不做校验和检查；需要时先调用 verifyFile()
+    """
+    header, sections = readIndex(stream)
+    codec = header.get("codec", "none")
+    total = sum(header.get("counts", {}).values())
+    snapshot = GraphSnapshot(header.get("graph", ""))
+    values = {}
+
+    if sections is None:
+        # 1.2.0 及更早：文件头之后是单个压缩流
+        stream.seek(0)
+        stream.readline()
+        bodies = [openReader(stream, codec)]
+    else:
+        bodies = (openReader(_BoundedReader(stream, s["offset"], s["length"]), codec) for s in sections)
+
+    done = 0
+    for body in bodies:
+        for line in io.TextIOWrapper(body, encoding="utf-8"):
+            if not line.strip():
+                continue
+            _applyRecord(snapshot, values, json.loads(line))
+            done += 1
+            if done % CHECK_INTERVAL == 0:
+                if token is not None:
+                    token.raiseIfCancelled()
+                if report is not None:
+                    report(done, total, "Reading")
+
+    for node in snapshot.nodes:
+        for pin in node.pins:
+            key = (node.uid, pin.name)
+            if pin.direction == "in" and key in values:
+                pin.value = values[key]
+    if report is not None:
+        report(done, total, "Reading")
+    return snapshot
+
+
+if __name__ == "__main__":
+    # 仅校验模式：python -m DemoPackage.Core.DemoGraphFormat a.demo b.demo ...
+    # 任一文件损坏时以状态码 1 退出，适合在 CI 中批量扫描归档
+    import sys
+
+    failed = 0
+    for filePath in sys.argv[1:]:
+        try:
+            results = verifyFile(filePath)
+        except (OSError, DemoFormatError) as e:
+            print(f"FAIL {filePath}: {e}")
+            failed += 1
+            continue
+        bad = [r.name for r in results if not r.ok]
+        if bad:
+            failed += 1
+            print(f"FAIL {filePath}: corrupt sections {', '.join(bad)}")
+        else:
+            print(f"OK   {filePath}" + ("" if results else " (no checksums)"))
+    sys.exit(1 if failed else 0)
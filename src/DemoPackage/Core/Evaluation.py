@@ -0,0 +1,195 @@
+"""
+Evaluation - 在快照上求值图（可在工作线程中运行）
+
+直接调用 graph.evaluate() 会在界面线程中执行所有节点，长时间求值会冻结编辑器。
+这里把求值拆成三步：
+1. 主线程：GraphSnapshot.capture(graph) 复制纯数据快照（开销很小）
+2. 工作线程：evaluateSnapshot() 用 GraphProgram 在快照上求值，可取消、上报进度
+   （需要控制构建方式时先 GraphProgram.build()，再调用 evaluateProgram()）
+3. 主线程：applyOutputValues() 把结果写回图中对应的输出引脚
+
+线程安全：
+- 快照与图完全解耦，求值期间用户可以继续编辑图
+- 写回时按节点 uid 和引脚名查找，求值期间被删除的节点或引脚直接跳过
+
+异步节点：
+- 图中有语义为协程函数的节点（如读文件、调用本地服务）时，evaluateSnapshot 改用
+  Core/AsyncEvaluation.py 在事件循环上求值，互不依赖的分支同时等待
+
+自由线程（无 GIL）的 Python：
+- 其他情况使用 Core/ParallelEvaluation.py，按依赖关系在多个线程中同时求值就绪的步骤；
+  GIL 版本中与 GraphProgram.execute 完全相同
+
+结果缓存：
+- 传入 cache（Core/ResultCache.py）时按子图内容哈希复用之前的结果，跨会话、跨进程有效；
+  此时顺序求值，未命中的步骤才会计算
+
+取消和时间预算：
+- 每个步骤执行期间，求值令牌是 currentToken()（Core/Tasks.py），长时间运行的语义和节点可以周期性检查
+- budget 限制整次求值，nodeBudget 限制每个步骤；检查令牌的步骤在截止时间到达时立即中止，
+  不检查的步骤在返回后中止，协程步骤在截止时间被取消；都抛出 BudgetExceeded
+- 中止的求值不返回结果，applyOutputValues 不会被调用，图中的引脚保持求值之前的状态
+
+限制：
+- 只支持在 NodeSemantics 中注册了语义的节点类型（见 Core/NodeSemantics.py），
+  否则 GraphProgram.build 抛出 UnsupportedNodeError；
+  build(skipUnsupported=True) 跳过这些节点（program.skipped），下游读取引脚的当前值
+- 编辑器中的后台求值（DemoShelfTool）用 build(execRoots=()) 构建：只求值数据节点，
+  执行链（Callable 节点）由用户在画布上触发，不会因为点击按钮而运行
+"""
+
+import asyncio
+import time
+
+from .AsyncEvaluation import executeAsync, runCoroutine
+from .GraphProgram import GraphProgram, Step
+from .NodeSemantics import NodeSemantics
+from .ParallelEvaluation import executeParallel
+from .ResultCache import executeCached
+from .Tasks import BudgetExceeded, DeadlineToken, activateToken
+
+
+def _guardedSemantics(step, token, nodeBudget):
+    """包装步骤语义：执行期间激活步骤令牌，并检查单步预算"""
+    semantics = step.semantics
+    evaluate = semantics.evaluate
+    label = f"Node {step.name!r}"
+
+    def stepToken():
+        return DeadlineToken(nodeBudget, token, label) if nodeBudget else token
+
+    if semantics.isAsync:
+
+        async def guarded(**kwargs):
+            with activateToken(stepToken()):
+                if not nodeBudget:
+                    return await evaluate(**kwargs)
+                try:
+                    return await asyncio.wait_for(evaluate(**kwargs), nodeBudget)
+                except TimeoutError:
+                    raise BudgetExceeded(label, nodeBudget) from None
+
+    else:
+
+        def guarded(**kwargs):
+            started = time.perf_counter()
+            with activateToken(stepToken()):
+                out = evaluate(**kwargs)
+            if nodeBudget and time.perf_counter() - started > nodeBudget:
+                raise BudgetExceeded(label, nodeBudget)
+            return out
+
+    # 不保留表达式模板：编译为代码的步骤会绕过包装
+    return NodeSemantics(
+        semantics.inputs,
+        semantics.outputs,
+        guarded,
+        imports=semantics.imports,
+        pure=semantics.pure,
+        blocking=semantics.blocking,
+        version=semantics.version,
+        fingerprint=semantics.fingerprint,
+    )
+
+
+def guardProgram(program, token=None, nodeBudget=None):
+    """
+    为程序的每个步骤加上取消令牌和单步预算
+
+    参数：
+        program (GraphProgram): 图程序
+        token (CancellationToken): 求值令牌，步骤执行期间作为 currentToken()
+        nodeBudget (float): 每个步骤的时间预算（秒），None 表示不限制
+
+    返回：
+        GraphProgram: 步骤语义被包装的新程序（槽位、参数、结果与原程序相同）
+    """
+    steps = [
+        Step(step.uid, step.name, step.type, _guardedSemantics(step, token, nodeBudget), step.args, step.outSlots)
+        for step in program.steps
+    ]
+    return GraphProgram(steps, program.params, program.results, program.slotCount, program.skipped)
+
+
+def evaluateProgram(program, token=None, report=None, cache=None, budget=None, nodeBudget=None):
+    """
+    求值已构建的图程序
+
+    参数：
+        program (GraphProgram): GraphProgram.build() 的结果
+        token (CancellationToken): 可选的取消令牌
+        report (callable): 可选的进度回调 report(done, total, message)
+        cache (ResultCache): 可选的持久化结果缓存
+        budget (float): 整次求值的时间预算（秒），None 表示不限制
+        nodeBudget (float): 每个步骤的时间预算（秒），None 表示不限制
+
+    返回：
+        dict: (节点 uid, 输出引脚名) -> 值
+
+    异常：
+        TaskCancelled: 令牌被取消
+        BudgetExceeded: 超过时间预算（TaskCancelled 的子类）
+    """
+    if budget:
+        token = DeadlineToken(budget, token, "Evaluation")
+    if token is not None or nodeBudget:
+        program = guardProgram(program, token, nodeBudget)
+    if cache is not None:
+        # 写回图需要所有输出引脚的值：命中的步骤从缓存读取，不会被跳过
+        values = executeCached(program, cache, token=token, report=report, complete=True)
+    elif any(step.semantics.isAsync for step in program.steps):
+        # 存在异步节点：在事件循环上并发等待互不依赖的分支
+        values = runCoroutine(executeAsync(program, token=token, report=report))
+    else:
+        # 自由线程版本中按依赖关系并行求值，GIL 版本中顺序求值
+        values = executeParallel(program, token=token, report=report)
+    return program.outputValues(values)
+
+
+def evaluateSnapshot(snapshot, token=None, report=None, cache=None, budget=None, nodeBudget=None):
+    """
+    在快照上求值图
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+        其余参数同 evaluateProgram()
+
+    返回：
+        dict: (节点 uid, 输出引脚名) -> 值
+
+    异常：
+        UnsupportedNodeError: 存在未注册语义的节点类型
+        GraphCycleError: 存在环
+        TaskCancelled: 令牌被取消
+        BudgetExceeded: 超过时间预算（TaskCancelled 的子类）
+    """
+    return evaluateProgram(GraphProgram.build(snapshot), token, report, cache, budget, nodeBudget)
+
+
+def applyOutputValues(graph, values):
+    """
+    把求值结果写回图（必须在主线程中调用）
+
+    参数：
+        graph: uflow 图对象
+        values (dict): evaluateSnapshot() 的返回值
+
+    返回：
+        tuple: (写回的引脚数, 跳过的引脚数)
+
+    说明：
+    - 写入输出引脚时框架会把值传递给下游连接的输入引脚
+    """
+    from uflow.Core.Common import PinSelectionGroup
+
+    nodes = {str(node.uid): node for node in graph.getNodesList()}
+    applied = skipped = 0
+    for (uid, pinName), value in values.items():
+        node = nodes.get(uid)
+        pin = node.getPinSG(pinName, PinSelectionGroup.Outputs) if node is not None else None
+        if pin is None:
+            skipped += 1
+            continue
+        pin.setData(value)
+        applied += 1
+    return applied, skipped
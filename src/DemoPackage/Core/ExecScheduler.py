@@ -0,0 +1,263 @@
+"""
+ExecScheduler - 执行链的协作式时间片调度器
+
+框架中执行引脚的调用是同步递归的：输出执行引脚 call() 会立即执行下游节点，
+整条执行链（例如一长串 demoLibGreet 或一个很长的循环）在一次调用中跑完，
+期间界面完全冻结。
+
+调度器把执行链变成可恢复的任务：
+- 任务执行一个节点时，节点触发的输出执行引脚不会立即递归执行，
+  而是记录为任务的后续步骤（蹦床式执行）
+- 每一步只执行一个节点，step() 在时间预算（默认 8 毫秒）用完后返回，
+  由 TaskPump 在下一帧继续，期间 Qt 事件循环可以处理界面事件
+- 多个任务按优先级调度（数值越大越优先），同优先级的任务按步轮转
+- 每个任务有一个 CancellationToken，节点可以通过 currentToken() 检查是否被取消
+- 可选的时间预算：budget 限制整条执行链，nodeBudget 限制每一步（一个节点）；
+  超过预算时任务以 BudgetExceeded 失败（onFailed），已经执行完的节点保留各自的输出，后续节点不再执行
+
+执行顺序：
+- 一个节点依次触发的多个输出（如 Sequence 的 then_0、then_1）保持深度优先顺序，
+  与同步执行相同
+- 触发输出时记录该节点数据输出引脚的当前值，执行后续步骤前恢复，
+  循环节点（如 forLoop）的循环体因此读到的是触发时的索引值
+- 需要在循环体执行期间修改循环状态的节点（如 forLoopWithBreak 的 break）
+  无法拆分，列在 SYNCHRONOUS_NODE_TYPES 中，其下游仍同步执行
+
+使用方式：
+    scheduler = execScheduler()
+    task = scheduler.submit(node, priority=1)
+    task.onFinished = lambda: print("done")
+    TaskPump.instance().schedule(scheduler)
+
+节点中检查取消：
+    from DemoPackage.Core.Tasks import currentToken
+    for item in items:
+        currentToken().raiseIfCancelled()
+        ...
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from .Tasks import BudgetExceeded, CancellationToken, DeadlineToken, TaskCancelled, activateToken
+
+#: 下游不能被拆分为独立步骤的节点类型
+SYNCHRONOUS_NODE_TYPES = {"forLoopWithBreak", "whileLoop"}
+
+_state = threading.local()
+_installed = False
+
+
+def _install():
+    global _installed
+    if _installed:
+        return
+    from uflow.Core.Common import PinDirection
+    from uflow.Packages.FlowBasePackage.Pins.ExecPin import ExecPin
+
+    def call(pin, *args, **kwargs):
+        task = getattr(_state, "task", None)
+        if task is None or pin.direction == PinDirection.Input:
+            # 通过 __wrapped__ 调用：插桩卸载时可以从调用链中摘除（见 Core/Instrumentation.py）
+            return call.__wrapped__(pin, *args, **kwargs)
+        task._defer(pin)
+
+    call.__wrapped__ = ExecPin.call
+    ExecPin.call = call
+    _installed = True
+
+
+class ExecTask(object):
+    """
+    可恢复的执行链任务
+
+    属性：
+    - name (str): 任务名称
+    - priority (int): 优先级（数值越大越优先）
+    - token (CancellationToken): 取消令牌
+    - nodeBudget (float): 每一步的时间预算（秒），None 表示不限制
+    - steps (int): 已执行的步骤数
+    - finished (bool): 是否已结束
+
+    回调（在调用 ExecScheduler.step() 的线程中执行）：
+    - onFinished()
+    - onFailed(exception)
+    - onCancelled()
+    """
+
+    def __init__(self, startPin, priority=0, token=None, name="", nodeBudget=None):
+        super(ExecTask, self).__init__()
+        self.name = name
+        self.priority = priority
+        self.token = token if token is not None else CancellationToken()
+        self.nodeBudget = nodeBudget
+        self.steps = 0
+        self.finished = False
+        self._stack = [(startPin, ())]
+        self._fired = None
+
+        self.onFinished = None
+        self.onFailed = None
+        self.onCancelled = None
+
+    def cancel(self):
+        """请求取消（当前步骤结束后生效，节点也可以通过令牌提前退出）"""
+        self.token.cancel()
+
+    def _defer(self, pin):
+        from uflow.Core.Common import getConnectedPins
+
+        node = pin.owningNode()
+        if node.__class__.__name__ in SYNCHRONOUS_NODE_TYPES or node.getName() in SYNCHRONOUS_NODE_TYPES:
+            # 这类节点依赖下游同步执行的结果（如 break），临时退出蹦床模式
+            _state.task = None
+            try:
+                return pin.call()
+            finally:
+                _state.task = self
+        restore = tuple((p, p.currentData()) for p in node.orderedOutputs.values() if not p.isExec())
+        for target in getConnectedPins(pin):
+            self._fired.append((target, restore))
+
+    def _step(self):
+        pin, restore = self._stack.pop()
+        for outPin, value in restore:
+            outPin.setData(value)
+        self._fired = []
+        token = self.token
+        if self.nodeBudget:
+            # 步骤令牌：节点通过 currentToken() 检查时，超过单步预算即中止
+            token = DeadlineToken(self.nodeBudget, self.token, f"Node {pin.owningNode().getName()!r}")
+        started = time.perf_counter()
+        _state.task = self
+        try:
+            with activateToken(token):
+                pin.call()
+        finally:
+            _state.task = None
+        if self.nodeBudget and time.perf_counter() - started > self.nodeBudget:
+            # 节点没有检查令牌：执行完成后才能发现超时，不再继续执行后续步骤
+            raise BudgetExceeded(token.label, self.nodeBudget)
+        # 反向压栈，保持深度优先、按触发顺序执行
+        self._stack.extend(reversed(self._fired))
+        self._fired = None
+        self.steps += 1
+        return bool(self._stack)
+
+    def _finish(self, callback, *args):
+        self.finished = True
+        self._stack = []
+        if callback is not None:
+            callback(*args)
+
+
+class ExecScheduler(object):
+    """
+    执行链调度器
+
+    关键方法：
+    - submit(node, priority, token): 提交一条从节点开始的执行链
+    - step(): 执行一个时间片（供 TaskPump 调用），返回是否还有任务
+    - cancelAll(): 取消所有任务
+    """
+
+    def __init__(self, budget=0.008):
+        """
+        初始化调度器
+
+        参数：
+            budget (float): 每个时间片的预算（秒），默认 8 毫秒
+        """
+        super(ExecScheduler, self).__init__()
+        self.budget = budget
+        self._queue = []
+        self._counter = itertools.count()
+
+    def submit(self, node, priority=0, token=None, name=None, budget=None, nodeBudget=None):
+        """
+        提交一条执行链
+
+        参数：
+            node: 起始节点（从它的第一个输入执行引脚开始执行）
+            priority (int): 优先级
+            token (CancellationToken): 可选的取消令牌（可以在多个任务之间共享）
+            name (str): 任务名称，默认为节点名称
+            budget (float): 整条执行链的时间预算（秒），从提交时开始计时
+            nodeBudget (float): 每一步的时间预算（秒）
+
+        返回：
+            ExecTask
+
+        异常：
+            ValueError: 节点没有输入执行引脚
+        """
+        _install()
+        startPin = next((p for p in node.orderedInputs.values() if p.isExec()), None)
+        if startPin is None:
+            raise ValueError(f"Node {node.getName()!r} has no input exec pin")
+        name = name or node.getName()
+        if budget:
+            token = DeadlineToken(budget, token, f"Exec chain {name!r}")
+        task = ExecTask(startPin, priority, token, name, nodeBudget)
+        heapq.heappush(self._queue, (-priority, next(self._counter), task))
+        return task
+
+    def tasks(self):
+        """未结束的任务（按优先级排序）"""
+        return [entry[2] for entry in sorted(self._queue)]
+
+    def hasTasks(self):
+        """是否还有未结束的任务"""
+        return bool(self._queue)
+
+    def cancelAll(self):
+        """取消所有任务"""
+        for _, _, task in self._queue:
+            task.cancel()
+
+    def step(self):
+        """
+        执行一个时间片
+
+        返回：
+            bool: True 表示还有未结束的任务
+        """
+        deadline = time.perf_counter() + self.budget
+        while self._queue and time.perf_counter() < deadline:
+            priority, _, task = heapq.heappop(self._queue)
+            try:
+                task.token.raiseIfCancelled()
+                remaining = task._step()
+            except BudgetExceeded as e:
+                task._finish(task.onFailed, e)
+                continue
+            except TaskCancelled:
+                task._finish(task.onCancelled)
+                continue
+            except Exception as e:
+                task._finish(task.onFailed, e)
+                continue
+            if remaining:
+                # 重新入队：同优先级的任务按步轮转
+                heapq.heappush(self._queue, (priority, next(self._counter), task))
+            else:
+                task._finish(task.onFinished)
+        return bool(self._queue)
+
+
+_scheduler = None
+
+
+def execScheduler():
+    """
+    获取进程内共享的调度器
+
+    返回：
+        ExecScheduler
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ExecScheduler()
+    return _scheduler
@@ -0,0 +1,151 @@
+"""
+GraphBuilder - 从快照重建图
+
+把 GraphSnapshot 中的节点、连接和引脚值应用到活动图上。
+重建过程写成生成器，配合 TimeSlicedJob 在主线程中按时间片执行，
+导入大图时界面不会卡死。
+
+使用方式：
+    builder = GraphBuilder(uflowInstance, snapshot)
+    job = TimeSlicedJob(builder.build(), token=token)
+    # 取消时调用 builder.rollback() 删除已创建的节点
+
+注意：
+- 必须在主线程中执行（会创建节点和 UI）
+- 导入的节点使用新的 uid，重复导入同一文件不会冲突
+"""
+
+import uuid
+
+
+def activeGraph(uflowInstance):
+    """
+    获取 uflow 实例的活动图
+
+    参数：
+        uflowInstance: uflow 应用实例
+
+    返回：
+        GraphBase: 当前活动图
+    """
+    return uflowInstance.graphManager.get().activeGraph()
+
+
+def connectLivePins(uflowInstance, srcPin, dstPin):
+    """
+    连接两个引脚
+
+    参数：
+        uflowInstance: uflow 应用实例（为 None 时只连接核心引脚）
+        srcPin: 输出引脚
+        dstPin: 输入引脚
+
+    说明：
+    - 有界面时通过画布连接，同时创建连线的 UI
+    """
+    if uflowInstance is not None:
+        canvas = uflowInstance.getCanvas()
+        canvas.connectPins(srcPin.getWrapper()(), dstPin.getWrapper()())
+    else:
+        from uflow.Core.Common import connectPins
+
+        connectPins(srcPin, dstPin)
+
+
+class GraphBuilder(object):
+    """
+    图重建器
+
+    关键方法：
+    - build(): 生成器，逐个创建节点、连接并设置引脚值
+    - rollback(): 删除本次已创建的所有节点
+    - createdNodes: 旧 uid -> 新节点 的映射
+    """
+
+    def __init__(self, uflowInstance, snapshot, graph=None, offset=(0.0, 0.0)):
+        """
+        初始化重建器
+
+        参数：
+            uflowInstance: uflow 应用实例（为 None 时只在核心图中创建节点）
+            snapshot (GraphSnapshot): 要应用的快照
+            graph (GraphBase): 无界面时的目标图；有 uflow 实例时忽略
+            offset (tuple): 节点位置偏移
+        """
+        super(GraphBuilder, self).__init__()
+        self.uflowInstance = uflowInstance
+        self.snapshot = snapshot
+        self.graph = graph
+        self.offset = offset
+        self.createdNodes = {}
+
+    def totalSteps(self):
+        """返回总工作量（节点数 + 连接数 + 值数量）"""
+        return len(self.snapshot.nodes) + len(self.snapshot.connections) + self.snapshot.valueCount()
+
+    def _createNode(self, record):
+        from uflow.Core.NodeBase import NodeBase
+
+        template = NodeBase.jsonTemplate()
+        template["type"] = record.type
+        template["package"] = record.package
+        template["lib"] = record.lib
+        template["name"] = record.name
+        template["uuid"] = str(uuid.uuid4())
+        template["x"] = record.x + self.offset[0]
+        template["y"] = record.y + self.offset[1]
+
+        if self.uflowInstance is not None:
+            uiNode = self.uflowInstance.getCanvas().createNode(template)
+            return uiNode._rawNode
+        from uflow import getRawNodeInstance
+
+        node = getRawNodeInstance(record.type, packageName=record.package, libName=record.lib)
+        self.graph.addNode(node, template)
+        return node
+
+    def _connect(self, srcPin, dstPin):
+        connectLivePins(self.uflowInstance, srcPin, dstPin)
+
+    def build(self):
+        """
+        重建图（生成器）
+
+        生成：
+            (done, total) 进度元组，每完成一个工作单元生成一次
+        """
+        from uflow.Core.Common import PinSelectionGroup
+
+        total = self.totalSteps()
+        done = 0
+
+        for record in self.snapshot.nodes:
+            self.createdNodes[record.uid] = self._createNode(record)
+            done += 1
+            yield done, total
+
+        for c in self.snapshot.connections:
+            src = self.createdNodes.get(c.srcNode)
+            dst = self.createdNodes.get(c.dstNode)
+            if src is not None and dst is not None:
+                srcPin = src.getPinSG(c.srcPin, PinSelectionGroup.Outputs)
+                dstPin = dst.getPinSG(c.dstPin, PinSelectionGroup.Inputs)
+                if srcPin is not None and dstPin is not None:
+                    self._connect(srcPin, dstPin)
+            done += 1
+            yield done, total
+
+        for nodeUid, pinName, value in self.snapshot.iterValues():
+            node = self.createdNodes.get(nodeUid)
+            if node is not None:
+                pin = node.getPinSG(pinName, PinSelectionGroup.Inputs)
+                if pin is not None and value is not None:
+                    pin.setData(value)
+            done += 1
+            yield done, total
+
+    def rollback(self):
+        """删除本次已创建的所有节点（取消或失败时调用）"""
+        for node in self.createdNodes.values():
+            node.kill()
+        self.createdNodes.clear()
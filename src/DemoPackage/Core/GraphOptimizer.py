@@ -0,0 +1,439 @@
+"""
+GraphOptimizer - 图优化
+
+分析图快照并执行以下改写（依次进行）：
+1. 死节点消除：调用方指定了需要的节点（keep，例如画布上选中的节点）时，
+   删除输出既不能到达这些节点、也不能到达不纯节点的节点
+2. 常量折叠：预先计算输入全部为常量的纯节点子图，
+   把结果作为字面值写入下游节点的输入引脚，删除被折叠的节点
+3. 取反链合并：DemoNode 串联链中，偶数个 not 等价于恒等（整条链删除，上游直接连到下游），
+   奇数个 not 等价于一个 not（只保留第一个节点）
+
+另外 fusePureChains() 在 GraphProgram 层面把首尾相接的单输入单输出纯步骤
+（例如 DemoLib 中的纯函数节点）融合为一个步骤，减少求值时的分派次数。
+融合只影响求值程序，不改变图本身；compilePlan(program, fuse=True) 使用它
+（BatchRunner、Scenarios 等只读取结果的编译计划），报告中的 fused/stepsAfter 就是这些计划的步骤数。
+
+活跃性：
+- 汇点是不纯的节点（有副作用，如 demoLibGreet）、未注册语义的节点和 keep 中的节点；
+  能到达汇点的节点是活的，其余是死节点
+- 没有给出 keep 时不执行死节点消除：有输出没有被下游使用的纯节点是图的结果
+  （与 GraphProgram 的结果规则一致），没有 "不需要的输出" 可以删除
+- 死节点消除之后仍然有输出没有被下游使用的纯节点同样是图的结果，不会被折叠或合并掉
+
+改写在快照上完成，结果以差异的形式返回（删除的节点、新增的连接、写入的字面值），
+可以只预览报告，也可以用 applyOptimization() 应用到原图上。
+
+使用方式：
+    snapshot = GraphSnapshot.capture(graph)
+    result = optimizeSnapshot(snapshot)
+    print(result.report.summary())
+    applyOptimization(graph, result)  # 原地应用
+"""
+
+from .GraphProgram import GraphProgram, Step, topologicalOrder
+from .GraphSnapshot import ConnectionRecord, GraphSnapshot, NodeRecord, PinRecord
+from .NodeSemantics import NodeSemantics, UnsupportedNodeError, getSemantics
+
+#: 一个融合步骤最多包含的原步骤数
+FUSE_MAX_LENGTH = 32
+
+
+class OptimizationReport(object):
+    """
+    优化报告
+
+    属性：
+    - nodesBefore/nodesAfter (int): 优化前后的节点数
+    - dead (int): 死节点消除删除的节点数
+    - folded (int): 常量折叠删除的节点数
+    - collapsed (int): 取反链合并删除的节点数
+    - fused (int): 编译计划（compilePlan(fuse=True)）中被融合掉的步骤数（不删除节点）
+    - stepsBefore/stepsAfter (int): 优化前的求值程序和优化、融合后的编译计划的步骤数（快照无法编译时按节点数估算）
+    """
+
+    def __init__(self):
+        super(OptimizationReport, self).__init__()
+        self.nodesBefore = 0
+        self.nodesAfter = 0
+        self.dead = 0
+        self.folded = 0
+        self.collapsed = 0
+        self.fused = 0
+        self.stepsBefore = 0
+        self.stepsAfter = 0
+
+    @property
+    def removed(self):
+        """删除的节点总数"""
+        return self.nodesBefore - self.nodesAfter
+
+    @property
+    def speedup(self):
+        """按求值步骤数估算的加速比"""
+        return self.stepsBefore / max(1, self.stepsAfter)
+
+    def summary(self):
+        """
+        生成一行文字报告
+
+        返回：
+            str: 例如 "Removed 12 of 20 nodes (dead 2, folded 8, collapsed 2), ..."
+        """
+        return (
+            f"Removed {self.removed} of {self.nodesBefore} nodes "
+            f"(dead {self.dead}, folded {self.folded}, collapsed {self.collapsed}), "
+            f"fused {self.fused} steps, estimated speedup {self.speedup:.2f}x "
+            f"({self.stepsBefore} -> {self.stepsAfter} steps)"
+        )
+
+
+class OptimizationResult(object):
+    """
+    优化结果
+
+    属性：
+    - snapshot (GraphSnapshot): 优化后的快照
+    - report (OptimizationReport): 报告
+    - removedNodes (set): 删除的节点 uid
+    - addedConnections (list): 新增的 ConnectionRecord（引用原有节点）
+    - values (dict): (节点 uid, 输入引脚名) -> 要写入的字面值
+    """
+
+    def __init__(self, snapshot, report, removedNodes, addedConnections, values):
+        super(OptimizationResult, self).__init__()
+        self.snapshot = snapshot
+        self.report = report
+        self.removedNodes = removedNodes
+        self.addedConnections = addedConnections
+        self.values = values
+
+    def isEmpty(self):
+        """是否没有任何改写"""
+        return not self.removedNodes and not self.addedConnections and not self.values
+
+
+def _semantics(record):
+    try:
+        return getSemantics(record.type)
+    except UnsupportedNodeError:
+        return None
+
+
+def _isPure(record):
+    if any(p.isExec for p in record.pins):
+        return False
+    semantics = _semantics(record)
+    return semantics is not None and semantics.pure
+
+
+class _Rewriter(object):
+    """在可变的节点/连接集合上执行改写"""
+
+    def __init__(self, snapshot, keep):
+        self.name = snapshot.name
+        self.nodes = {n.uid: n for n in snapshot.nodes}
+        self.order = [n.uid for n in snapshot.nodes]
+        self.connections = list(snapshot.connections)
+        self.added = []
+        self.values = {}
+        self.keep = set(keep)
+
+    def snapshot(self):
+        nodes = []
+        for uid in self.order:
+            record = self.nodes.get(uid)
+            if record is None:
+                continue
+            if any((uid, p.name) in self.values for p in record.pins):
+                pins = [
+                    PinRecord(p.name, p.direction, p.dataType, p.isExec, self.values.get((uid, p.name), p.value))
+                    for p in record.pins
+                ]
+                record = NodeRecord(
+                    record.uid, record.name, record.type, record.package, record.lib, record.x, record.y, pins
+                )
+            nodes.append(record)
+        return GraphSnapshot(self.name, nodes, list(self.connections))
+
+    def remove(self, uids):
+        for uid in uids:
+            self.nodes.pop(uid, None)
+            for key in [k for k in self.values if k[0] == uid]:
+                del self.values[key]
+        self.connections = [c for c in self.connections if c.srcNode in self.nodes and c.dstNode in self.nodes]
+        self.added = [c for c in self.added if c.srcNode in self.nodes and c.dstNode in self.nodes]
+
+    def connect(self, srcNode, srcPin, dstNode, dstPin):
+        record = ConnectionRecord(srcNode, srcPin, dstNode, dstPin)
+        self.connections.append(record)
+        self.added.append(record)
+
+    def outgoing(self):
+        result = {}
+        for c in self.connections:
+            result.setdefault(c.srcNode, []).append(c)
+        return result
+
+    def sinks(self):
+        sinks = {uid for uid, record in self.nodes.items() if not _isPure(record)}
+        return sinks | (self.keep & set(self.nodes))
+
+    def keepResults(self):
+        # 图的结果（见 GraphProgram.build）：保留节点本身，不折叠、不合并
+        consumed = {(c.srcNode, c.srcPin) for c in self.connections}
+        for uid, record in self.nodes.items():
+            if _isPure(record) and any((uid, name) not in consumed for name in _semantics(record).outputs):
+                self.keep.add(uid)
+
+    def eliminateDead(self):
+        sinks = self.sinks()
+        incoming = {}
+        for c in self.connections:
+            incoming.setdefault(c.dstNode, []).append(c.srcNode)
+        live = set(sinks)
+        pending = list(sinks)
+        while pending:
+            for src in incoming.get(pending.pop(), ()):
+                if src not in live:
+                    live.add(src)
+                    pending.append(src)
+        dead = set(self.nodes) - live
+        self.remove(dead)
+        return len(dead)
+
+    def foldConstants(self):
+        incoming = {(c.dstNode, c.dstPin): c for c in self.connections}
+        outputs = {}
+        for record in topologicalOrder(self.snapshot()):
+            if not _isPure(record):
+                continue
+            semantics = _semantics(record)
+            args = {}
+            for name in semantics.inputs:
+                source = incoming.get((record.uid, name))
+                if source is None:
+                    pin = record.getPin(name, "in")
+                    args[name] = self.values.get((record.uid, name), pin.value if pin is not None else None)
+                elif source.srcNode in outputs:
+                    args[name] = outputs[source.srcNode].get(source.srcPin)
+                else:
+                    break
+            else:
+                outputs[record.uid] = semantics.evaluate(**args)
+
+        folded = {uid for uid in outputs if uid not in self.keep}
+        for c in self.connections:
+            if c.srcNode in folded and c.dstNode not in folded:
+                self.values[(c.dstNode, c.dstPin)] = outputs[c.srcNode].get(c.srcPin)
+        self.remove(folded)
+        return len(folded)
+
+    def collapseNegations(self):
+        incoming = {(c.dstNode, c.dstPin): c for c in self.connections}
+        outgoing = self.outgoing()
+
+        def isNot(uid):
+            record = self.nodes.get(uid)
+            return record is not None and record.type == "DemoNode"
+
+        def nextInChain(uid):
+            # 只有唯一下游是另一个 DemoNode、且自身不需要保留时，链才能继续
+            out = outgoing.get(uid, ())
+            if uid in self.keep or len(out) != 1 or not isNot(out[0].dstNode):
+                return None
+            return out[0].dstNode
+
+        removed = set()
+        for uid in list(self.order):
+            if not isNot(uid) or uid in removed:
+                continue
+            source = incoming.get((uid, "inp"))
+            if source is not None and isNot(source.srcNode) and nextInChain(source.srcNode) == uid:
+                continue  # 不是链的起点
+            chain = [uid]
+            while nextInChain(chain[-1]) is not None:
+                chain.append(nextInChain(chain[-1]))
+            if chain[-1] in self.keep:
+                chain.pop()  # 需要保留的末尾节点作为下游消费者
+            if len(chain) < 2 or (len(chain) % 2 == 0 and source is None):
+                continue
+            consumers = outgoing.get(chain[-1], ())
+            if len(chain) % 2 == 0:
+                drop, srcNode, srcPin = chain, source.srcNode, source.srcPin
+            else:
+                drop, srcNode, srcPin = chain[1:], chain[0], "out"
+            removed.update(drop)
+            self.remove(drop)
+            # 同步更新索引，后面的链可能以这些消费者为起点
+            outgoing[srcNode] = [c for c in outgoing.get(srcNode, ()) if c.dstNode not in removed]
+            for c in consumers:
+                self.connect(srcNode, srcPin, c.dstNode, c.dstPin)
+                outgoing[srcNode].append(self.connections[-1])
+                incoming[(c.dstNode, c.dstPin)] = self.connections[-1]
+        return len(removed)
+
+
+def _tryBuild(snapshot):
+    try:
+        return GraphProgram.build(snapshot)
+    except Exception:
+        return None
+
+
+def optimizeSnapshot(snapshot, keep=(), deadNodes=True, constants=True, negations=True):
+    """
+    优化图快照
+
+    参数：
+        snapshot (GraphSnapshot): 图快照（不会被修改）
+        keep (iterable): 需要的节点 uid（视为汇点，不会被删除）
+        deadNodes (bool): 是否执行死节点消除（只在给出 keep 时执行）
+        constants (bool): 是否执行常量折叠
+        negations (bool): 是否执行取反链合并
+
+    返回：
+        OptimizationResult
+    """
+    report = OptimizationReport()
+    report.nodesBefore = len(snapshot.nodes)
+    rewriter = _Rewriter(snapshot, keep)
+    if deadNodes and rewriter.keep:
+        report.dead = rewriter.eliminateDead()
+    rewriter.keepResults()
+    if constants:
+        report.folded = rewriter.foldConstants()
+    if negations:
+        report.collapsed = rewriter.collapseNegations()
+    optimized = rewriter.snapshot()
+    report.nodesAfter = len(optimized.nodes)
+
+    before = _tryBuild(snapshot)
+    after = _tryBuild(optimized)
+    if before is not None and after is not None:
+        fused = fusePureChains(after)
+        report.stepsBefore = len(before.steps)
+        report.stepsAfter = len(fused.steps)
+        report.fused = len(after.steps) - len(fused.steps)
+    else:
+        report.stepsBefore = report.nodesBefore
+        report.stepsAfter = report.nodesAfter
+
+    removed = {n.uid for n in snapshot.nodes} - set(rewriter.nodes)
+    return OptimizationResult(optimized, report, removed, rewriter.added, rewriter.values)
+
+
+def _fuse(first, second, inputName):
+    a, b = first.semantics, second.semantics
+    outName = a.outputs[0]
+
+    def evaluate(**inputs):
+        return b.evaluate(**{inputName: a.evaluate(**inputs)[outName]})
+
+    expression = None
+    if a.expression is not None and b.expression is not None:
+        expression = b.render(b.expression, {inputName: a.expression})
+    semantics = NodeSemantics(
+        a.inputs,
+        b.outputs,
+        evaluate,
+        expression=expression,
+        imports=a.imports + b.imports,
+        pure=True,
+        blocking=a.blocking or b.blocking,
+        fingerprint=a.fingerprint + b.fingerprint,
+    )
+    return Step(second.uid, second.name, f"{first.type}+{second.type}", semantics, first.args, second.outSlots)
+
+
+def fusePureChains(program, maxLength=FUSE_MAX_LENGTH):
+    """
+    融合首尾相接的纯步骤
+
+    步骤 A 的唯一输出只被步骤 B 读取、B 只有这一个输入、且该输出不是程序结果时，
+    把 A 和 B 合并为一个步骤（组合 evaluate，能生成表达式时也组合表达式）。
+
+    参数：
+        program (GraphProgram): 求值程序
+        maxLength (int): 一个融合步骤最多包含的原步骤数（组合的表达式和 evaluate 逐层嵌套，
+            过长的链会超过编译器的括号嵌套限制和递归深度）
+
+    返回：
+        GraphProgram: 融合后的新程序（被融合的中间槽位不再写入）
+
+    注意：
+    - 融合后的步骤类型为 "A+B"，没有注册语义，不能再用于 PythonCodeGen 的通用回退路径
+    - 异步语义（协程 evaluate）的步骤不参与融合
+    - 只有结果槽位保证被写入：outputValues()、增量求值、流式流水线等按步骤读取中间值的调用方不要使用
+    """
+    readers = {}
+    for step in program.steps:
+        for slot in step.args.values():
+            readers[slot] = readers.get(slot, 0) + 1
+    resultSlots = set(program.results.values())
+
+    steps = []
+    lengths = []
+    producedBy = {}  # 槽位 -> 当前产生它的步骤在 steps 中的位置
+    for step in program.steps:
+        length = 1
+        if step.semantics.pure and not step.semantics.isAsync and len(step.args) == 1:
+            ((inputName, slot),) = step.args.items()
+            index = producedBy.get(slot)
+            producer = steps[index] if index is not None else None
+            if (
+                producer is not None
+                and producer.semantics.pure
+                and not producer.semantics.isAsync
+                and len(producer.outSlots) == 1
+                and readers.get(slot) == 1
+                and slot not in resultSlots
+                and lengths[index] < maxLength
+            ):
+                # 生产者的输出只有这一个读者，推迟到当前位置计算不影响其他步骤
+                steps[index] = None
+                length = lengths[index] + 1
+                step = _fuse(producer, step, inputName)
+        for outSlot in step.outSlots.values():
+            producedBy[outSlot] = len(steps)
+        steps.append(step)
+        lengths.append(length)
+    steps = [step for step in steps if step is not None]
+    return GraphProgram(steps, program.params, program.results, program.slotCount, program.skipped)
+
+
+def applyOptimization(graph, result, uflowInstance=None):
+    """
+    把优化结果应用到原图（必须在主线程中调用）
+
+    参数：
+        graph: uflow 图对象（必须是生成快照的那张图）
+        result (OptimizationResult): optimizeSnapshot() 的返回值
+        uflowInstance: uflow 应用实例（有界面时传入，新连接会同时创建连线 UI）
+
+    步骤：
+    1. 删除节点（同时删除它们的所有连接）
+    2. 创建新连接（取反链合并）
+    3. 写入字面值（常量折叠）
+    """
+    from uflow.Core.Common import PinSelectionGroup
+
+    from .GraphBuilder import connectLivePins
+
+    nodes = {str(node.uid): node for node in graph.getNodesList()}
+    for uid in result.removedNodes:
+        node = nodes.pop(uid, None)
+        if node is not None:
+            node.kill()
+    for c in result.addedConnections:
+        src, dst = nodes.get(c.srcNode), nodes.get(c.dstNode)
+        if src is not None and dst is not None:
+            srcPin = src.getPinSG(c.srcPin, PinSelectionGroup.Outputs)
+            dstPin = dst.getPinSG(c.dstPin, PinSelectionGroup.Inputs)
+            if srcPin is not None and dstPin is not None:
+                connectLivePins(uflowInstance, srcPin, dstPin)
+    for (uid, pinName), value in result.values.items():
+        node = nodes.get(uid)
+        pin = node.getPinSG(pinName, PinSelectionGroup.Inputs) if node is not None else None
+        if pin is not None:
+            pin.setData(value)
@@ -0,0 +1,340 @@
+"""
+GraphProgram - 图的线性化中间表示
+
+把 GraphSnapshot 转换为按拓扑顺序排列的步骤列表，每个引脚值对应一个
+扁平数组中的槽位（slot）。求值时只需按顺序执行步骤、读写槽位，
+不再涉及引脚对象、脏标记或分发。
+
+用途：
+- 代码生成（Core/PythonCodeGen.py）
+- 脱离框架的解释求值（GraphProgram.interpret）
+- 其他需要拓扑顺序和槽位编号的分析与优化
+
+求值语义：
+- 所有未连接的数据输入引脚都是程序参数（param），默认值取自快照，可在求值时覆盖
+- 纯节点按数据依赖的拓扑顺序执行
+- Callable 节点（带执行引脚）只有从执行链起点（默认为输入执行引脚未连接的 Callable 节点，
+  build(execRoots=...) 可以指定，空集合表示不运行任何执行链）出发可达时才执行，并遵守执行链顺序；
+  不执行的 Callable 节点的输出不写入槽位，读取它们的下游输入作为参数（取快照中的当前值）
+- build(skipUnsupported=True) 时没有注册语义的节点被跳过（记录在 program.skipped 中），
+  其下游同样读取输入引脚的当前值；默认抛出 UnsupportedNodeError
+- 没有下游数据连接的输出引脚是程序结果，键为 "节点名.引脚名"
+"""
+
+import heapq
+import keyword
+import re
+import time
+
+from . import Instrumentation
+from .NodeSemantics import UnsupportedNodeError, getSemantics
+
+
+class GraphCycleError(Exception):
+    """图中存在环，无法确定求值顺序"""
+
+
+class Param(object):
+    """
+    程序参数（未连接的数据输入引脚）
+
+    属性：
+    - name (str): 合法的 Python 标识符，用于覆盖默认值
+    - nodeUid (str): 所属节点 uid
+    - pinName (str): 引脚名称
+    - default: 默认值（来自快照）
+    - slot (int): 槽位编号
+    """
+
+    __slots__ = ("name", "nodeUid", "pinName", "default", "slot")
+
+    def __init__(self, name, nodeUid, pinName, default, slot):
+        self.name = name
+        self.nodeUid = nodeUid
+        self.pinName = pinName
+        self.default = default
+        self.slot = slot
+
+
+class Step(object):
+    """
+    程序步骤（一个节点的一次计算）
+
+    属性：
+    - uid (str): 节点 uid
+    - name (str): 节点名称
+    - type (str): 节点类型
+    - semantics (NodeSemantics): 节点语义
+    - args (dict): 输入引脚名 -> 槽位编号
+    - outSlots (dict): 输出引脚名 -> 槽位编号
+    """
+
+    __slots__ = ("uid", "name", "type", "semantics", "args", "outSlots")
+
+    def __init__(self, uid, name, type, semantics, args, outSlots):
+        self.uid = uid
+        self.name = name
+        self.type = type
+        self.semantics = semantics
+        self.args = args
+        self.outSlots = outSlots
+
+
+def makeIdentifier(text, used):
+    """
+    把任意文本转换为未被使用过的 Python 标识符
+
+    参数：
+        text (str): 原始文本
+        used (set): 已使用的标识符（会被更新）
+
+    返回：
+        str: 合法且唯一的标识符
+    """
+    name = re.sub(r"\W", "_", text) or "_"
+    if name[0].isdigit() or keyword.iskeyword(name):
+        name = "_" + name
+    candidate = name
+    index = 1
+    while candidate in used:
+        index += 1
+        candidate = f"{name}_{index}"
+    used.add(candidate)
+    return candidate
+
+
+def topologicalOrder(snapshot, includeExec=True):
+    """
+    计算节点的拓扑顺序
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+        includeExec (bool): 是否把执行连接也作为依赖边
+
+    返回：
+        list: 按拓扑顺序排列的 NodeRecord（同层保持快照中的顺序）
+
+    异常：
+        GraphCycleError: 存在环
+    """
+    order = {node.uid: i for i, node in enumerate(snapshot.nodes)}
+    indegree = dict.fromkeys(order, 0)
+    edges = {uid: set() for uid in order}
+    for c in snapshot.connections:
+        if c.srcNode not in order or c.dstNode not in order or c.dstNode in edges[c.srcNode]:
+            continue
+        if not includeExec:
+            pin = snapshot.getNode(c.srcNode).getPin(c.srcPin, "out")
+            if pin is not None and pin.isExec:
+                continue
+        edges[c.srcNode].add(c.dstNode)
+        indegree[c.dstNode] += 1
+
+    ready = [order[uid] for uid, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    result = []
+    while ready:
+        node = snapshot.nodes[heapq.heappop(ready)]
+        result.append(node)
+        for dst in edges[node.uid]:
+            indegree[dst] -= 1
+            if indegree[dst] == 0:
+                heapq.heappush(ready, order[dst])
+    if len(result) != len(snapshot.nodes):
+        raise GraphCycleError("Graph contains a cycle")
+    return result
+
+
+def _reachableCallables(snapshot, roots=None):
+    """返回从执行链起点（roots，默认为输入执行引脚未连接的 Callable 节点）出发可达的 Callable 节点 uid 集合"""
+    execOut = {}
+    execConnected = set()
+    callables = []
+    for node in snapshot.nodes:
+        if any(p.isExec and p.direction == "in" for p in node.pins):
+            callables.append(node.uid)
+    for c in snapshot.connections:
+        pin = snapshot.getNode(c.srcNode).getPin(c.srcPin, "out")
+        if pin is not None and pin.isExec:
+            execOut.setdefault(c.srcNode, []).append(c.dstNode)
+            execConnected.add(c.dstNode)
+
+    reached = set()
+    if roots is None:
+        stack = [uid for uid in callables if uid not in execConnected]
+    else:
+        stack = [uid for uid in roots if uid in execOut or uid in callables]
+    while stack:
+        uid = stack.pop()
+        if uid not in reached:
+            reached.add(uid)
+            stack.extend(execOut.get(uid, ()))
+    return reached
+
+
+class GraphProgram(object):
+    """
+    线性化的图程序
+
+    关键属性：
+    - steps (list): 按执行顺序排列的 Step
+    - params (list): Param 列表
+    - results (dict): 结果名 -> 槽位编号
+    - slotCount (int): 槽位总数
+    - skipped (dict): build(skipUnsupported=True) 时被跳过的节点 uid -> 原因
+
+    关键方法：
+    - build(snapshot): 从快照构建程序
+    - execute(overrides, token, report): 执行程序，返回所有槽位的值（可取消、上报进度）
+    - outputValues(values): 槽位值 -> (节点 uid, 引脚名) 字典
+    - interpret(**overrides): 解释执行，返回结果字典
+    """
+
+    def __init__(self, steps, params, results, slotCount, skipped=None):
+        super(GraphProgram, self).__init__()
+        self.steps = steps
+        self.params = params
+        self.results = results
+        self.slotCount = slotCount
+        self.skipped = skipped or {}
+
+    @staticmethod
+    def build(snapshot, execRoots=None, skipUnsupported=False):
+        """
+        从快照构建程序
+
+        参数：
+            snapshot (GraphSnapshot): 图快照
+            execRoots (iterable): 执行链起点的节点 uid，None 表示所有输入执行引脚未连接的 Callable 节点；
+                编辑器中没有被触发的执行链不应运行时传入空元组
+            skipUnsupported (bool): 跳过没有注册语义的节点（记录在 skipped 中），而不是抛出异常
+
+        返回：
+            GraphProgram
+
+        异常：
+            UnsupportedNodeError: 存在未注册语义的节点类型
+            GraphCycleError: 存在环
+        """
+        reachable = _reachableCallables(snapshot, execRoots)
+        incoming = {}
+        outgoing = set()
+        for c in snapshot.connections:
+            incoming.setdefault((c.dstNode, c.dstPin), (c.srcNode, c.srcPin))
+            outgoing.add((c.srcNode, c.srcPin))
+
+        slots = {}
+        params = []
+        used = set()
+        steps = []
+        skipped = {}
+        for node in topologicalOrder(snapshot):
+            isCallable = any(p.isExec and p.direction == "in" for p in node.pins)
+            if isCallable and node.uid not in reachable:
+                continue
+            try:
+                semantics = getSemantics(node.type)
+            except UnsupportedNodeError as e:
+                if not skipUnsupported:
+                    raise
+                # 输出不写入槽位：下游输入读取快照中引脚的当前值
+                skipped[node.uid] = str(e)
+                continue
+            for name in semantics.outputs:
+                slots[(node.uid, name)] = len(slots)
+            steps.append((node, semantics))
+
+        slotCount = len(slots)
+        program = []
+        for node, semantics in steps:
+            args = {}
+            for name in semantics.inputs:
+                source = incoming.get((node.uid, name))
+                if source is not None and source in slots:
+                    args[name] = slots[source]
+                    continue
+                pin = node.getPin(name, "in")
+                param = Param(
+                    makeIdentifier(f"{node.name}_{name}", used),
+                    node.uid,
+                    name,
+                    pin.value if pin is not None else None,
+                    slotCount,
+                )
+                params.append(param)
+                args[name] = slotCount
+                slotCount += 1
+            outSlots = {name: slots[(node.uid, name)] for name in semantics.outputs}
+            program.append(Step(node.uid, node.name, node.type, semantics, args, outSlots))
+
+        results = {}
+        for step in program:
+            for name, slot in step.outSlots.items():
+                if (step.uid, name) not in outgoing:
+                    results[f"{step.name}.{name}"] = slot
+        return GraphProgram(program, params, results, slotCount, skipped)
+
+    def execute(self, overrides=None, token=None, report=None):
+        """
+        执行程序，返回所有槽位的值
+
+        参数：
+            overrides (dict): 参数名 -> 值，覆盖快照中的默认值
+            token (CancellationToken): 可选的取消令牌，每个步骤之前检查
+            report (callable): 可选的进度回调 report(done, total, message)
+
+        返回：
+            list: 槽位值列表（用 outputValues() 映射回节点引脚）
+
+        异常：
+            TaskCancelled: 令牌被取消
+        """
+        overrides = overrides or {}
+        values = [None] * self.slotCount
+        for param in self.params:
+            values[param.slot] = overrides.get(param.name, param.default)
+        total = len(self.steps)
+        listeners = Instrumentation.stepListeners()
+        for done, step in enumerate(self.steps):
+            if token is not None:
+                token.raiseIfCancelled()
+            if report is not None:
+                report(done, total, "Evaluating")
+            if listeners:
+                start = time.perf_counter_ns()
+            out = step.semantics.evaluate(**{name: values[slot] for name, slot in step.args.items()})
+            if step.semantics.isAsync:
+                # 协程语义：顺序执行到完成（并发求值见 Core/AsyncEvaluation.py）
+                from .AsyncEvaluation import runCoroutine
+
+                out = runCoroutine(out)
+            if listeners:
+                Instrumentation.recordStep(listeners, step, start)
+            for name, slot in step.outSlots.items():
+                values[slot] = out.get(name)
+        return values
+
+    def outputValues(self, values):
+        """
+        把槽位值映射回节点输出引脚
+
+        参数：
+            values (list): execute() 的返回值
+
+        返回：
+            dict: (节点 uid, 输出引脚名) -> 值
+        """
+        return {(step.uid, name): values[slot] for step in self.steps for name, slot in step.outSlots.items()}
+
+    def interpret(self, **overrides):
+        """
+        解释执行程序
+
+        参数：
+            **overrides: 参数名 -> 值，覆盖快照中的默认值
+
+        返回：
+            dict: 结果名 -> 值
+        """
+        values = self.execute(overrides)
+        return {name: values[slot] for name, slot in self.results.items()}
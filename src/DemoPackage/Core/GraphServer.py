@@ -0,0 +1,600 @@
+"""
+GraphServer - 本地图求值服务与连接池客户端
+
+小的求值请求（几条记录）如果每次都启动解释器、导入 uflow 和本包、读取并编译图，
+启动开销远大于求值本身。这里提供一个常驻的本地服务：
+- 启动时把图加载并编译到常驻的工作进程中（每个工作进程一份 BatchJob，见 Core/BatchRunner.py），
+  之后每个请求只是一次进程间调用和 plan.execute()
+- 协议是 HTTP/1.1 + JSON，监听 localhost TCP 端口或 Unix 套接字，只使用标准库
+- 连接保持打开（keep-alive），同一连接上的请求可以流水线发送（不等待上一个响应）
+- --workers 0 时在服务进程的线程中直接求值（没有进程间开销，适合很小的图）
+
+接口：
+- GET  /health                 -> {"ok": true, "graphs": 图数量}
+- GET  /graphs                 -> {图名: {"inputs": {参数名: 默认值}, "results": [结果名]}}
+- POST /evaluate/<图名>        {"inputs": {参数名: 值}}       -> {"results": {结果名: 值}}
+                               {"batch": [{参数名: 值}, ...]} -> {"results": [{结果名: 值}, ...]}
+  值按 DemoGraphFormat.encodeValue/decodeValue 编解码；出错时返回 4xx/5xx 和 {"error": 信息}
+  （输入名不是图的参数时返回 400，不会被静默忽略）
+
+启动服务：
+    python -m DemoPackage.Core.GraphServer --graph pricing=pricing.demo --port 8765 --workers 4
+    python -m DemoPackage.Core.GraphServer --graph pricing=pricing.demo --unix /tmp/demo-graphs.sock
+
+客户端（连接池 + 流水线）：
+    client = getClient("127.0.0.1:8765")          # 或 "unix:/tmp/demo-graphs.sock"
+    client.evaluate("pricing", {"DemoNode_0_inp": True})
+    client.evaluateMany("pricing", rows)           # 在一个连接上流水线发送，按顺序返回
+
+注意：
+- 只监听本机地址，没有认证；不要把端口暴露到网络上
+- 图文件在启动时加载；修改后在下一个请求时重新读取（服务进程和每个工作进程各自检查），
+  拓扑不变时复用已编译的计划（Core/CompiledPlan.py 的 PlanCache），只更新参数默认值，不需要重启服务
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .BatchRunner import BatchError, BatchJob, loadPlan
+from .CompiledPlan import PlanCache
+from .DemoGraphFormat import decodeValue, encodeValue
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+#: 流水线窗口：一次发送的请求数上限（限制双方缓冲区占用，避免互相等待写完）
+PIPELINE_DEPTH = 32
+
+_table = None
+_plans = PlanCache()
+
+
+class GraphServerError(Exception):
+    """服务返回错误响应"""
+
+    def __init__(self, status, message):
+        super(GraphServerError, self).__init__(f"{status}: {message}")
+        self.status = status
+
+
+def parseAddress(address):
+    """
+    解析服务地址
+
+    参数：
+        address (str): "unix:/路径"、"主机:端口" 或 "http://主机:端口"
+
+    返回：
+        tuple: (socket 地址族, 地址)
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:") :]
+    if "://" in address:
+        address = address.split("://", 1)[1]
+    host, sep, port = address.rstrip("/").rpartition(":")
+    if not sep:
+        raise ValueError(f"expected HOST:PORT or unix:PATH, got {address!r}")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def _fileStamp(path):
+    info = os.stat(path)
+    return (info.st_mtime_ns, info.st_size)
+
+
+def _removeSocket(path):
+    """
+    删除上次运行留下的 Unix 套接字文件
+
+    参数：
+        path (str): 套接字路径
+
+    异常：
+        FileExistsError: 路径存在但不是套接字（不删除普通文件或目录）
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
+
+class _JobTable(object):
+    """图名 -> BatchJob；文件修改标记变化时重新读取（拓扑不变时复用 PlanCache 中已编译的计划）"""
+
+    def __init__(self, graphs):
+        super(_JobTable, self).__init__()
+        self.graphs = dict(graphs)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def job(self, name, stamp):
+        with self._lock:
+            entry = self._jobs.get(name)
+            if entry is None or entry[0] != stamp:
+                plan = loadPlan(self.graphs[name], cache=_plans)
+                bindings = {param.name: param.name for param in plan.program.params}
+                entry = self._jobs[name] = (stamp, BatchJob(plan.program, bindings, plan=plan))
+            return entry[1]
+
+
+def _initWorker(graphs, stamps):
+    global _table
+    # Ctrl+C 发给整个进程组：由服务进程处理并关闭进程池，工作进程忽略
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _table = _JobTable(graphs)
+    for name, stamp in stamps.items():
+        _table.job(name, stamp)
+
+
+def _evaluate(name, stamp, records):
+    rows, _ = _table.job(name, stamp).runBatch(1, records)
+    return rows
+
+
+def _ping():
+    return os.getpid()
+
+
+class GraphService(object):
+    """
+    已加载的图和求值工作进程（与传输协议无关）
+
+    关键方法：
+    - describe(): 图的参数和结果
+    - evaluate(name, records): 求值一批记录
+    - close(): 关闭工作进程
+    """
+
+    def __init__(self, graphs, workers=None):
+        super(GraphService, self).__init__()
+        self.graphs = {name: os.path.abspath(path) for name, path in graphs.items()}
+        self._table = _JobTable(self.graphs)
+        self._stamps = {}
+        self._description = {}
+        for name in self.graphs:
+            self._refresh(name)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        if self.workers > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initWorker,
+                initargs=(self.graphs, dict(self._stamps)),
+            )
+            # 启动前完成所有工作进程的加载和编译，第一个请求不承担启动开销
+            for future in [self._pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        else:
+            self._pool = None
+
+    def _refresh(self, name):
+        """图文件被修改时重新读取（服务进程中的任务和描述），返回当前的修改标记"""
+        stamp = _fileStamp(self.graphs[name])
+        job = self._table.job(name, stamp)
+        if self._stamps.get(name) != stamp:
+            self._description[name] = {
+                "inputs": {param: encodeValue(value) for param, value in job.plan.paramDefaults().items()},
+                "results": [result for result, _ in job.results],
+            }
+            self._stamps[name] = stamp
+        return stamp
+
+    def describe(self):
+        """图名 -> {"inputs": {参数名: 默认值}, "results": [结果名]}（图文件被修改时先重新读取）"""
+        for name in self.graphs:
+            self._refresh(name)
+        return self._description
+
+    def evaluate(self, name, records):
+        """
+        求值一批记录
+
+        参数：
+            name (str): 图名
+            records (list): 参数名 -> JSON 数据
+
+        返回：
+            list: 结果名 -> 值
+
+        异常：
+            KeyError: 图不存在
+            ValueError: 记录中有图没有的输入名
+            BatchError: 记录求值失败
+        """
+        if name not in self.graphs:
+            raise KeyError(name)
+        stamp = self._refresh(name)
+        inputs = self._description[name]["inputs"]
+        for index, record in enumerate(records, 1):
+            for field in record:
+                if field not in inputs:
+                    raise ValueError(f"record {index}: unknown input {field!r}")
+        if self._pool is None:
+            return self._table.job(name, stamp).runBatch(1, records)[0]
+        return self._pool.submit(_evaluate, name, stamp, records).result()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DemoGraphServer/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            print(f"GraphServer: {format % args}", file=sys.stderr)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            self._reply(200, {"ok": True, "graphs": len(service.graphs)})
+        elif self.path == "/graphs":
+            try:
+                description = service.describe()
+            except Exception as e:
+                self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._reply(200, description)
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if not self.path.startswith("/evaluate/"):
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        name = self.path[len("/evaluate/") :]
+        if name not in self.server.service.graphs:
+            self._reply(404, {"error": f"unknown graph {name!r}"})
+            return
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            single = "batch" not in request
+            records = [request.get("inputs") or {}] if single else request["batch"]
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                raise ValueError("inputs must be an object and batch a list of objects")
+            rows = self.server.service.evaluate(name, records)
+        except (ValueError, BatchError) as e:
+            self._reply(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        results = [encodeValue(row) for row in rows]
+        self._reply(200, {"results": results[0] if single else results})
+
+
+class _TcpHandler(_Handler):
+    # 响应头和响应体分两次写入：关闭 Nagle 算法，避免与对端的延迟确认叠加出约 40 毫秒的等待
+    disable_nagle_algorithm = True
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class GraphServer(object):
+    """
+    图求值服务
+
+    关键属性：
+    - service (GraphService): 已加载的图和工作进程
+    - address (str): 实际监听的地址（客户端格式，端口为 0 时是系统分配的端口）
+
+    关键方法：
+    - start(): 在后台线程中运行
+    - serveForever(): 在当前线程中运行（直到 shutdown()）
+    - shutdown(): 停止服务并关闭工作进程
+    """
+
+    def __init__(self, graphs, address=DEFAULT_ADDRESS, workers=None, verbose=False):
+        super(GraphServer, self).__init__()
+        self.service = GraphService(graphs, workers)
+        family, target = parseAddress(address)
+        if family == socket.AF_UNIX:
+            _removeSocket(target)
+            self._server = _UnixHTTPServer(target, _Handler)
+            self.address = f"unix:{target}"
+        else:
+            self._server = ThreadingHTTPServer(target, _TcpHandler)
+            host, port = self._server.server_address[:2]
+            self.address = f"{host}:{port}"
+        self._server.service = self.service
+        self._server.verbose = verbose
+        self._thread = None
+
+    def start(self):
+        """在后台线程中运行服务，返回 self"""
+        self._thread = threading.Thread(target=self.serveForever, name="DemoGraphServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def serveForever(self):
+        self._server.serve_forever()
+
+    def shutdown(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if self.address.startswith("unix:"):
+            _removeSocket(self.address[len("unix:") :])
+        self.service.close()
+
+
+class _Connection(object):
+    """一个保持打开的 HTTP/1.1 连接（只支持本服务的响应格式：带 Content-Length）"""
+
+    def __init__(self, family, target, timeout):
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(target)
+        if family != socket.AF_UNIX:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        self.reusable = True
+
+    def send(self, requests):
+        self.sock.sendall(b"".join(requests))
+
+    def readResponse(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionResetError("server closed the connection")
+        status = int(line.split(None, 2)[1])
+        length = 0
+        while True:
+            line = self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            key = key.strip().lower()
+            if key == "content-length":
+                length = int(value)
+            elif key == "connection" and value.strip().lower() == "close":
+                self.reusable = False
+        return status, self.reader.read(length)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def _request(method, path, payload=None):
+    body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+class GraphClient(object):
+    """
+    图求值服务的客户端（线程安全，内部维护连接池）
+
+    关键方法：
+    - evaluate(graph, inputs): 求值一条记录
+    - evaluateMany(graph, records): 在一个连接上流水线发送多条记录
+    - evaluateBatch(graph, records): 把多条记录放在一个请求中发送
+    - graphs(): 服务上的图和它们的参数、结果
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, poolSize=4, timeout=30.0):
+        super(GraphClient, self).__init__()
+        self.address = address
+        self.timeout = timeout
+        self._family, self._target = parseAddress(address)
+        self._idle = queue.LifoQueue(maxsize=poolSize)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return _Connection(self._family, self._target, self.timeout), False
+
+    def _release(self, conn):
+        if not conn.reusable:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _roundTrip(self, requests):
+        conn, pooled = self._acquire()
+        try:
+            conn.send(requests)
+            responses = [conn.readResponse()]
+        except BaseException as e:
+            # 超时等任何错误之后连接状态未知（可能还有未读的响应），不能放回连接池
+            conn.close()
+            if not pooled or not isinstance(e, ConnectionError):
+                raise
+            # 连接池中的连接可能已被服务端关闭：还没有收到任何响应，用新连接重发一次
+            conn = _Connection(self._family, self._target, self.timeout)
+            try:
+                conn.send(requests)
+                responses = [conn.readResponse()]
+            except BaseException:
+                conn.close()
+                raise
+        try:
+            for _ in range(len(requests) - 1):
+                responses.append(conn.readResponse())
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+
+        decoded = []
+        for status, body in responses:
+            data = json.loads(body or b"{}")
+            if status != 200:
+                raise GraphServerError(status, data.get("error", ""))
+            decoded.append(data)
+        return decoded
+
+    def graphs(self):
+        """图名 -> {"inputs": {参数名: 默认值}, "results": [结果名]}"""
+        return self._roundTrip([_request("GET", "/graphs")])[0]
+
+    def health(self):
+        return self._roundTrip([_request("GET", "/health")])[0]
+
+    def evaluate(self, graph, inputs=None):
+        """
+        求值一条记录
+
+        参数：
+            graph (str): 图名
+            inputs (dict): 参数名 -> 值（未给出的参数使用图中保存的值）
+
+        返回：
+            dict: 结果名 -> 值
+
+        异常：
+            GraphServerError: 服务返回错误（图不存在、求值失败等）
+            OSError: 无法连接服务
+        """
+        payload = {"inputs": encodeValue(inputs or {})}
+        (data,) = self._roundTrip([_request("POST", f"/evaluate/{graph}", payload)])
+        return decodeValue(data["results"])
+
+    def evaluateMany(self, graph, records, depth=PIPELINE_DEPTH):
+        """
+        流水线求值多条记录：每次在一个连接上连续发送 depth 个请求，再依次读取响应
+
+        参数：
+            graph (str): 图名
+            records (iterable): 参数名 -> 值
+            depth (int): 流水线窗口大小
+
+        返回：
+            list: 与 records 顺序相同的结果字典
+        """
+        results = []
+        window = []
+        path = f"/evaluate/{graph}"
+        for inputs in records:
+            window.append(_request("POST", path, {"inputs": encodeValue(inputs)}))
+            if len(window) >= depth:
+                results.extend(decodeValue(data["results"]) for data in self._roundTrip(window))
+                window = []
+        if window:
+            results.extend(decodeValue(data["results"]) for data in self._roundTrip(window))
+        return results
+
+    def evaluateBatch(self, graph, records):
+        """
+        把多条记录放在一个请求中求值（记录很多、每条很小时比流水线更省）
+
+        参数：
+            graph (str): 图名
+            records (list): 参数名 -> 值
+
+        返回：
+            list: 与 records 顺序相同的结果字典
+        """
+        payload = {"batch": [encodeValue(inputs) for inputs in records]}
+        (data,) = self._roundTrip([_request("POST", f"/evaluate/{graph}", payload)])
+        return decodeValue(data["results"])
+
+    def close(self):
+        """关闭连接池中的所有连接"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_clients = {}
+_clientsLock = threading.Lock()
+
+
+def getClient(address=DEFAULT_ADDRESS):
+    """
+    获取地址对应的共享客户端（同一进程中的节点共用连接池）
+
+    参数：
+        address (str): 服务地址
+
+    返回：
+        GraphClient
+    """
+    with _clientsLock:
+        client = _clients.get(address)
+        if client is None:
+            client = _clients[address] = GraphClient(address)
+        return client
+
+
+def main(argv=None):
+    """
+    命令行入口（pyproject.toml 中注册为 demo-serve）
+
+    参数：
+        argv (list): 命令行参数，默认为 sys.argv[1:]
+
+    返回：
+        int: 退出码
+    """
+    parser = argparse.ArgumentParser(prog="demo-serve", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--graph", action="append", required=True, metavar="NAME=PATH", help="graph to serve (*.demo)")
+    parser.add_argument("--host", default="127.0.0.1", help="listen address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes; 0 evaluates in server threads (default: CPU count)")
+    parser.add_argument("--verbose", action="store_true", help="log every request to stderr")
+    args = parser.parse_args(argv)
+
+    graphs = {}
+    for item in args.graph:
+        name, sep, path = item.partition("=")
+        if not sep or not name or not path:
+            parser.error(f"--graph expects NAME=PATH, got {item!r}")
+        graphs[name] = path
+    address = f"unix:{args.unix}" if args.unix else f"{args.host}:{args.port}"
+
+    try:
+        server = GraphServer(graphs, address, args.workers, args.verbose)
+    except Exception as e:
+        print(f"demo-serve: {type(e).__name__}: {e}", file=sys.stderr)
+        return 2
+    print(f"demo-serve: {len(graphs)} graphs on {server.address} ({server.service.workers} workers)", file=sys.stderr)
+    try:
+        server.serveForever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
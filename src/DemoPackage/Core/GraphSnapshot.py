@@ -0,0 +1,256 @@
+"""
+GraphSnapshot - 图状态快照
+
+在主线程中以很低的成本把图的结构和引脚值复制为纯数据，
+之后的序列化、写文件等耗时工作可以安全地交给工作线程。
+
+快照一致性：
+- capture() 在主线程中一次性完成，期间用户无法编辑图
+- 不可变的值（bool、int、float、str、None、tuple 等）直接共享引用
+- 可变的值（list、dict、自定义对象）深拷贝，之后用户继续编辑不会影响快照
+- 快照对象本身只包含纯 Python 数据，不持有任何节点或引脚的引用
+
+组成：
+- PinRecord: 引脚记录（名称、方向、数据类型、值）
+- NodeRecord: 节点记录（uid、名称、类型、包、函数库、位置、引脚）
+- ConnectionRecord: 连接记录（源节点/引脚 -> 目标节点/引脚）
+- GraphSnapshot: 整个图的快照
+"""
+
+import copy
+
+#: 可以直接共享引用的不可变类型
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, frozenset)
+
+
+def freezeValue(value):
+    """
+    复制引脚值，使其与原图解耦
+
+    参数：
+        value: 引脚当前的值
+
+    返回：
+        与原值相等、但不共享可变状态的值
+
+    规则：
+    - 不可变类型直接返回
+    - 只包含不可变元素的 tuple 直接返回
+    - 其他情况使用 copy.deepcopy
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, tuple) and all(isinstance(v, IMMUTABLE_TYPES) for v in value):
+        return value
+    return copy.deepcopy(value)
+
+
+class PinRecord(object):
+    """
+    引脚记录
+
+    属性：
+    - name (str): 引脚名称
+    - direction (str): "in" 或 "out"
+    - dataType (str): 引脚类型名称（如 'BoolPin'、'DemoPin'）
+    - isExec (bool): 是否是执行引脚
+    - value: 引脚值（执行引脚和已连接的输入引脚为 None）
+    """
+
+    __slots__ = ("name", "direction", "dataType", "isExec", "value")
+
+    def __init__(self, name, direction, dataType, isExec=False, value=None):
+        self.name = name
+        self.direction = direction
+        self.dataType = dataType
+        self.isExec = isExec
+        self.value = value
+
+
+class NodeRecord(object):
+    """
+    节点记录
+
+    属性：
+    - uid (str): 节点唯一标识
+    - name (str): 节点名称
+    - type (str): 节点类型（类节点为类名，函数节点为函数名）
+    - package (str): 所属包名
+    - lib (str): 函数库名（类节点为 None）
+    - x, y (float): 画布位置
+    - pins (list): PinRecord 列表，输入在前、输出在后
+    """
+
+    __slots__ = ("uid", "name", "type", "package", "lib", "x", "y", "pins")
+
+    def __init__(self, uid, name, type, package=None, lib=None, x=0.0, y=0.0, pins=None):
+        self.uid = uid
+        self.name = name
+        self.type = type
+        self.package = package
+        self.lib = lib
+        self.x = x
+        self.y = y
+        self.pins = pins if pins is not None else []
+
+    def getPin(self, name, direction=None):
+        """
+        按名称查找引脚记录
+
+        参数：
+            name (str): 引脚名称
+            direction (str): 可选，"in" 或 "out"
+
+        返回：
+            PinRecord 或 None
+        """
+        for pin in self.pins:
+            if pin.name == name and (direction is None or pin.direction == direction):
+                return pin
+        return None
+
+    def inputs(self):
+        """返回输入引脚记录列表"""
+        return [p for p in self.pins if p.direction == "in"]
+
+    def outputs(self):
+        """返回输出引脚记录列表"""
+        return [p for p in self.pins if p.direction == "out"]
+
+
+class ConnectionRecord(object):
+    """
+    连接记录
+
+    属性：
+    - srcNode (str): 源节点 uid
+    - srcPin (str): 源引脚名称（输出引脚）
+    - dstNode (str): 目标节点 uid
+    - dstPin (str): 目标引脚名称（输入引脚）
+    """
+
+    __slots__ = ("srcNode", "srcPin", "dstNode", "dstPin")
+
+    def __init__(self, srcNode, srcPin, dstNode, dstPin):
+        self.srcNode = srcNode
+        self.srcPin = srcPin
+        self.dstNode = dstNode
+        self.dstPin = dstPin
+
+    def key(self):
+        """返回可哈希的连接标识元组"""
+        return (self.srcNode, self.srcPin, self.dstNode, self.dstPin)
+
+
+class GraphSnapshot(object):
+    """
+    图快照
+
+    只包含纯数据，可以在线程之间传递、序列化或用于无界面求值。
+
+    关键方法：
+    - capture(graph): 从活动图创建快照（必须在主线程调用）
+    - getNode(uid): 按 uid 查找节点记录
+    - valueCount(): 需要保存的引脚值数量
+    """
+
+    def __init__(self, name="", nodes=None, connections=None):
+        """
+        初始化快照
+
+        参数：
+            name (str): 图名称
+            nodes (list): NodeRecord 列表
+            connections (list): ConnectionRecord 列表
+        """
+        super(GraphSnapshot, self).__init__()
+        self.name = name
+        self.nodes = nodes if nodes is not None else []
+        self.connections = connections if connections is not None else []
+        self._index = None
+
+    @staticmethod
+    def capture(graph):
+        """
+        从图对象创建快照
+
+        参数：
+            graph (GraphBase): 要快照的图
+
+        返回：
+            GraphSnapshot: 与原图完全解耦的快照
+
+        注意：
+        - 必须在主线程调用（会访问节点和引脚对象）
+        - 只保存未连接的输入数据引脚的值，输出值可以重新计算
+        """
+        from uflow.Core.Common import getConnectedPins
+
+        nodes = []
+        connections = []
+        for node in graph.getNodesList():
+            pins = []
+            for direction, ordered in (("in", node.orderedInputs), ("out", node.orderedOutputs)):
+                for pin in ordered.values():
+                    isExec = pin.isExec()
+                    value = None
+                    if direction == "in" and not isExec and not pin.hasConnections():
+                        value = freezeValue(pin.currentData())
+                    pins.append(PinRecord(pin.name, direction, pin.dataType, isExec, value))
+                    if direction == "out":
+                        for other in getConnectedPins(pin):
+                            connections.append(
+                                ConnectionRecord(
+                                    str(node.uid),
+                                    pin.name,
+                                    str(other.owningNode().uid),
+                                    other.name,
+                                )
+                            )
+            nodes.append(
+                NodeRecord(
+                    str(node.uid),
+                    node.getName(),
+                    node.__class__.__name__,
+                    node.packageName,
+                    node.lib,
+                    float(getattr(node, "x", 0.0)),
+                    float(getattr(node, "y", 0.0)),
+                    pins,
+                )
+            )
+        return GraphSnapshot(graph.name, nodes, connections)
+
+    def getNode(self, uid):
+        """
+        按 uid 查找节点记录
+
+        参数：
+            uid (str): 节点 uid
+
+        返回：
+            NodeRecord 或 None
+        """
+        if self._index is None or len(self._index) != len(self.nodes):
+            self._index = {n.uid: n for n in self.nodes}
+        return self._index.get(uid)
+
+    def iterValues(self):
+        """
+        遍历需要保存的引脚值
+
+        生成：
+            (nodeUid, pinName, value) 元组
+        """
+        connected = {(c.dstNode, c.dstPin) for c in self.connections}
+        for node in self.nodes:
+            for pin in node.pins:
+                if pin.direction != "in" or pin.isExec:
+                    continue
+                if (node.uid, pin.name) in connected:
+                    continue
+                yield node.uid, pin.name, pin.value
+
+    def valueCount(self):
+        """返回需要保存的引脚值数量"""
+        return sum(1 for _ in self.iterValues())
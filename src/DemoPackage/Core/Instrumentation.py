@@ -0,0 +1,220 @@
+"""
+Instrumentation - 节点执行插桩
+
+在框架的两个执行入口上安装轻量级钩子，把每次执行报告给监听器：
+- NodeBase.processNode: 纯节点被求值引擎拉取计算时调用（kind = "compute"）
+- ExecPin.call: 执行引脚被调用时触发
+  * 输入执行引脚：驱动 Callable 节点的 compute（kind = "exec-in"）
+  * 输出执行引脚：把执行流传递给下游（kind = "exec-out"）
+
+快照求值（后台求值、批量任务、图服务等）不经过框架的节点对象，由求值器自己报告每个步骤
+（kind = "step"）：GraphProgram.execute、CompiledPlan.execute、并发求值（AsyncEvaluation）、
+并行求值（ParallelEvaluation）、增量求值（IncrementalEvaluation）和结果缓存（ResultCache，只报告实际计算的步骤）
+在每次执行开始时调用 stepListeners()，有监听器时对每个步骤计时并调用 recordStep()。
+step 事件的 node 参数是 GraphProgram.Step（有 uid、name、type 属性，不是框架节点）。
+
+监听器接口：
+    listener.record(node, kind, name, startNs, durationNs, selfNs, threadId)
+
+- startNs/durationNs: time.perf_counter_ns() 时间戳和耗时（纳秒）
+- selfNs: 自身耗时 = 总耗时 - 嵌套的节点执行耗时（exec-out 为透明事件，不参与扣除）
+- name: 事件名称（节点名，或 "节点名.引脚名"）
+
+开销：
+- 没有监听器时钩子被卸载，框架恢复原始方法，没有任何开销
+- 有监听器时每次执行只增加两次计时和两次列表追加/弹出
+- 快照求值器没有监听器时只在每次执行开始时多读取一次监听器元组
+- currentNode() 返回当前线程中正在执行的节点（用于日志归属）
+
+注意：
+- 钩子是进程级的（修改类方法），多个监听器共享同一组钩子
+- 没有 uflow 的无界面进程中不安装框架钩子，只有 step 事件
+- 在插桩之后包装同一方法的其他钩子必须在调用时通过自身的 __wrapped__ 调用内层方法，
+  这样卸载插桩时可以把插桩包装从调用链中摘除
+- 监听器的 record 可能在任意线程中调用，必须足够快且不能访问 Qt 控件
+"""
+
+import threading
+import time
+
+_listeners = ()
+_originals = {}
+_wrappers = {}
+_lock = threading.Lock()
+_state = threading.local()
+
+#: 快照求值器中一个步骤的执行
+STEP_KIND = "step"
+
+#: 计入节点自身执行的事件类型
+NODE_KINDS = ("compute", "exec-in", STEP_KIND)
+
+
+def _stack():
+    stack = getattr(_state, "stack", None)
+    if stack is None:
+        stack = _state.stack = []
+    return stack
+
+
+def _nodes():
+    nodes = getattr(_state, "nodes", None)
+    if nodes is None:
+        nodes = _state.nodes = []
+    return nodes
+
+
+def _instrument(original, kind, nodeOf, nameOf):
+    def wrapper(self, *args, **kwargs):
+        listeners = _listeners
+        if not listeners:
+            return original(self, *args, **kwargs)
+        resolvedKind = kind(self) if callable(kind) else kind
+        isNode = resolvedKind in NODE_KINDS
+        node = nodeOf(self)
+        stack = _stack()
+        nodes = _nodes()
+        if isNode:
+            stack.append(0)
+            nodes.append(node)
+        start = time.perf_counter_ns()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            child = 0
+            if isNode:
+                child = stack.pop()
+                nodes.pop()
+                if stack:
+                    stack[-1] += duration
+            name = nameOf(self)
+            tid = threading.get_ident()
+            for listener in listeners:
+                listener.record(node, resolvedKind, name, start, duration, duration - child, tid)
+
+    wrapper.__wrapped__ = original
+    return wrapper
+
+
+def _install():
+    try:
+        from uflow.Core.Common import PinDirection
+        from uflow.Core.NodeBase import NodeBase
+        from uflow.Packages.FlowBasePackage.Pins.ExecPin import ExecPin
+    except ImportError:
+        return
+
+    _originals[(NodeBase, "processNode")] = NodeBase.processNode
+    _originals[(ExecPin, "call")] = ExecPin.call
+
+    NodeBase.processNode = _instrument(
+        NodeBase.processNode, "compute", lambda node: node, lambda node: node.getName()
+    )
+    ExecPin.call = _instrument(
+        ExecPin.call,
+        lambda pin: "exec-in" if pin.direction == PinDirection.Input else "exec-out",
+        lambda pin: pin.owningNode(),
+        lambda pin: f"{pin.owningNode().getName()}.{pin.name}",
+    )
+    _wrappers[(NodeBase, "processNode")] = NodeBase.processNode
+    _wrappers[(ExecPin, "call")] = ExecPin.call
+
+
+def _uninstall():
+    for (owner, attr), original in _originals.items():
+        wrapper = _wrappers[(owner, attr)]
+        current = getattr(owner, attr)
+        if current is wrapper:
+            setattr(owner, attr, original)
+            continue
+        # 插桩之后又有其他钩子（如 Core/ExecScheduler.py）包装了同一方法：
+        # 外层钩子通过 __wrapped__ 调用内层，把插桩包装从链中摘除即可
+        while current is not None:
+            if getattr(current, "__wrapped__", None) is wrapper:
+                current.__wrapped__ = original
+                break
+            current = getattr(current, "__wrapped__", None)
+    _originals.clear()
+    _wrappers.clear()
+
+
+def addListener(listener):
+    """
+    注册监听器（第一个监听器注册时安装钩子）
+
+    参数：
+        listener: 实现 record(...) 的对象
+    """
+    global _listeners
+    with _lock:
+        if listener in _listeners:
+            return
+        if not _listeners:
+            _install()
+        _listeners = _listeners + (listener,)
+
+
+def removeListener(listener):
+    """
+    移除监听器（最后一个监听器移除时卸载钩子）
+
+    参数：
+        listener: 之前注册的监听器
+    """
+    global _listeners
+    with _lock:
+        if listener not in _listeners:
+            return
+        _listeners = tuple(l for l in _listeners if l is not listener)
+        if not _listeners:
+            _uninstall()
+
+
+def hasListener(listener):
+    """监听器是否已注册"""
+    return listener in _listeners
+
+
+def isActive():
+    """是否有监听器（钩子已安装）"""
+    return bool(_listeners)
+
+
+def stepListeners():
+    """
+    当前的监听器（快照求值器在每次执行开始时读取一次）
+
+    返回：
+        tuple: 没有监听器时为空元组，求值器使用不计时的路径
+    """
+    return _listeners
+
+
+def recordStep(listeners, step, startNs):
+    """
+    报告快照求值器中一个步骤的执行（在执行步骤的线程中、步骤完成后调用）
+
+    参数：
+        listeners (tuple): stepListeners() 的返回值
+        step (Step): 执行的步骤
+        startNs (int): 步骤开始时的 time.perf_counter_ns()
+
+    说明：
+    - 步骤之间没有嵌套，自身耗时等于总耗时
+    - 异步步骤的耗时包括等待时间（从开始执行到得到结果）
+    """
+    duration = time.perf_counter_ns() - startNs
+    tid = threading.get_ident()
+    for listener in listeners:
+        listener.record(step, STEP_KIND, step.name, startNs, duration, duration, tid)
+
+
+def currentNode():
+    """
+    当前线程中正在执行的节点（没有监听器或不在节点执行中时返回 None）
+
+    用于把执行期间产生的输出（print、警告等）归属到节点，见 Core/LogCapture.py
+    """
+    nodes = getattr(_state, "nodes", None)
+    return nodes[-1] if nodes else None
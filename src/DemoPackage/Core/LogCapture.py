@@ -0,0 +1,271 @@
+"""
+LogCapture - 节点输出捕获（环形缓冲区）
+
+捕获图执行期间的输出并写入有界的环形缓冲区，由界面按固定帧率批量显示：
+- print 输出（如 demoLibGreet 的问候）：替换 sys.stdout/sys.stderr
+- 警告：替换 warnings.showwarning
+- 日志：根 logger 上的 Handler（WARNING 及以上）
+- 节点错误：NodeBase.setError（框架捕获的节点异常）
+- 未捕获的异常：sys.excepthook/threading.excepthook
+
+归属：
+- 通过 Instrumentation.currentNode() 把输出归属到正在执行的节点，
+  不在节点执行中产生的输出归属为空节点名
+
+低开销：
+- 写入只做一次加锁和一次 deque 追加，不做任何界面操作
+- 与上一条完全相同（同一节点、同一级别、同一文字）的输出只增加重复计数
+- 缓冲区写满后丢弃最旧的条目
+- 默认不再回显到终端（终端渲染本身可能成为瓶颈），可以用 echo 打开
+
+使用方式：
+    capture = logCapture()
+    capture.start()
+    ...  # 执行图
+    for entry in capture.buffer.since(0):
+        print(entry.node, entry.text, entry.count)
+"""
+
+import itertools
+import logging
+import sys
+import threading
+import time
+import warnings
+from collections import deque
+
+from . import Instrumentation
+
+
+class LogEntry(object):
+    """
+    一条日志
+
+    属性：
+    - seq (int): 递增序号
+    - time (float): 时间戳（time.time()）
+    - node (str): 节点名称（不在节点执行中时为 ""）
+    - level (str): "output"、"stderr"、"warning"、"error"
+    - text (str): 一行文字
+    - count (int): 连续重复次数
+    """
+
+    __slots__ = ("seq", "time", "node", "level", "text", "count")
+
+    def __init__(self, seq, time, node, level, text):
+        self.seq = seq
+        self.time = time
+        self.node = node
+        self.level = level
+        self.text = text
+        self.count = 1
+
+
+class LogBuffer(object):
+    """
+    有界日志缓冲区（线程安全）
+
+    关键方法：
+    - append(node, level, text): 追加一条（与上一条相同时只增加计数）
+    - since(seq): 序号大于 seq 的条目
+    - last(): 最后一条
+    """
+
+    def __init__(self, capacity=10000):
+        super(LogBuffer, self).__init__()
+        self.capacity = capacity
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.nodes = set()
+
+    def append(self, node, level, text):
+        with self._lock:
+            last = self._entries[-1] if self._entries else None
+            if last is not None and last.text == text and last.node == node and last.level == level:
+                last.count += 1
+                return
+            self._seq += 1
+            self._entries.append(LogEntry(self._seq, time.time(), node, level, text))
+            self.nodes.add(node)
+
+    def since(self, seq):
+        """
+        序号大于 seq 的条目
+
+        参数：
+            seq (int): 已处理的最后序号
+
+        返回：
+            list: LogEntry 列表
+        """
+        with self._lock:
+            if not self._entries or self._entries[-1].seq <= seq:
+                return []
+            first = self._entries[0].seq
+            return list(itertools.islice(self._entries, max(0, seq + 1 - first), None))
+
+    def last(self):
+        """最后一条（没有时返回 None）"""
+        with self._lock:
+            return self._entries[-1] if self._entries else None
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._lock:
+            self._entries.clear()
+            self.nodes.clear()
+
+
+class _Stream(object):
+    """替换 sys.stdout/sys.stderr 的文件对象：按行写入缓冲区"""
+
+    def __init__(self, capture, original, level):
+        self._capture = capture
+        self._original = original
+        self._level = level
+        self._partial = threading.local()
+
+    def write(self, text):
+        if self._capture.echo:
+            self._original.write(text)
+        pending = getattr(self._partial, "text", "") + text
+        lines = pending.split("\n")
+        self._partial.text = lines.pop()
+        for line in lines:
+            self._capture.emit(self._level, line)
+        return len(text)
+
+    def flush(self):
+        if self._capture.echo:
+            self._original.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+
+class _Handler(logging.Handler):
+    def __init__(self, capture):
+        super(_Handler, self).__init__(logging.WARNING)
+        self._capture = capture
+
+    def emit(self, record):
+        level = "error" if record.levelno >= logging.ERROR else "warning"
+        for line in self.format(record).splitlines():
+            self._capture.emit(level, line)
+
+
+class LogCapture(object):
+    """
+    输出捕获器
+
+    关键方法：
+    - start()/stop(): 安装/卸载所有捕获钩子
+    - isCapturing(): 是否正在捕获
+    - emit(level, text): 写入一行（自动归属到当前节点）
+    """
+
+    def __init__(self, capacity=10000):
+        super(LogCapture, self).__init__()
+        self.buffer = LogBuffer(capacity)
+        self.echo = False
+        self._saved = None
+
+    def isCapturing(self):
+        """是否正在捕获"""
+        return self._saved is not None
+
+    def record(self, node, kind, name, startNs, durationNs, selfNs, threadId):
+        """插桩监听器接口（只用于保持钩子安装，以便 currentNode() 可用）"""
+
+    def emit(self, level, text, node=None):
+        """
+        写入一行
+
+        参数：
+            level (str): 级别
+            text (str): 文字
+            node: 节点（为 None 时使用当前正在执行的节点）
+        """
+        if node is None:
+            node = Instrumentation.currentNode()
+        self.buffer.append(node.getName() if node is not None else "", level, text)
+
+    def start(self):
+        """安装捕获钩子"""
+        from uflow.Core.NodeBase import NodeBase
+
+        if self._saved is not None:
+            return
+        setError = NodeBase.setError
+        capture = self
+
+        def captureError(node, err):
+            for line in str(err).splitlines() or [""]:
+                capture.emit("error", line, node)
+            return setError(node, err)
+
+        def showWarning(message, category, filename, lineno, file=None, line=None):
+            capture.emit("warning", f"{category.__name__}: {message} ({filename}:{lineno})")
+
+        originalExcepthook = sys.excepthook
+        originalThreadExcepthook = threading.excepthook
+
+        def excepthook(excType, value, tb):
+            capture.emit("error", f"{excType.__name__}: {value}")
+            originalExcepthook(excType, value, tb)
+
+        def threadExcepthook(args):
+            capture.emit("error", f"{args.exc_type.__name__}: {args.exc_value}")
+            originalThreadExcepthook(args)
+
+        handler = _Handler(self)
+        self._saved = {
+            "stdout": sys.stdout,
+            "stderr": sys.stderr,
+            "showwarning": warnings.showwarning,
+            "excepthook": originalExcepthook,
+            "threading.excepthook": originalThreadExcepthook,
+            "setError": setError,
+            "handler": handler,
+        }
+        sys.stdout = _Stream(self, sys.stdout, "output")
+        sys.stderr = _Stream(self, sys.stderr, "stderr")
+        warnings.showwarning = showWarning
+        sys.excepthook = excepthook
+        threading.excepthook = threadExcepthook
+        NodeBase.setError = captureError
+        logging.getLogger().addHandler(handler)
+        Instrumentation.addListener(self)
+
+    def stop(self):
+        """卸载捕获钩子，恢复原来的输出流"""
+        from uflow.Core.NodeBase import NodeBase
+
+        saved, self._saved = self._saved, None
+        if saved is None:
+            return
+        Instrumentation.removeListener(self)
+        logging.getLogger().removeHandler(saved["handler"])
+        NodeBase.setError = saved["setError"]
+        threading.excepthook = saved["threading.excepthook"]
+        sys.excepthook = saved["excepthook"]
+        warnings.showwarning = saved["showwarning"]
+        sys.stderr = saved["stderr"]
+        sys.stdout = saved["stdout"]
+
+
+_capture = None
+
+
+def logCapture():
+    """
+    获取进程内共享的输出捕获器
+
+    返回：
+        LogCapture
+    """
+    global _capture
+    if _capture is None:
+        _capture = LogCapture()
+    return _capture
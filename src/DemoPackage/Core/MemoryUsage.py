@@ -0,0 +1,251 @@
+"""
+MemoryUsage - 引脚数据内存占用统计
+
+遍历图中所有引脚的当前数据，估算每个引脚的数据占用的内存，
+并按节点、按引脚类型汇总，找出占用最大的引脚。
+
+大小估算（deepSizeOf）：
+- 基于 sys.getsizeof，递归计入容器元素、实例的 __dict__ 和 __slots__ 属性
+- 用 id 集合处理循环引用和共享引用，同一个对象只计一次
+- 缓冲区数据：mmap 计入映射长度；其它支持缓冲区协议的对象（如 numpy 数组视图）
+  在 getsizeof 小于缓冲区字节数时按缓冲区字节数计算
+- 类、模块、函数等不属于数据本身，不计入
+- 结果是近似值：解释器内部共享的小整数、驻留字符串等也会被计入
+
+归属规则：
+- 整个遍历共享一个 seen 集合，被多个引脚引用的对象只归属给第一个遇到它的引脚
+- 先遍历输出引脚再遍历输入引脚，连接传递的数据因此归属给产生它的节点
+- 汇总的总量因此近似等于图中引脚数据实际占用的内存
+
+使用方式：
+    report = MemoryReport()
+    for usage in iterPinUsage(graph):
+        report.add(usage)
+    report.largest(20)
+"""
+
+import mmap
+import sys
+import types
+from collections import deque
+
+#: 不属于数据本身、不递归进入的类型
+_SKIP_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+)
+
+
+def _bufferSize(obj):
+    if isinstance(obj, mmap.mmap):
+        try:
+            return len(obj)
+        except ValueError:  # 已关闭
+            return 0
+    if isinstance(obj, (bytes, bytearray, str)):
+        return 0
+    try:
+        with memoryview(obj) as view:
+            return view.nbytes
+    except TypeError:
+        return 0
+
+
+def _children(obj):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key
+            yield value
+        return
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        yield from obj
+        return
+    if isinstance(obj, memoryview):
+        yield obj.obj
+        return
+    attrs = getattr(obj, "__dict__", None)
+    if isinstance(attrs, dict):
+        yield attrs
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot in ("__dict__", "__weakref__"):
+                continue
+            try:
+                yield getattr(obj, slot)
+            except AttributeError:
+                pass
+
+
+def deepSizeOf(obj, seen=None):
+    """
+    估算对象及其引用的所有对象占用的内存
+
+    参数：
+        obj: 任意对象
+        seen (set): 已计入的对象 id 集合（可选，跨多次调用共享时重复对象只计一次）
+
+    返回：
+        int: 字节数
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    pending = [obj]
+    while pending:
+        current = pending.pop()
+        key = id(current)
+        if key in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(key)
+        try:
+            size = sys.getsizeof(current)
+        except TypeError:
+            size = 0
+        total += max(size, _bufferSize(current))
+        pending.extend(_children(current))
+    return total
+
+
+class PinUsage(object):
+    """
+    单个引脚的内存占用
+
+    属性：
+    - nodeUid: 节点 uid
+    - nodeName (str): 节点名称
+    - pinName (str): 引脚名称
+    - direction (str): "in" 或 "out"
+    - dataType (str): 引脚数据类型
+    - valueType (str): 当前数据的 Python 类型名
+    - size (int): 归属给该引脚的字节数
+    """
+
+    __slots__ = ("nodeUid", "nodeName", "pinName", "direction", "dataType", "valueType", "size")
+
+    def __init__(self, nodeUid, nodeName, pinName, direction, dataType, valueType, size):
+        self.nodeUid = nodeUid
+        self.nodeName = nodeName
+        self.pinName = pinName
+        self.direction = direction
+        self.dataType = dataType
+        self.valueType = valueType
+        self.size = size
+
+
+class UsageGroup(object):
+    """
+    汇总结果（一个节点或一种引脚类型）
+
+    属性：
+    - key (str): 节点名称或引脚类型
+    - pins (int): 引脚数
+    - size (int): 字节数合计
+    """
+
+    __slots__ = ("key", "pins", "size")
+
+    def __init__(self, key):
+        self.key = key
+        self.pins = 0
+        self.size = 0
+
+
+def iterPinUsage(graph, seen=None):
+    """
+    逐个引脚统计内存占用（生成器）
+
+    参数：
+        graph: uflow 图对象
+        seen (set): 可选的已计入对象 id 集合
+
+    生成：
+        PinUsage: 每个有数据的引脚一条（执行引脚跳过）
+    """
+    if seen is None:
+        seen = set()
+    nodes = graph.getNodesList()
+    for node in nodes:
+        for direction, pins in (("out", node.orderedOutputs), ("in", node.orderedInputs)):
+            for pin in pins.values():
+                if pin.isExec():
+                    continue
+                value = pin.currentData()
+                yield PinUsage(
+                    node.uid,
+                    node.getName(),
+                    pin.name,
+                    direction,
+                    pin.dataType,
+                    type(value).__name__,
+                    deepSizeOf(value, seen),
+                )
+
+
+class MemoryReport(object):
+    """
+    内存占用汇总
+
+    关键方法：
+    - add(usage): 加入一个引脚的统计
+    - byNode()/byType(): 按节点/引脚类型汇总，按字节数降序
+    - largest(n): 占用最大的 n 个引脚
+    """
+
+    def __init__(self):
+        super(MemoryReport, self).__init__()
+        self.pins = []
+        self.total = 0
+
+    def add(self, usage):
+        """加入一个引脚的统计"""
+        self.pins.append(usage)
+        self.total += usage.size
+
+    def _group(self, keyOf):
+        groups = {}
+        for usage in self.pins:
+            key = keyOf(usage)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = UsageGroup(key)
+            group.pins += 1
+            group.size += usage.size
+        return sorted(groups.values(), key=lambda g: g.size, reverse=True)
+
+    def byNode(self):
+        """按节点汇总（同名节点按 uid 区分）"""
+        names = {u.nodeUid: u.nodeName for u in self.pins}
+        groups = self._group(lambda u: u.nodeUid)
+        for group in groups:
+            group.key = names[group.key]
+        return groups
+
+    def byType(self):
+        """按引脚数据类型汇总"""
+        return self._group(lambda u: u.dataType)
+
+    def largest(self, count=50):
+        """占用最大的 count 个引脚"""
+        return sorted(self.pins, key=lambda u: u.size, reverse=True)[:count]
+
+
+def formatSize(size):
+    """
+    格式化字节数
+
+    参数：
+        size (int): 字节数
+
+    返回：
+        str: 例如 "512 B"、"1.5 MB"
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
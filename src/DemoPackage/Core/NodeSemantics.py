@@ -0,0 +1,380 @@
+"""
+NodeSemantics - 节点语义注册表
+
+为节点类型提供与框架无关的纯 Python 实现，
+使图可以脱离引脚对象、脏标记和分发机制直接求值或生成代码。
+
+每个节点类型的语义包括：
+- inputs / outputs: 数据输入、输出引脚名称
+- evaluate(**inputs): 计算函数，返回 {输出引脚名: 值}
+- expression: 代码生成用的表达式模板（如 "not {inp}"）
+- imports: 生成代码需要的 import 语句
+- pure: 是否是纯节点（无副作用、结果只取决于输入）
+- blocking: 同步计算是否可能阻塞（并发求值时放到线程池执行，见 Core/AsyncEvaluation.py）
+- version: 语义版本，节点逻辑变化时递增（用于缓存失效）
+- fingerprint: evaluate 代码的指纹（codeFingerprint），修改函数代码后自动变化（用于缓存失效）
+
+evaluate 可以是协程函数（async def），用于 I/O 密集的节点（读文件、调用本地服务），
+并发求值时直接 await，同步求值时执行到完成。
+
+内置语义（都在第一次查找时延迟注册）：
+- DemoNode: 由 DemoNode.compute 生成（classSemantics），求值时运行节点类自己的 compute，
+  修改 compute 后所有快照求值路径随之变化；表达式 DemoNode.computeExpression 在注册时与 compute 核对
+- DemoLib 中所有 @IMPLEMENT_NODE 函数（自动发现）
+
+添加新节点：
+    registerSemantics("MyNode", NodeSemantics(
+        inputs=("a", "b"), outputs=("out",),
+        evaluate=lambda a, b: {"out": a + b},
+        expression="({a} + {b})"))
+"""
+
+import functools
+import hashlib
+import inspect
+import types
+
+#: 函数节点返回值对应的输出引脚名称
+RETURN_PIN = "out"
+
+
+class UnsupportedNodeError(Exception):
+    """节点类型没有注册语义，无法脱离框架求值"""
+
+
+def _hashCode(h, code):
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hashCode(h, const)
+        elif isinstance(const, frozenset):
+            # 集合的顺序受字符串哈希随机化影响，排序后才能在不同进程间保持一致
+            h.update(repr(sorted(map(repr, const))).encode())
+        else:
+            h.update(repr(const).encode())
+
+
+def codeFingerprint(fn):
+    """
+    计算函数代码的指纹
+
+    包括函数的字节码、常量（含嵌套函数的代码）和引用的名称，以及闭包中引用的函数
+    （例如自动生成的 DemoLib 语义包装的原函数）和类的 compute（classSemantics/computeSemantics
+    生成的语义引用节点类，DemoNode.compute 等类节点代码因此也在指纹范围内），不包括行号：
+    只移动代码位置不会改变指纹。
+
+    说明：
+    - 被调用的其它模块函数不在指纹范围内，修改它们时仍需递增 NodeSemantics.version
+    - 字节码与 Python 版本有关，升级解释器后指纹会变化（缓存全部重新计算）
+
+    参数：
+        fn (callable): 函数、方法或 functools.partial
+
+    返回：
+        bytes: 8 字节指纹（没有 Python 代码的可调用对象为空字节串）
+    """
+    h = hashlib.blake2b(digest_size=8)
+    seen = set()
+    found = False
+    pending = [fn]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, functools.partial):
+            pending.append(obj.func)
+            continue
+        if isinstance(obj, type):
+            for name in ("compute", "computeAsync"):
+                method = obj.__dict__.get(name)
+                if method is not None:
+                    pending.append(method)
+            continue
+        code = getattr(obj, "__code__", None)
+        if not isinstance(code, types.CodeType):
+            continue
+        found = True
+        _hashCode(h, code)
+        for cell in getattr(obj, "__closure__", None) or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                continue  # 尚未赋值的闭包变量
+            if callable(value):
+                pending.append(value)
+    return h.digest() if found else b""
+
+
+class _ValuePin(object):
+    """classSemantics/computeSemantics 中代替引脚对象的值容器（只支持 getData/setData）"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def getData(self):
+        return self.value
+
+    def setData(self, value):
+        self.value = value
+
+
+def standInNode(cls, inputs, outputs, values):
+    """
+    创建一个代替类节点运行 compute 的实例
+
+    实例没有调用 __init__：每个输入/输出引脚名对应的属性是只支持 getData()/setData() 的值容器。
+    因此 compute 只能通过 self.<引脚名> 访问声明过的引脚，不能依赖 __init__ 中创建的其它状态。
+
+    参数：
+        cls (type): 节点类
+        inputs (tuple): 数据输入引脚名称
+        outputs (tuple): 数据输出引脚名称
+        values (dict): 输入引脚名 -> 值
+
+    返回：
+        tuple: (节点实例, {输出引脚名: 值容器})
+    """
+    node = cls.__new__(cls)
+    for name in inputs:
+        setattr(node, name, _ValuePin(values.get(name)))
+    pins = {name: _ValuePin() for name in outputs}
+    for name, pin in pins.items():
+        setattr(node, name, pin)
+    return node, pins
+
+
+class NodeSemantics(object):
+    """
+    节点语义
+
+    属性：
+    - inputs (tuple): 数据输入引脚名称
+    - outputs (tuple): 数据输出引脚名称
+    - evaluate (callable): evaluate(**inputs) -> dict
+    - expression (str): 单输出节点的表达式模板，引用 {输入名}
+    - statement (str): 无输出节点的语句模板（expression 为 None 时使用）
+    - imports (tuple): 生成代码需要的 import 语句
+    - pure (bool): 是否是纯节点
+    - blocking (bool): 同步 evaluate 是否可能阻塞（I/O、耗时计算）
+    - version (int): 语义版本
+    - fingerprint (bytes): 代码指纹，默认为 codeFingerprint(evaluate)；
+      包装已有语义的 evaluate 时应传入原语义的指纹，缓存键与原语义一致
+    - isAsync (bool): evaluate 是否是协程函数（构造时确定）
+    """
+
+    def __init__(
+        self,
+        inputs,
+        outputs,
+        evaluate,
+        expression=None,
+        statement=None,
+        imports=(),
+        pure=True,
+        blocking=True,
+        version=1,
+        fingerprint=None,
+    ):
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.evaluate = evaluate
+        self.expression = expression
+        self.statement = statement
+        self.imports = tuple(imports)
+        self.pure = pure
+        self.blocking = blocking
+        self.version = version
+        self.fingerprint = codeFingerprint(evaluate) if fingerprint is None else fingerprint
+        self.isAsync = inspect.iscoroutinefunction(evaluate)
+
+    def render(self, template, args):
+        """
+        用输入表达式填充模板
+
+        参数：
+            template (str): expression 或 statement 模板
+            args (dict): 输入引脚名 -> 代码表达式
+
+        返回：
+            str: 生成的代码
+        """
+        return template.format(**args)
+
+
+def _functionSemantics(libName, name, fn):
+    """根据 @IMPLEMENT_NODE 函数生成语义"""
+    annotations = getattr(fn, "__annotations__", {})
+    nodeType = annotations.get("nodeType")
+    pure = getattr(nodeType, "name", str(nodeType)).endswith("Pure")
+    returns = annotations.get("return")
+
+    # 函数库本身依赖 uflow，这里导入它的 REF 标记不会增加新的依赖
+    from uflow.Core.Common import REF
+
+    inputs = []
+    for param in inspect.signature(fn).parameters.values():
+        default = param.default
+        if isinstance(default, tuple) and len(default) == 2 and default[0] is REF:
+            # (REF, ('PinType', value)) 形式的输出参数需要引脚对象，无法直接调用
+            return None
+        inputs.append(param.name)
+
+    outputs = (RETURN_PIN,) if returns is not None else ()
+    call = f"{libName}.{name}(" + ", ".join(f"{p}={{{p}}}" for p in inputs) + ")"
+
+    if outputs:
+
+        def evaluate(**kwargs):
+            return {RETURN_PIN: fn(**kwargs)}
+
+    else:
+
+        def evaluate(**kwargs):
+            fn(**kwargs)
+            return {}
+
+    return NodeSemantics(
+        inputs,
+        outputs,
+        evaluate,
+        expression=call if outputs else None,
+        statement=None if outputs else call,
+        imports=(f"from DemoPackage.FunctionLibraries.{libName} import {libName}",),
+        pure=pure,
+    )
+
+
+def classSemantics(cls, inputs, outputs, expression=None, samples=(), pure=True, blocking=True, version=1):
+    """
+    根据类节点的 compute 生成语义
+
+    evaluate 在 standInNode() 创建的实例上调用节点类的 compute，然后读取输出引脚的值，
+    快照求值因此与画布上的节点执行同一份代码。
+
+    表达式（供 CompiledPlan/PythonCodeGen 内联）是 compute 的另一份写法：
+    给出 samples 时，注册前用每组输入分别运行 compute 和表达式，结果不一致时抛出 ValueError，
+    修改了 compute 而忘记修改表达式会在第一次查找语义时报错，而不是让编译路径悄悄得到不同的结果。
+
+    参数：
+        cls (type): 节点类
+        inputs (tuple): 数据输入引脚名称
+        outputs (tuple): 数据输出引脚名称
+        expression (str): 可选的单输出表达式模板
+        samples (iterable): 核对表达式用的输入（输入引脚名 -> 值）
+        pure (bool): 是否是纯节点
+        blocking (bool): compute 是否可能阻塞
+        version (int): 语义版本
+
+    返回：
+        NodeSemantics
+
+    异常：
+        ValueError: 表达式与 compute 的结果不一致
+    """
+    inputs = tuple(inputs)
+    outputs = tuple(outputs)
+    compute = cls.compute
+
+    def evaluate(**kwargs):
+        node, pins = standInNode(cls, inputs, outputs, kwargs)
+        compute(node)
+        return {name: pin.value for name, pin in pins.items()}
+
+    semantics = NodeSemantics(
+        inputs, outputs, evaluate, expression=expression, pure=pure, blocking=blocking, version=version
+    )
+    if expression is not None:
+        (outName,) = outputs
+        for sample in samples:
+            expected = evaluate(**sample)[outName]
+            actual = eval(semantics.render(expression, {name: repr(sample[name]) for name in inputs}), {})
+            if actual != expected:
+                raise ValueError(
+                    f"{cls.__name__}: expression {expression!r} gives {actual!r} for {sample!r}, "
+                    f"compute gives {expected!r}; update the expression together with compute"
+                )
+    return semantics
+
+
+def semanticsFromLibrary(libClass):
+    """
+    从函数库类自动生成语义
+
+    参数：
+        libClass (type): FunctionLibraryBase 子类（如 DemoLib）
+
+    返回：
+        dict: 函数名 -> NodeSemantics（包含 REF 输出参数的函数会被跳过）
+    """
+    result = {}
+    for name, member in vars(libClass).items():
+        fn = member.__func__ if isinstance(member, staticmethod) else None
+        if fn is None or "nodeType" not in getattr(fn, "__annotations__", {}):
+            continue
+        semantics = _functionSemantics(libClass.__name__, name, fn)
+        if semantics is not None:
+            result[name] = semantics
+    return result
+
+
+_REGISTRY = {}
+_librariesLoaded = False
+
+
+def registerSemantics(typeName, semantics):
+    """
+    注册节点类型的语义
+
+    参数：
+        typeName (str): 节点类型名称（类名或函数名）
+        semantics (NodeSemantics): 语义
+    """
+    _REGISTRY[typeName] = semantics
+
+
+def _loadLibraries():
+    global _librariesLoaded
+    if _librariesLoaded:
+        return
+    _librariesLoaded = True
+    from ..FunctionLibraries.DemoLib import DemoLib
+    from ..Nodes.DemoNode import DemoNode
+
+    for name, semantics in semanticsFromLibrary(DemoLib).items():
+        _REGISTRY.setdefault(name, semantics)
+    _REGISTRY.setdefault(
+        "DemoNode",
+        classSemantics(
+            DemoNode,
+            DemoNode.computeInputs,
+            DemoNode.computeOutputs,
+            expression=DemoNode.computeExpression,
+            samples=({"inp": False}, {"inp": True}),
+            blocking=False,
+        ),
+    )
+
+
+def getSemantics(typeName):
+    """
+    查找节点类型的语义
+
+    参数：
+        typeName (str): 节点类型名称
+
+    返回：
+        NodeSemantics
+
+    异常：
+        UnsupportedNodeError: 未注册
+    """
+    if typeName not in _REGISTRY:
+        _loadLibraries()
+    try:
+        return _REGISTRY[typeName]
+    except KeyError:
+        raise UnsupportedNodeError(f"No semantics registered for node type {typeName!r}")
@@ -0,0 +1,240 @@
+"""
+ParallelEvaluation - 在线程池中按依赖关系并行求值
+
+自由线程（free-threaded，无 GIL）的 Python（3.13t 及以上）中，多个线程可以同时执行
+纯 Python 代码。这里按数据依赖调度 GraphProgram 的步骤（依赖计数 + 就绪集合）：
+- 每个步骤的依赖数是它读取的槽位的生产者个数；依赖全部完成的步骤进入就绪集合，
+  空闲的线程从就绪集合取出步骤执行
+- 一个步骤完成后，新就绪的第一个后继由同一个线程直接接着执行（链上的步骤留在同一线程，不经过队列），
+  其余后继放入就绪集合唤醒其他线程；扇出的图（树、分层图）和互不相连的分支都能同时求值
+- 只有一个依赖的后继不需要加锁（只有它的生产者会修改它）；多依赖的计数和就绪集合在一个短锁中更新
+- 有副作用的步骤（pure=False）之间按程序顺序串成依赖链，保持执行链顺序
+- 步骤之间不共享可变状态：被多个步骤读取的可变值（参数或上游结果，如 FakeTypeATWXP、列表），
+  第一个读取者使用原对象，其他读取者各自得到一份 freezeValue 副本（不可变移交）
+
+GIL 版本的 Python 中线程不能同时执行 Python 代码，parallel=None（默认）时退化为
+GraphProgram.execute 的顺序求值；parallel=True 强制使用线程池（用于测量对比）。
+
+使用方式：
+    values = executeParallel(program, workers=8)
+    values = evaluateSnapshotParallel(snapshot)
+
+限制：
+- 一条链上的步骤只能依次执行；可并行的宽度是同时就绪的步骤数
+"""
+
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import Instrumentation
+from .AsyncEvaluation import runCoroutine
+from .GraphProgram import GraphProgram
+from .GraphSnapshot import IMMUTABLE_TYPES, freezeValue
+from .Tasks import CancellationToken
+
+#: 进度回调的最小间隔（步骤数占总数的比例）
+REPORT_FRACTION = 0.01
+
+
+def isFreeThreaded():
+    """
+    当前解释器是否在没有 GIL 的情况下运行
+
+    返回：
+        bool: 自由线程版本且 GIL 没有被重新启用时为 True
+    """
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return False
+    isGilEnabled = getattr(sys, "_is_gil_enabled", None)
+    return isGilEnabled is None or not isGilEnabled()
+
+
+def dependencyGraph(program):
+    """
+    计算步骤之间的依赖关系
+
+    参数：
+        program (GraphProgram): 图程序
+
+    返回：
+        tuple: (counts, successors)
+        - counts (list): 每个步骤的依赖（前驱步骤）个数
+        - successors (list): 每个步骤的后继步骤下标列表（按程序顺序）
+    """
+    steps = program.steps
+    counts = [0] * len(steps)
+    successors = [[] for _ in steps]
+    producers = {}
+    lastEffect = None
+    for index, step in enumerate(steps):
+        predecessors = {producers[slot] for slot in step.args.values() if slot in producers}
+        if not step.semantics.pure:
+            # 副作用按程序顺序执行（与执行链顺序一致）
+            if lastEffect is not None:
+                predecessors.add(lastEffect)
+            lastEffect = index
+        counts[index] = len(predecessors)
+        for predecessor in sorted(predecessors):
+            successors[predecessor].append(index)
+        for slot in step.outSlots.values():
+            producers[slot] = index
+    return counts, successors
+
+
+def _sharedReads(program):
+    """每个步骤需要复制的参数：被多个步骤读取的槽位，除第一个读取者外都使用副本"""
+    firstReader = {}
+    readers = {}
+    for index, step in enumerate(program.steps):
+        for slot in set(step.args.values()):
+            firstReader.setdefault(slot, index)
+            readers[slot] = readers.get(slot, 0) + 1
+    return [
+        tuple(
+            (name, slot) for name, slot in step.args.items() if readers[slot] > 1 and firstReader[slot] != index
+        )
+        for index, step in enumerate(program.steps)
+    ]
+
+
+def executeParallel(program, overrides=None, token=None, report=None, workers=None, parallel=None):
+    """
+    并行执行程序
+
+    参数：
+        program (GraphProgram): 图程序
+        overrides (dict): 参数名 -> 值，覆盖快照中的默认值
+        token (CancellationToken): 可选的取消令牌，每个步骤之前检查
+        report (callable): 可选的进度回调 report(done, total, message)，在工作线程中调用
+        workers (int): 线程数，默认为 CPU 核心数
+        parallel (bool): None 时只在自由线程版本中并行；True 强制并行；False 顺序执行
+
+    返回：
+        list: 槽位值列表，与 GraphProgram.execute 相同
+
+    异常：
+        TaskCancelled: 令牌被取消
+        任一步骤的异常（其他线程在下一个步骤前停止）
+    """
+    workers = min(workers or os.cpu_count() or 1, len(program.steps))
+    if parallel is None:
+        parallel = isFreeThreaded()
+    if not parallel or workers < 2:
+        return program.execute(overrides, token, report)
+
+    overrides = overrides or {}
+    values = [None] * program.slotCount
+    for param in program.params:
+        values[param.slot] = overrides.get(param.name, param.default)
+    steps = program.steps
+    counts, successors = dependencyGraph(program)
+    singles = [count == 1 for count in counts]
+    copies = _sharedReads(program)
+    listeners = Instrumentation.stepListeners()
+
+    total = len(steps)
+    stride = max(1, int(total * REPORT_FRACTION))
+    ready = deque(index for index, count in enumerate(counts) if count == 0)
+    condition = threading.Condition()
+    abort = CancellationToken()
+    state = {"running": 0, "finished": 0, "reported": 0, "error": None}
+
+    def runStep(index):
+        step = steps[index]
+        kwargs = {name: values[slot] for name, slot in step.args.items()}
+        for name, slot in copies[index]:
+            value = kwargs[name]
+            if not isinstance(value, IMMUTABLE_TYPES):
+                kwargs[name] = freezeValue(value)
+        if listeners:
+            start = time.perf_counter_ns()
+        out = step.semantics.evaluate(**kwargs)
+        if step.semantics.isAsync:
+            out = runCoroutine(out)
+        if listeners:
+            Instrumentation.recordStep(listeners, step, start)
+        for name, slot in step.outSlots.items():
+            values[slot] = out.get(name)
+
+    def runWorker():
+        done = 0
+        index = None
+        while True:
+            with condition:
+                if index is not None:
+                    state["running"] -= 1
+                state["finished"] += done
+                done = 0
+                if report is not None and state["finished"] - state["reported"] >= stride:
+                    state["reported"] = state["finished"]
+                    report(state["finished"], total, "Evaluating")
+                while not ready and state["running"] and state["error"] is None:
+                    condition.wait()
+                if state["error"] is not None or not ready:
+                    # 出错，或者没有就绪的步骤、也没有正在执行的步骤（全部完成）
+                    condition.notify_all()
+                    return
+                index = ready.popleft()
+                state["running"] += 1
+            try:
+                while index is not None:
+                    if abort.isCancelled():
+                        break
+                    if token is not None:
+                        token.raiseIfCancelled()
+                    runStep(index)
+                    done += 1
+                    released = []
+                    shared = []
+                    for successor in successors[index]:
+                        (released if singles[successor] else shared).append(successor)
+                    if shared or len(released) > 1:
+                        with condition:
+                            for successor in shared:
+                                counts[successor] -= 1
+                                if not counts[successor]:
+                                    released.append(successor)
+                            if len(released) > 1:
+                                ready.extend(released[1:])
+                                condition.notify(len(released) - 1)
+                    # 第一个新就绪的后继留在当前线程执行
+                    index = released[0] if released else None
+                index = -1
+            except BaseException as e:
+                with condition:
+                    if state["error"] is None:
+                        state["error"] = e
+                    state["running"] -= 1
+                    abort.cancel()
+                    condition.notify_all()
+                return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="DemoParallel") as pool:
+        futures = [pool.submit(runWorker) for _ in range(workers)]
+        for future in futures:
+            future.result()
+    if state["error"] is not None:
+        raise state["error"]
+    if report is not None and state["reported"] != total:
+        report(total, total, "Evaluating")
+    return values
+
+
+def evaluateSnapshotParallel(snapshot, token=None, report=None, workers=None, parallel=None):
+    """
+    在快照上并行求值图
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+        token, report, workers, parallel: 同 executeParallel
+
+    返回：
+        dict: (节点 uid, 输出引脚名) -> 值，与 Evaluation.evaluateSnapshot 相同
+    """
+    program = GraphProgram.build(snapshot)
+    return program.outputValues(executeParallel(program, token=token, report=report, workers=workers, parallel=parallel))
@@ -0,0 +1,491 @@
+"""
+ProcessOffload - 把 CPU 密集的节点计算放到进程池执行
+
+纯 Python 的数值计算持有 GIL，线程池不能让多个节点同时使用多个核心。
+这里维护一组常驻的工作进程，把节点的计算函数和输入值发送到工作进程执行，
+返回结果后再写回输出引脚：
+- 工作进程常驻复用，只在第一次使用（或 warmUp()）时启动
+- 使用 spawn 启动方式：不复制父进程中的 Qt 状态和线程
+- 发送前检查函数和输入能否 pickle，不能时（如 lambda、打开的文件、Qt 对象）
+  打印一次警告并回退到在当前进程中计算，节点行为不变
+- 检查时得到的序列化结果直接发送，不会重复 pickle
+
+进程池结构：
+- 每个工作进程对应一个槽位：一个管道和一个守护线程，线程从共享队列中取出计算，
+  发送给自己的进程并等待结果
+- 结束一个计算（OffloadFuture.terminate()）只结束执行它的那个工作进程，
+  其他工作进程中的计算不受影响；槽位在取到下一个计算时重新启动进程
+- 工作进程意外退出（崩溃、被系统结束）时只有它正在执行的计算失败（BrokenProcessPool）
+
+节点中使用（按节点类型或按实例开启）：
+    class HeavyNode(ProcessOffloadMixin, NodeBase):
+        offload = True
+        computeInputs = ("values", "iterations")
+        computeOutputs = ("out",)
+
+        @staticmethod
+        def process(values, iterations):
+            # 在工作进程中执行：只能使用参数，不能访问节点或引脚
+            return {"out": simulate(values, iterations)}
+
+    node.offload = False  # 单个实例关闭
+
+在编辑器的主线程中（UI/TaskPump.py 已注册主线程事件泵）compute 提交计算后立即返回，不阻塞界面；
+结果由主线程的事件泵写回输出引脚（下游随之更新），计算失败时交给 node.setError。
+结果返回之前再次 compute 时，旧的计算被结束，只写回最新一次的结果。
+在工作线程或无界面环境中 compute 阻塞等待结果（不持有 GIL）。
+
+在快照上并发求值时（Core/AsyncEvaluation.py），互不依赖的节点会同时在多个工作进程中计算：
+声明 computeInputs 的混入子类自动以类名注册 offloadSemantics()，其他计算函数可以手动注册：
+    registerSemantics("HeavyNode", offloadSemantics(simulateNode, ("values", "iterations"), ("out",)))
+
+取消和时间预算：
+- 等待结果期间检查当前令牌（Core/Tasks.py 的 currentToken()），被取消或超过预算时
+  结束执行该计算的工作进程，失控的计算不会一直占用 CPU，也不需要结束编辑器进程
+
+限制：
+- 计算函数必须是可以按名称导入的模块级函数或静态方法（工作进程重新导入它）
+- 输入和返回值必须可以 pickle，每次调用都有序列化开销，只适合计算量远大于数据量的节点
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from .NodeSemantics import NodeSemantics, registerSemantics
+from .Tasks import TaskCancelled, currentToken, mainThreadPump
+
+#: 等待工作进程结果时检查取消令牌的间隔（秒）
+CANCEL_POLL_INTERVAL = 0.05
+
+#: 关闭进程池时等待工作进程自行退出的时间（秒）
+SHUTDOWN_GRACE = 1.0
+
+_pool = None
+_poolLock = threading.Lock()
+_warned = set()
+
+
+def _workerMain(conn):
+    """工作进程的主循环：接收 (fn, inputs)，返回 (是否成功, 结果或异常)"""
+    while True:
+        try:
+            payload = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        try:
+            fn, inputs = pickle.loads(payload)
+            reply = (True, fn(**inputs))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            data = pickle.dumps(reply, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            data = pickle.dumps((False, RuntimeError(f"result cannot be sent back: {e}")), pickle.HIGHEST_PROTOCOL)
+        conn.send_bytes(data)
+
+
+class OffloadFuture(Future):
+    """
+    一次放到工作进程的计算的结果
+
+    关键方法：
+    - terminate(): 还在排队时取消；正在执行时只结束执行它的工作进程，
+      结果变为 TaskCancelled
+    """
+
+    def __init__(self, payload=None):
+        super(OffloadFuture, self).__init__()
+        self.payload = payload
+        self._terminate = threading.Event()
+
+    def terminate(self):
+        """结束这个计算（已完成时没有影响）"""
+        if not self.cancel():
+            self._terminate.set()
+
+    def terminateRequested(self):
+        """是否已请求结束正在执行的计算"""
+        return self._terminate.is_set()
+
+
+class _WorkerSlot(object):
+    """一个工作进程和驱动它的守护线程"""
+
+    def __init__(self, pool, index):
+        super(_WorkerSlot, self).__init__()
+        self._pool = pool
+        self._index = index
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._thread = threading.Thread(target=self._run, name=f"DemoOffloadSlot-{index}", daemon=True)
+        self._thread.start()
+
+    def ensureProcess(self):
+        """启动工作进程（已在运行时直接返回），返回父进程一端的管道"""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return self._conn
+            self._release()
+            context = multiprocessing.get_context("spawn")
+            parentConn, childConn = context.Pipe()
+            process = context.Process(
+                target=_workerMain, args=(childConn,), name=f"DemoOffloadWorker-{self._index}", daemon=True
+            )
+            process.start()
+            childConn.close()
+            self._process, self._conn = process, parentConn
+            return parentConn
+
+    def kill(self):
+        """立即结束工作进程（下一个计算会重新启动它）"""
+        with self._lock:
+            if self._process is not None:
+                self._process.terminate()
+            self._release()
+
+    def close(self):
+        """关闭管道，等待工作进程自行退出，超时后结束它"""
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._process = self._conn = None
+        if conn is not None:
+            conn.close()
+        if process is not None:
+            process.join(SHUTDOWN_GRACE)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    def _release(self):
+        if self._conn is not None:
+            self._conn.close()
+        if self._process is not None:
+            self._process.join()
+        self._process = self._conn = None
+
+    def _run(self):
+        while True:
+            future = self._pool._queue.get()
+            if future is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                conn = self.ensureProcess()
+                conn.send_bytes(future.payload)
+            except (OSError, ValueError) as e:
+                self.kill()
+                future.set_exception(BrokenProcessPool(f"offload worker process is not available: {e}"))
+                continue
+            self._wait(conn, future)
+
+    def _wait(self, conn, future):
+        while True:
+            try:
+                if conn.poll(CANCEL_POLL_INTERVAL):
+                    ok, value = pickle.loads(conn.recv_bytes())
+                    break
+            except (EOFError, OSError):
+                self.kill()
+                future.set_exception(BrokenProcessPool("offload worker process exited unexpectedly"))
+                return
+            except Exception as e:
+                # 结果（或异常）无法在当前进程中还原
+                future.set_exception(e)
+                return
+            if future.terminateRequested():
+                self.kill()
+                future.set_exception(TaskCancelled("offloaded computation was terminated"))
+                return
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+
+class WorkerPool(object):
+    """
+    常驻工作进程池
+
+    关键方法：
+    - submit(payload): 提交序列化的 (fn, inputs)，返回 OffloadFuture
+    - warmUp(): 启动所有工作进程
+    - terminate(): 立即结束所有工作进程（正在执行的计算失败）
+    - shutdown(): 取消排队的计算并关闭所有工作进程
+    """
+
+    def __init__(self, maxWorkers):
+        super(WorkerPool, self).__init__()
+        self.maxWorkers = maxWorkers
+        self._queue = queue.SimpleQueue()
+        self._slots = [_WorkerSlot(self, i) for i in range(maxWorkers)]
+
+    def submit(self, payload):
+        future = OffloadFuture(payload)
+        self._queue.put(future)
+        return future
+
+    def warmUp(self):
+        for slot in self._slots:
+            slot.ensureProcess()
+        return len(self._slots)
+
+    def terminate(self):
+        for slot in self._slots:
+            slot.kill()
+
+    def shutdown(self):
+        while True:
+            try:
+                future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None:
+                future.cancel()
+        for _ in self._slots:
+            self._queue.put(None)
+        for slot in self._slots:
+            slot.close()
+
+
+def processPool(maxWorkers=None):
+    """
+    获取常驻进程池（第一次调用时创建）
+
+    参数：
+        maxWorkers (int): 工作进程数，默认为 CPU 核心数（只在创建时生效）
+
+    返回：
+        WorkerPool
+    """
+    global _pool
+    with _poolLock:
+        if _pool is None:
+            _pool = WorkerPool(maxWorkers or os.cpu_count() or 1)
+        return _pool
+
+
+def warmUp():
+    """
+    预先启动所有工作进程（例如在打开图时调用），避免第一次计算时的启动延迟
+
+    返回：
+        int: 已启动的工作进程数
+    """
+    return processPool().warmUp()
+
+
+def shutdownPool():
+    """关闭进程池（进程退出时自动调用；之后再次使用会重新创建）"""
+    global _pool
+    with _poolLock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def terminateWorkers():
+    """
+    立即结束所有工作进程（正在执行的计算以 BrokenProcessPool 失败，之后的计算重新启动进程）
+
+    只需要结束某一个计算时使用 OffloadFuture.terminate()。
+    """
+    with _poolLock:
+        pool = _pool
+    if pool is not None:
+        pool.terminate()
+
+
+atexit.register(shutdownPool)
+
+
+def checkPicklable(fn, inputs):
+    """
+    检查计算函数和输入能否发送到工作进程
+
+    参数：
+        fn (callable): 计算函数
+        inputs (dict): 输入引脚名 -> 值
+
+    返回：
+        bytes: 序列化结果；不能 pickle 时返回 None
+    """
+    try:
+        return pickle.dumps((fn, inputs), pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        name = getattr(fn, "__qualname__", repr(fn))
+        if name not in _warned:
+            _warned.add(name)
+            print(f"Warning: {name} cannot be sent to a worker process ({e}); computing in-process")
+        return None
+
+
+def submitOffloaded(fn, inputs):
+    """
+    把计算提交到进程池
+
+    参数：
+        fn (callable): 计算函数，fn(**inputs) -> {输出引脚名: 值}
+        inputs (dict): 输入引脚名 -> 值
+
+    返回：
+        OffloadFuture: 计算结果；不能 pickle 时已在当前进程中计算完成
+    """
+    payload = checkPicklable(fn, inputs)
+    if payload is not None:
+        return processPool().submit(payload)
+
+    future = OffloadFuture()
+    try:
+        future.set_result(fn(**inputs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def runOffloaded(fn, inputs, enabled=True):
+    """
+    在进程池中计算并等待结果
+
+    参数：
+        fn (callable): 计算函数
+        inputs (dict): 输入引脚名 -> 值
+        enabled (bool): False 时直接在当前进程中计算
+
+    返回：
+        dict: 输出引脚名 -> 值
+
+    异常：
+        TaskCancelled: 当前令牌被取消（或 BudgetExceeded：超过时间预算），执行计算的工作进程已被结束
+    """
+    if not enabled:
+        return fn(**inputs)
+    future = submitOffloaded(fn, inputs)
+    token = currentToken()
+    while True:
+        try:
+            return future.result(timeout=CANCEL_POLL_INTERVAL)
+        except TimeoutError:
+            if token.isCancelled():
+                future.terminate()
+                token.raiseIfCancelled()
+
+
+def offloadSemantics(fn, inputs, outputs, version=1):
+    """
+    生成在进程池中计算的节点语义（协程语义，供并发求值使用）
+
+    参数：
+        fn (callable): 计算函数，fn(**inputs) -> {输出引脚名: 值}
+        inputs (tuple): 数据输入引脚名称
+        outputs (tuple): 数据输出引脚名称
+        version (int): 语义版本
+
+    返回：
+        NodeSemantics
+    """
+
+    async def evaluate(**kwargs):
+        future = submitOffloaded(fn, kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # 求值被取消或超过预算：只结束执行这个计算的工作进程
+            future.terminate()
+            raise
+
+    return NodeSemantics(inputs, outputs, evaluate, version=version)
+
+
+class _PendingCompute(object):
+    """主线程中提交的 ProcessOffloadMixin 计算，由主线程事件泵轮询，完成后写回输出引脚"""
+
+    def __init__(self, node, future):
+        super(_PendingCompute, self).__init__()
+        self.node = node
+        self.future = future
+
+    def pollEvents(self):
+        if self.node._offloadPending is not self:
+            # 节点已重新计算：丢弃这次的结果
+            self.future.terminate()
+            return False
+        if not self.future.done():
+            return True
+        self.node._offloadPending = None
+        try:
+            outputs = self.future.result()
+        except Exception as e:
+            self.node.setError(e)
+        else:
+            self.node._applyOffloaded(outputs)
+        return False
+
+
+class ProcessOffloadMixin(object):
+    """
+    在进程池中执行 compute 的类节点混入
+
+    子类实现静态方法 process(**inputs) -> {输出引脚名: 值}，
+    compute 读取所有数据输入引脚的值，在工作进程中调用 process，再把结果写回输出引脚。
+    适用于没有执行引脚的纯计算节点。
+
+    在主线程中（已注册主线程事件泵时）compute 不等待结果，结果由事件泵写回；
+    其他线程中阻塞等待（不持有 GIL）。
+
+    声明 computeInputs（可以为空元组）时，还会以类名注册 offloadSemantics(process, ...)，
+    快照上的并发求值器（Core/AsyncEvaluation.py）同时在多个工作进程中计算这些节点；
+    offload = False 的类注册在当前进程中计算的同步语义。
+
+    属性：
+    - offload (bool): 是否放到进程池执行（类属性为默认值，可以按实例修改）
+    - computeInputs (tuple): 数据输入引脚名称，None 表示不注册语义
+    - computeOutputs (tuple): 数据输出引脚名称
+    """
+
+    offload = True
+    computeInputs = None
+    computeOutputs = ()
+    _offloadPending = None
+
+    def __init_subclass__(cls, **kwargs):
+        super(ProcessOffloadMixin, cls).__init_subclass__(**kwargs)
+        if cls.computeInputs is None or "process" not in cls.__dict__:
+            return
+        if cls.offload:
+            semantics = offloadSemantics(cls.process, cls.computeInputs, cls.computeOutputs)
+        else:
+            semantics = NodeSemantics(cls.computeInputs, cls.computeOutputs, cls.process)
+        registerSemantics(cls.__name__, semantics)
+
+    @staticmethod
+    def process(**inputs):
+        """在工作进程中执行的计算（子类实现）"""
+        raise NotImplementedError
+
+    def compute(self, *args, **kwargs):
+        inputs = {pin.name: pin.getData() for pin in self.orderedInputs.values() if not pin.isExec()}
+        pump = mainThreadPump()
+        if not self.offload or pump is None or threading.current_thread() is not threading.main_thread():
+            self._offloadPending = None
+            self._applyOffloaded(runOffloaded(type(self).process, inputs, self.offload))
+            return
+        pending = _PendingCompute(self, submitOffloaded(type(self).process, inputs))
+        self._offloadPending = pending
+        pump(pending)
+
+    def _applyOffloaded(self, outputs):
+        from uflow.Core.Common import PinSelectionGroup
+
+        for name, value in outputs.items():
+            pin = self.getPinSG(name, PinSelectionGroup.Outputs)
+            if pin is not None:
+                pin.setData(value)
@@ -0,0 +1,180 @@
+"""
+Profiler - 节点执行采样分析器
+
+作为 Instrumentation 的监听器，把每次节点执行记录到预分配的环形缓冲区，
+界面按定时器调用 summary() 聚合统计，而不是每个样本刷新一次。
+
+环形缓冲区：
+- 使用 array 预分配固定容量（默认 65536 个样本），记录时不分配新对象
+- 缓冲区写满后覆盖最旧的样本，统计反映最近 capacity 个样本
+- 节点用整数编号，编号表只在第一次见到节点时更新（只持有节点的弱引用）
+- 每次聚合（summary）时删除已被销毁的节点的编号和样本统计，图反复重建（压力测试、导入）时
+  编号表的大小只与仍然存在的节点数有关；编号不重复使用，缓冲区中的旧样本不会被算到新节点上
+- 快照求值的步骤（kind = "step"，后台求值、批量任务等）按步骤的节点 uid 单独统计：
+  步骤对象不是框架节点，没有弱引用，缓冲区中已没有样本的步骤编号在聚合时删除
+
+统计项（每个节点）：
+- count: 调用次数
+- total: 总耗时（毫秒）
+- mean: 平均耗时（毫秒）
+- p95: 95 分位耗时（毫秒）
+- self: 自身耗时合计（扣除嵌套的下游节点执行，毫秒）
+
+线程说明：
+- record() 可能在多个线程中并发调用，为保持低开销不加锁，
+  极少数并发写入可能互相覆盖一个样本，对统计结果影响可以忽略
+"""
+
+import weakref
+from array import array
+
+from . import Instrumentation
+
+
+class NodeStats(object):
+    """
+    单个节点的统计结果
+
+    属性：
+    - uid: 节点 uid
+    - name (str): 节点名称
+    - count (int): 调用次数
+    - total, mean, p95, self (float): 耗时（毫秒）
+    """
+
+    __slots__ = ("uid", "name", "count", "total", "mean", "p95", "self")
+
+    def __init__(self, uid, name, count, total, mean, p95, self_):
+        self.uid = uid
+        self.name = name
+        self.count = count
+        self.total = total
+        self.mean = mean
+        self.p95 = p95
+        self.self = self_
+
+
+class NodeProfiler(object):
+    """
+    节点执行分析器
+
+    关键方法：
+    - start()/stop(): 开始/停止采样（注册/移除插桩监听器）
+    - reset(): 清空样本
+    - summary(): 聚合统计，返回 NodeStats 列表
+    """
+
+    def __init__(self, capacity=65536):
+        """
+        初始化分析器
+
+        参数：
+            capacity (int): 环形缓冲区容量（样本数）
+        """
+        super(NodeProfiler, self).__init__()
+        self.capacity = capacity
+        self._nodeIds = array("q", bytes(8 * capacity))
+        self._durations = array("q", bytes(8 * capacity))
+        self._selfTimes = array("q", bytes(8 * capacity))
+        self._written = 0
+        self._index = {}
+        self._nodes = {}
+        self._nextId = 0
+
+    def start(self):
+        """开始采样"""
+        Instrumentation.addListener(self)
+
+    def stop(self):
+        """停止采样"""
+        Instrumentation.removeListener(self)
+
+    def isRunning(self):
+        """是否正在采样"""
+        return Instrumentation.hasListener(self)
+
+    def reset(self):
+        """清空所有样本"""
+        self._written = 0
+
+    def sampleCount(self):
+        """返回缓冲区中的有效样本数"""
+        return min(self._written, self.capacity)
+
+    def record(self, node, kind, name, startNs, durationNs, selfNs, threadId):
+        """插桩监听器接口：记录一个样本（只记录节点执行事件）"""
+        if kind not in Instrumentation.NODE_KINDS:
+            return
+        uid = node.uid
+        isStep = kind == Instrumentation.STEP_KIND
+        key = ("step", uid) if isStep else uid
+        nodeId = self._index.get(key)
+        if nodeId is None:
+            nodeId = self._index[key] = self._nextId
+            self._nextId += 1
+            self._nodes[nodeId] = (uid, name, None) if isStep else (uid, node.getName(), weakref.ref(node))
+        slot = self._written % self.capacity
+        self._nodeIds[slot] = nodeId
+        self._durations[slot] = durationNs
+        self._selfTimes[slot] = selfNs
+        self._written += 1
+
+    def nodeByUid(self, uid):
+        """
+        按 uid 查找被采样过的节点对象
+
+        返回：
+            NodeBase 或 None（节点已被删除，或只有快照求值的步骤样本时也返回 None）
+        """
+        entry = self._nodes.get(self._index.get(uid))
+        return entry[2]() if entry is not None else None
+
+    def _pruneDeadNodes(self, sampled):
+        """删除已被销毁的节点和缓冲区中已没有样本的步骤的编号（它们的旧样本在聚合时被跳过）"""
+        for nodeId, (uid, _, ref) in list(self._nodes.items()):
+            if ref is None:
+                if nodeId in sampled:
+                    continue
+                key = ("step", uid)
+            elif ref() is None:
+                key = uid
+            else:
+                continue
+            del self._nodes[nodeId]
+            if self._index.get(key) == nodeId:
+                del self._index[key]
+
+    def summary(self):
+        """
+        聚合当前缓冲区中的样本
+
+        返回：
+            list: NodeStats 列表（按总耗时降序）
+        """
+        count = self.sampleCount()
+        ids = self._nodeIds[:count]
+        durations = self._durations[:count]
+        selfTimes = self._selfTimes[:count]
+
+        grouped = {}
+        selfTotals = {}
+        for nodeId, duration, selfTime in zip(ids, durations, selfTimes):
+            grouped.setdefault(nodeId, []).append(duration)
+            selfTotals[nodeId] = selfTotals.get(nodeId, 0) + selfTime
+        self._pruneDeadNodes(grouped)
+
+        result = []
+        nodes = self._nodes
+        for nodeId, values in grouped.items():
+            entry = nodes.get(nodeId)
+            if entry is None:
+                continue
+            values.sort()
+            total = sum(values)
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            uid, name, _ = entry
+            result.append(
+                NodeStats(uid, name, len(values), total / 1e6, total / len(values) / 1e6, p95 / 1e6, selfTotals[nodeId] / 1e6)
+            )
+        result.sort(key=lambda s: s.total, reverse=True)
+        return result
@@ -0,0 +1,127 @@
+"""
+PythonCodeGen - 把图编译为独立的 Python 模块
+
+基于 GraphProgram 生成直线式（straight-line）Python 代码：
+每个节点编译为一条赋值语句，按拓扑顺序排列，
+运行时没有引脚对象、脏标记和分发开销。
+
+生成的模块：
+- PARAMS: 参数名元组（未连接的数据输入引脚）
+- RESULTS: 结果名元组（没有下游数据连接的输出引脚）
+- evaluate(**params) -> dict: 求值函数，参数默认值取自导出时的图
+
+依赖：
+- 生成的模块不使用引脚、图对象和 Qt
+- 只包含有表达式模板且只使用内置函数的节点（如 DemoNode）时只依赖 Python 标准库
+- 含有 DemoLib 节点时导入 DemoPackage.FunctionLibraries.DemoLib，DemoLib 又导入 uflow，
+  因此运行环境需要安装 DemoPackage 和 uflow（不需要启动编辑器）
+- 无法表示为字面量的默认值、没有表达式模板的节点和协程语义也需要导入 DemoPackage
+
+正确性：
+- 代码生成与 GraphProgram.interpret 使用同一份拓扑顺序和节点语义，
+  对任意参数，evaluate() 的结果与解释求值完全一致
+- 无法表示为字面量的默认值（如 FakeTypeATWXP）通过 decodeValue 在模块加载时还原
+"""
+
+import ast
+import json
+
+from .DemoGraphFormat import encodeValue
+
+HEADER = '''"""
+Generated by DemoPythonExporter from graph {graph!r}{created}.
+
+Do not edit: re-export the graph instead.
+"""
+'''
+
+
+def _literal(value):
+    """值可以用 repr 精确表示时返回 repr 文本，否则返回 None"""
+    try:
+        text = repr(value)
+        if ast.literal_eval(text) == value and type(ast.literal_eval(text)) is type(value):
+            return text
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        pass
+    return None
+
+
+def generateModule(program, graphName="", created=""):
+    """
+    生成 Python 模块源代码
+
+    参数：
+        program (GraphProgram): 图程序
+        graphName (str): 图名称（写入模块文档）
+        created (str): 生成时间（写入模块文档）
+
+    返回：
+        str: 模块源代码
+    """
+    imports = set()
+    constants = []
+    generic = {}
+    body = []
+
+    signature = []
+    names = {}
+    for param in program.params:
+        names[param.slot] = param.name
+        literal = _literal(param.default)
+        if literal is None:
+            constName = f"_DEFAULT_{len(constants)}"
+            encoded = json.dumps(encodeValue(param.default))
+            constants.append(f"{constName} = decodeValue(json.loads({encoded!r}))")
+            imports.add("import json")
+            imports.add("from DemoPackage.Core.DemoGraphFormat import decodeValue")
+            literal = constName
+        signature.append(f"{param.name}={literal}")
+
+    for step in program.steps:
+        for name, slot in step.outSlots.items():
+            names[slot] = f"v{slot}"
+        args = {name: names[slot] for name, slot in step.args.items()}
+        semantics = step.semantics
+        comment = f"# {step.name} ({step.type})"
+        imports.update(semantics.imports)
+
+        if semantics.expression is not None and len(semantics.outputs) == 1:
+            (slot,) = step.outSlots.values()
+            body.append(f"    {names[slot]} = {semantics.render(semantics.expression, args)}  {comment}")
+        elif semantics.statement is not None and not semantics.outputs:
+            body.append(f"    {semantics.render(semantics.statement, args)}  {comment}")
+        else:
+            if step.type not in generic:
+                generic[step.type] = f"_evaluate_{len(generic)}"
+                imports.add("from DemoPackage.Core.NodeSemantics import getSemantics")
+            call = f"{generic[step.type]}(" + ", ".join(f"{name}={expr}" for name, expr in args.items()) + ")"
+            if semantics.isAsync:
+                # 协程语义（如 Core/ProcessOffload.py 的进程池语义）：生成的代码顺序执行到完成
+                imports.add("from DemoPackage.Core.AsyncEvaluation import runCoroutine")
+                call = f"runCoroutine({call})"
+            body.append(f"    _r = {call}  {comment}")
+            for name, slot in step.outSlots.items():
+                body.append(f"    {names[slot]} = _r[{name!r}]")
+
+    results = ", ".join(f"{name!r}: {names[slot]}" for name, slot in program.results.items())
+    lines = [HEADER.format(graph=graphName, created=f" on {created}" if created else "")]
+    if imports:
+        lines.extend(sorted(imports, key=lambda s: (not s.startswith("import"), s)))
+        lines.append("")
+    if constants or generic:
+        lines.extend(constants)
+        lines.extend(f"{fn} = getSemantics({typeName!r}).evaluate" for typeName, fn in generic.items())
+        lines.append("")
+    lines.append(f"PARAMS = {tuple(p.name for p in program.params)!r}")
+    lines.append(f"RESULTS = {tuple(program.results)!r}")
+    lines.append("")
+    lines.append("")
+    lines.append(f"def evaluate({', '.join(signature)}):")
+    lines.extend(body)
+    lines.append(f"    return {{{results}}}")
+    lines.append("")
+    lines.append("")
+    lines.append('if __name__ == "__main__":')
+    lines.append("    print(evaluate())")
+    return "\n".join(lines) + "\n"
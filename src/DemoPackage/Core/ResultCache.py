@@ -0,0 +1,415 @@
+"""
+ResultCache - 按子图内容哈希的持久化结果缓存
+
+像构建系统一样跳过已经计算过的子图：每个程序步骤的键是它的上游子图内容的哈希
+（Merkle 哈希），与节点 uid 和图无关：
+- 节点类型、语义版本（NodeSemantics.version，节点逻辑变化时递增）和代码指纹
+  （NodeSemantics.fingerprint，修改节点代码后自动变化：自动生成语义的 DemoLib 函数、
+  由 compute 生成语义的类节点如 DemoNode.compute）：
+  节点逻辑变化后旧结果自动失效
+- 每个输入引脚：上游步骤的键 + 输出引脚名，或未连接引脚（参数）的值的哈希
+- 有副作用的步骤（pure=False）和值无法哈希的参数不缓存，它们的下游也不缓存
+
+结果保存在本地 SQLite 数据库中（pickle 序列化），按总大小做最近最少使用淘汰：
+- WAL 模式，多个进程（批量任务的工作进程、多次会话）可以同时读写同一个数据库
+- 命中时只更新使用时间；超过 maxBytes 时删除最久未使用的条目
+
+求值时按需计算（executeCached）：
+1. 只根据结构和参数值计算所有步骤的键（不需要执行任何节点）
+2. 一次查询哪些键存在（只读索引）
+3. 从结果步骤和有副作用的步骤向上游回溯：命中的步骤直接使用缓存的输出，
+   它的上游整个子图都不需要计算；只读取需要的命中步骤的值
+4. 按程序顺序计算未命中且需要的步骤，把新结果写入缓存
+
+使用方式：
+    cache = ResultCache()                          # 默认位置见 defaultCachePath()
+    values = executeCached(program, cache, overrides)
+    cache.stats()                                  # {"entries": ..., "bytes": ..., "hits": ..., "misses": ...}
+
+注意：
+- 缓存的是值的 pickle 副本；不能 pickle 的输出不缓存（每次重新计算）
+- 数据库只应放在本机可信的位置（读取时会 unpickle）
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+
+from . import Instrumentation
+from .AsyncEvaluation import runCoroutine
+
+#: 缓存键格式版本：键的计算方式变化时递增，使旧数据库中的条目全部失效
+KEY_FORMAT = 2
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+#: 一次 SQL 查询中的键数上限（SQLite 变量数限制）
+QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+"""
+
+
+def defaultCachePath():
+    """
+    默认的缓存数据库位置
+
+    返回：
+        str: $XDG_CACHE_HOME/DemoPackage/results.sqlite（未设置时为 ~/.cache/...）
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "DemoPackage", "results.sqlite")
+
+
+def _feedValue(h, value):
+    """把值按类型写入哈希；遇到无法确定内容的类型时返回 False"""
+    if value is None or isinstance(value, bool):
+        h.update(b"c" + repr(value).encode())
+    elif isinstance(value, int):
+        h.update(b"i" + str(value).encode() + b";")
+    elif isinstance(value, float):
+        h.update(b"f" + struct.pack("<d", value))
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        h.update(b"s" + str(len(data)).encode() + b":" + data)
+    elif isinstance(value, bytes):
+        h.update(b"b" + str(len(value)).encode() + b":" + value)
+    elif isinstance(value, (list, tuple)):
+        h.update((b"l" if isinstance(value, list) else b"t") + str(len(value)).encode() + b"[")
+        for item in value:
+            if not _feedValue(h, item):
+                return False
+    elif isinstance(value, dict):
+        h.update(b"d" + str(len(value)).encode() + b"{")
+        # 按键的哈希排序，与插入顺序无关
+        entries = []
+        for key, item in value.items():
+            keyHash = hashValue(key)
+            if keyHash is None:
+                return False
+            entries.append((keyHash, item))
+        for keyHash, item in sorted(entries, key=lambda entry: entry[0]):
+            h.update(keyHash)
+            if not _feedValue(h, item):
+                return False
+    elif type(value).__name__ == "FakeTypeATWXP":
+        h.update(b"x")
+        return _feedValue(h, value.value)
+    else:
+        return False
+    return True
+
+
+def hashValue(value):
+    """
+    计算引脚值的内容哈希
+
+    参数：
+        value: 引脚值（None/bool/int/float/str/bytes、列表、元组、字典、FakeTypeATWXP 及其嵌套）
+
+    返回：
+        bytes: 16 字节摘要；包含其他类型（无法确定内容）时返回 None
+    """
+    h = hashlib.blake2b(digest_size=16)
+    return h.digest() if _feedValue(h, value) else None
+
+
+def stepKeys(program, overrides=None):
+    """
+    计算每个程序步骤的缓存键
+
+    参数：
+        program (GraphProgram): 图程序
+        overrides (dict): 参数名 -> 值，覆盖快照中的默认值
+
+    返回：
+        list: 与 program.steps 对应的 16 字节键；不可缓存的步骤为 None
+    """
+    overrides = overrides or {}
+    slotKeys = {}
+    for param in program.params:
+        digest = hashValue(overrides.get(param.name, param.default))
+        slotKeys[param.slot] = None if digest is None else b"p" + digest
+
+    keys = []
+    for step in program.steps:
+        semantics = step.semantics
+        key = None
+        if semantics.pure:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(f"{KEY_FORMAT}\0{step.type}\0{semantics.version}\0".encode())
+            h.update(semantics.fingerprint + b"\0")
+            for name in sorted(step.args):
+                source = slotKeys.get(step.args[name])
+                if source is None:
+                    break
+                h.update(name.encode() + b"\0" + source)
+            else:
+                key = h.digest()
+        keys.append(key)
+        for name, slot in step.outSlots.items():
+            slotKeys[slot] = None if key is None else key + name.encode()
+    return keys
+
+
+class ResultCache(object):
+    """
+    SQLite 结果缓存（线程安全；多个进程可以共用同一个数据库文件）
+
+    关键属性：
+    - path (str): 数据库路径（":memory:" 表示只在内存中）
+    - maxBytes (int): 缓存值的总大小上限
+    - hits / misses (int): executeCached 中从缓存读取、重新计算的步骤数（本对象）
+
+    关键方法：
+    - contains(keys): 批量检查哪些键存在（只读索引，不读取值）
+    - getMany(keys): 批量读取
+    - putMany(items): 批量写入并按大小淘汰
+    - clear() / stats() / close()
+    """
+
+    def __init__(self, path=None, maxBytes=DEFAULT_MAX_BYTES):
+        super(ResultCache, self).__init__()
+        self.path = path or defaultCachePath()
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def contains(self, keys):
+        """
+        批量检查键是否存在
+
+        参数：
+            keys (iterable): 缓存键（None 被忽略）
+
+        返回：
+            set: 存在的键
+        """
+        wanted = list({key for key in keys if key is not None})
+        present = set()
+        with self._lock:
+            for i in range(0, len(wanted), QUERY_CHUNK):
+                chunk = wanted[i : i + QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                present.update(key for (key,) in self._db.execute(f"SELECT key FROM results WHERE key IN ({marks})", chunk))
+        return present
+
+    def getMany(self, keys):
+        """
+        批量读取缓存
+
+        参数：
+            keys (iterable): 缓存键（None 被忽略）
+
+        返回：
+            dict: 命中的键 -> 输出字典（输出引脚名 -> 值）
+        """
+        wanted = list({key for key in keys if key is not None})
+        found = {}
+        with self._lock:
+            for i in range(0, len(wanted), QUERY_CHUNK):
+                chunk = wanted[i : i + QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for key, value in self._db.execute(f"SELECT key, value FROM results WHERE key IN ({marks})", chunk):
+                    try:
+                        found[key] = pickle.loads(value)
+                    except Exception:
+                        # 条目损坏或引用的类已不存在：视为未命中，之后会被新结果覆盖
+                        continue
+            if found:
+                now = time.time_ns()
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany("UPDATE results SET used = ? WHERE key = ?", [(now, key) for key in found])
+                self._db.execute("COMMIT")
+        return found
+
+    def putMany(self, items):
+        """
+        批量写入缓存，超过 maxBytes 时淘汰最久未使用的条目
+
+        参数：
+            items (iterable): (键, 输出字典)；不能 pickle 的输出被跳过
+
+        返回：
+            int: 写入的条目数
+        """
+        rows = []
+        now = time.time_ns()
+        for key, outputs in items:
+            try:
+                data = pickle.dumps(outputs, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                continue
+            if len(data) <= self.maxBytes:
+                rows.append((key, data, len(data), now))
+        if not rows:
+            return 0
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany("INSERT OR REPLACE INTO results (key, value, size, used) VALUES (?, ?, ?, ?)", rows)
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _evict(self):
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self.maxBytes:
+            return
+        excess = total - self.maxBytes
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def stats(self):
+        """
+        缓存统计
+
+        返回：
+            dict: entries、bytes（数据库中的条目数和总大小），hits、misses（本对象的计数）
+        """
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """删除所有条目"""
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared = {}
+_sharedLock = threading.Lock()
+
+
+def sharedCache(path=None, maxBytes=DEFAULT_MAX_BYTES):
+    """
+    获取进程内共享的缓存对象（同一路径只打开一次数据库）
+
+    参数：
+        path (str): 数据库路径，默认为 defaultCachePath()
+        maxBytes (int): 总大小上限（每次调用都会更新）
+
+    返回：
+        ResultCache
+    """
+    path = path or defaultCachePath()
+    with _sharedLock:
+        cache = _shared.get(path)
+        if cache is None:
+            cache = _shared[path] = ResultCache(path, maxBytes)
+        cache.maxBytes = maxBytes
+        return cache
+
+
+def executeCached(program, cache, overrides=None, token=None, report=None, complete=False):
+    """
+    使用结果缓存执行程序
+
+    参数：
+        program (GraphProgram): 图程序
+        cache (ResultCache): 结果缓存
+        overrides (dict): 参数名 -> 值，覆盖快照中的默认值
+        token (CancellationToken): 可选的取消令牌，每个步骤之前检查
+        report (callable): 可选的进度回调 report(done, total, message)
+        complete (bool): True 时所有输出槽位都有值（命中的步骤从缓存读取，不会跳过）；
+            False 时只保证结果槽位（program.results）和有副作用的步骤，被命中的步骤覆盖的上游子图不计算，
+            这些槽位保持为 None
+
+    返回：
+        list: 槽位值列表，与 GraphProgram.execute 相同
+
+    异常：
+        TaskCancelled: 令牌被取消
+    """
+    overrides = overrides or {}
+    steps = program.steps
+    keys = stepKeys(program, overrides)
+    present = cache.contains(keys)
+
+    values = [None] * program.slotCount
+    for param in program.params:
+        values[param.slot] = overrides.get(param.name, param.default)
+
+    producer = {}
+    for index, step in enumerate(steps):
+        for slot in step.outSlots.values():
+            producer[slot] = index
+    resultSlots = set(program.results.values())
+    roots = bytearray(len(steps))
+    for index, step in enumerate(steps):
+        if complete or not step.semantics.pure or any(slot in resultSlots for slot in step.outSlots.values()):
+            roots[index] = 1
+
+    while True:
+        # 从结果和副作用向上游回溯，命中的步骤不再向上展开
+        needed = bytearray(roots)
+        for index in range(len(steps) - 1, -1, -1):
+            if needed[index] and keys[index] not in present:
+                for slot in steps[index].args.values():
+                    if slot in producer:
+                        needed[producer[slot]] = 1
+        wanted = {keys[index] for index in range(len(steps)) if needed[index] and keys[index] in present}
+        cached = cache.getMany(wanted)
+        if len(cached) == len(wanted):
+            break
+        # 检查之后条目被其他进程淘汰（或无法读取）：按实际读到的结果重新回溯
+        present = set(cached)
+
+    fresh = []
+    total = len(steps)
+    listeners = Instrumentation.stepListeners()
+    for index, step in enumerate(steps):
+        if not needed[index]:
+            continue
+        if token is not None:
+            token.raiseIfCancelled()
+        if report is not None:
+            report(index, total, "Evaluating")
+        key = keys[index]
+        out = cached.get(key) if key is not None else None
+        if out is None:
+            if listeners:
+                start = time.perf_counter_ns()
+            out = step.semantics.evaluate(**{name: values[slot] for name, slot in step.args.items()})
+            if step.semantics.isAsync:
+                out = runCoroutine(out)
+            if listeners:
+                Instrumentation.recordStep(listeners, step, start)
+            if key is not None:
+                fresh.append((key, {name: out.get(name) for name in step.outSlots}))
+        for name, slot in step.outSlots.items():
+            values[slot] = out.get(name)
+    cache.hits += len(cached)
+    cache.misses += len(fresh)
+    if fresh:
+        cache.putMany(fresh)
+    return values
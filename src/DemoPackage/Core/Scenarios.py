@@ -0,0 +1,286 @@
+"""
+Scenarios - 同一个图在多组输入（场景）上的并行求值
+
+参数扫描、蒙特卡洛等任务要用成千上万组参数求值同一个图。逐个修改引脚再调用 evaluate
+只能使用一个核心，而且每个场景都要重新传播脏标记。这里：
+- 每个工作进程持有一份编译好的图（Core/CompiledPlan.py），进程池在多次调用之间保持常驻
+- 来源是 *.demo 文件时，每次 evaluate 检查文件是否修改：修改后主进程和工作进程各自重新读取，
+  拓扑不变时复用已编译的计划（PlanCache），只更新参数默认值；进程池不需要重建
+- 场景按块分发（每块一次进程间往返），每个场景只是一次 plan.execute(场景)
+- 结果按列返回：结果名 -> 列，第 i 个元素是第 i 个场景的结果；
+  全部是 float 的列为 array("d")，全部是 int 的列为 array("q")，全部是 bool 的列为 array("b")（元素是 0/1），
+  其他列为 list
+
+使用方式：
+    columns = evaluateScenarios(snapshot, [{"DemoNode_0_inp": v} for v in values])
+    columns["DemoNode_9.out"]                     # 与场景顺序相同
+
+    with ScenarioPool(snapshot, workers=8) as pool:   # 多次扫描复用同一组工作进程
+        first = pool.evaluate(scenarios)
+        second = pool.evaluate(moreScenarios, select=["DemoNode_9.out"])
+
+    pool = ScenarioPool("model.demo")             # 工作进程各自读取文件，不传输快照
+
+注意：
+- 工作进程使用 spawn 启动，只能使用导入时注册的节点语义（DemoNode、DemoLib 等）；
+  在主进程中用 registerSemantics() 临时注册的语义在工作进程中不存在
+- 场景中的值和结果需要可以 pickle
+- workers 为 1（或场景很少）时在当前进程中求值，没有进程间开销
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .BatchRunner import loadPlan
+from .CompiledPlan import PlanCache
+
+#: 每个工作进程平均分到的块数（块越多负载越均衡，进程间往返也越多）
+CHUNKS_PER_WORKER = 4
+
+_plans = PlanCache()
+_source = None
+_worker = None
+
+
+class ScenarioError(Exception):
+    """场景求值失败（带有场景下标，从 0 开始）"""
+
+    def __init__(self, index, message):
+        super(ScenarioError, self).__init__(f"scenario {index}: {message}")
+        self.index = index
+        self.message = message
+
+    def __reduce__(self):
+        # 从工作进程传回时按构造参数重建（默认的异常序列化只保存格式化后的信息）
+        return (type(self), (self.index, self.message))
+
+
+def _fileStamp(source):
+    """文件来源的修改标记（快照来源为 None）"""
+    if isinstance(source, str):
+        stat = os.stat(source)
+        return (stat.st_mtime_ns, stat.st_size)
+    return None
+
+
+def _loadPlan(source):
+    """source 是 *.demo 文件路径或 GraphSnapshot；场景只读取结果槽位：融合纯步骤链"""
+    if isinstance(source, str):
+        return loadPlan(source, cache=_plans)
+    return _plans.get(source, fuse=True)
+
+
+def _initWorker(source):
+    global _source, _worker
+    _source = source
+    _worker = (_fileStamp(source), _loadPlan(source))
+
+
+def _runChunk(start, scenarios, select, stamp):
+    global _worker
+    if _worker[0] != stamp:
+        # 主进程看到文件已修改：重新读取（拓扑不变时不重新编译）
+        _worker = (stamp, _loadPlan(_source))
+    return _evaluateChunk(_worker[1], start, scenarios, select)
+
+
+def _evaluateChunk(plan, start, scenarios, select):
+    """求值一块场景，返回 结果名 -> 值列表"""
+    results = plan.program.results
+    slots = [results[name] for name in select]
+    columns = [[] for _ in select]
+    execute = plan.execute
+    for index, overrides in enumerate(scenarios, start):
+        try:
+            values = execute(overrides)
+        except KeyError as e:
+            raise ScenarioError(index, f"unknown input {e.args[0]!r}") from None
+        except Exception as e:
+            raise ScenarioError(index, f"{type(e).__name__}: {e}") from None
+        for column, slot in zip(columns, slots):
+            column.append(values[slot])
+    return columns
+
+
+def toColumn(values):
+    """
+    把一列结果转换为紧凑的列存储
+
+    参数：
+        values (list): 结果值
+
+    返回：
+        全部是 float 时为 array("d")，全部是 int（不含 bool）且在 64 位范围内时为 array("q")，
+        全部是 bool 时为 array("b")（每个结果一个字节，元素是 0/1，用 bool(x) 还原），否则为原列表
+    """
+    if values and all(type(v) is bool for v in values):
+        return array("b", values)
+    if values and all(type(v) is float for v in values):
+        return array("d", values)
+    if values and all(type(v) is int for v in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    return values
+
+
+class ScenarioPool(object):
+    """
+    持有编译好的图的常驻进程池
+
+    关键属性：
+    - program (GraphProgram): 主进程中的图程序（用于参数名和结果名）
+    - plan (CompiledPlan): 主进程中的执行计划（当前进程求值）
+    - workers (int): 工作进程数
+
+    关键方法：
+    - evaluate(scenarios, select): 求值所有场景，返回列
+    - close(): 关闭工作进程（也可以用 with 语句）
+    """
+
+    def __init__(self, source, workers=None):
+        """
+        参数：
+            source: GraphSnapshot，或 *.demo 文件路径（工作进程各自读取文件，不需要传输快照）
+            workers (int): 工作进程数，默认为 CPU 核心数；工作进程在第一次需要时启动
+        """
+        super(ScenarioPool, self).__init__()
+        if isinstance(source, str):
+            source = os.path.abspath(source)
+        self._source = source
+        self._stamp = _fileStamp(source)
+        self.plan = _loadPlan(source)
+        self.program = self.plan.program
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+
+    def _refresh(self):
+        """文件来源被修改时重新读取，返回当前的修改标记"""
+        stamp = _fileStamp(self._source)
+        if stamp != self._stamp:
+            self.plan = _loadPlan(self._source)
+            self.program = self.plan.program
+            self._stamp = stamp
+        return stamp
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initWorker,
+                initargs=(self._source,),
+            )
+        return self._pool
+
+    def evaluate(self, scenarios, select=None, chunkSize=None):
+        """
+        求值所有场景
+
+        参数：
+            scenarios (list): 每个场景是 参数名 -> 值（未给出的参数使用图中保存的值）
+            select (list): 需要的结果名，默认为所有结果（program.results）
+            chunkSize (int): 每次发送给工作进程的场景数，默认按工作进程数自动确定
+
+        返回：
+            dict: 结果名 -> 列（见 toColumn），列的顺序与场景顺序相同
+
+        异常：
+            KeyError: select 中的结果名不存在
+            ScenarioError: 场景求值失败（参数名不存在或节点计算出错）
+        """
+        stamp = self._refresh()
+        select = list(select or self.program.results)
+        for name in select:
+            if name not in self.program.results:
+                raise KeyError(name)
+        scenarios = list(scenarios)
+        if not chunkSize:
+            chunkSize = max(1, -(-len(scenarios) // (self.workers * CHUNKS_PER_WORKER)))
+
+        if self.workers <= 1 or len(scenarios) <= chunkSize:
+            columns = _evaluateChunk(self.plan, 0, scenarios, select)
+        else:
+            pool = self._executor()
+            futures = [
+                pool.submit(_runChunk, start, scenarios[start : start + chunkSize], select, stamp)
+                for start in range(0, len(scenarios), chunkSize)
+            ]
+            columns = [[] for _ in select]
+            try:
+                for future in futures:
+                    for column, part in zip(columns, future.result()):
+                        column.extend(part)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return {name: toColumn(column) for name, column in zip(select, columns)}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def evaluateScenarios(snapshot, scenarios, select=None, workers=None):
+    """
+    在多组输入上求值图（一次性的进程池，多次扫描请使用 ScenarioPool）
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+        scenarios (list): 每个场景是 参数名 -> 值
+        select (list): 需要的结果名，默认为所有结果
+        workers (int): 工作进程数，默认为 CPU 核心数；1 表示在当前进程中求值
+
+    返回：
+        dict: 结果名 -> 列
+    """
+    with ScenarioPool(snapshot, workers) as pool:
+        return pool.evaluate(scenarios, select)
+
+
+_filePools = {}
+_filePoolsLock = threading.Lock()
+
+
+def scenarioPoolForFile(path, workers=None):
+    """
+    获取 *.demo 文件对应的共享进程池（文件修改后在下次 evaluate 时重新读取，拓扑不变时不重新编译）
+
+    参数：
+        path (str): 文件路径
+        workers (int): 工作进程数
+
+    返回：
+        ScenarioPool
+    """
+    key = (os.path.abspath(path), workers)
+    with _filePoolsLock:
+        pool = _filePools.get(key)
+        if pool is None:
+            pool = _filePools[key] = ScenarioPool(key[0], workers)
+        return pool
+
+
+def closeFilePools():
+    """关闭所有共享进程池（进程退出时自动调用）"""
+    with _filePoolsLock:
+        pools = list(_filePools.values())
+        _filePools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(closeFilePools)
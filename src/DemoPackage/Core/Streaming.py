@@ -0,0 +1,319 @@
+"""
+Streaming - 有界队列的流式流水线求值
+
+BatchRunner 和 Scenarios 每次求值一整批记录：读取、计算、写出依次进行，
+一个慢的 I/O 节点会让其他阶段空等。这里把图变成流水线：
+- 被流式输入的参数（streamed）及其下游的步骤是流式步骤，其余步骤只在开始时计算一次（常量）
+- 流式步骤按程序顺序划分为阶段：每个阻塞步骤（semantics.blocking，如 DemoLib 函数）开始一个新阶段，
+  连续的非阻塞步骤（如 DemoNode）合并到当前阶段；每个阶段在自己的线程中执行
+- 记录按块（chunkSize 条）流过阶段，相邻阶段之间是有界队列（queueSize 块）：
+  下游慢时上游阻塞在 put 上（背压），同时在内存中的记录不超过
+  chunkSize x (queueSize + 1) x (阶段数 + 2)，与输入总长度无关，可以处理无界输入
+- 每条记录只在一个阶段中被修改，阶段之间移交整块记录，不需要锁；输出顺序与输入顺序相同
+- streamRecords() 通过共享的 PlanCache 取得计划：同一拓扑的快照重复求值时不重新编译
+
+使用方式：
+    pipeline = StreamPipeline(GraphProgram.build(snapshot), streamed=["DemoNode_0_inp"])
+    for row in pipeline.run({"DemoNode_0_inp": v} for v in readValues()):
+        write(row)                                # 结果名 -> 值，与输入顺序相同
+
+    with open("rows.jsonl") as f:                 # 与 BatchRunner.readJsonl 组合
+        rows = streamRecords(snapshot, readJsonl(f), ["DemoNode_0_inp"], chunkSize=1000)
+
+注意：
+- GIL 版本的 Python 中只有释放 GIL 的阶段（I/O、time.sleep、C 扩展计算）能够重叠执行；
+  纯 Python 的 CPU 密集图请使用 Scenarios/BatchRunner 的进程池
+- 提前停止迭代（break、close()）时所有阶段线程退出；正在读取输入迭代器的线程会在读到下一条记录后退出
+"""
+
+import queue
+import threading
+from itertools import islice
+
+from .CompiledPlan import PlanCache, compilePlan
+from .Tasks import TaskCancelled
+
+#: 每块的记录数
+CHUNK_SIZE = 256
+#: 相邻阶段之间最多排队的块数
+QUEUE_SIZE = 4
+#: 阻塞在队列上的线程检查停止标志的间隔（秒）
+POLL_INTERVAL = 0.05
+
+_END = object()
+_plans = PlanCache()
+
+
+class StreamError(Exception):
+    """流式记录求值失败（带有记录下标，从 0 开始）"""
+
+    def __init__(self, index, message):
+        super(StreamError, self).__init__(f"record {index}: {message}")
+        self.index = index
+        self.message = message
+
+
+class _Failure(object):
+    """沿流水线向下游传递的异常（由消费者重新抛出）"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(channel, item, stop):
+    """放入有界队列，队列满时等待；停止后返回 False"""
+    while True:
+        try:
+            channel.put(item, timeout=POLL_INTERVAL)
+            return True
+        except queue.Full:
+            if stop.is_set():
+                return False
+
+
+def _get(channel, stop):
+    """从队列取出一项；停止后返回 None"""
+    while True:
+        try:
+            return channel.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+def streamingSteps(program, streamed):
+    """
+    找出依赖流式参数的步骤
+
+    参数：
+        program (GraphProgram): 图程序
+        streamed (iterable): 流式参数名
+
+    返回：
+        tuple: (按程序顺序排列的步骤下标列表, 随记录变化的槽位集合)
+    """
+    names = set(streamed)
+    slots = {param.slot for param in program.params if param.name in names}
+    indices = []
+    for index, step in enumerate(program.steps):
+        if any(slot in slots for slot in step.args.values()):
+            indices.append(index)
+            slots.update(step.outSlots.values())
+    return indices, slots
+
+
+def partitionStages(program, indices):
+    """
+    把流式步骤划分为流水线阶段
+
+    参数：
+        program (GraphProgram): 图程序
+        indices (list): 流式步骤下标（程序顺序）
+
+    返回：
+        list: 阶段列表，每个阶段是步骤下标列表；阻塞步骤开始一个新阶段，非阻塞步骤合并到当前阶段
+    """
+    stages = []
+    for index in indices:
+        if not stages or program.steps[index].semantics.blocking:
+            stages.append([index])
+        else:
+            stages[-1].append(index)
+    return stages
+
+
+class StreamPipeline(object):
+    """
+    流式流水线
+
+    关键属性：
+    - program (GraphProgram): 图程序
+    - plan (CompiledPlan): 编译后的计划（各阶段执行其中的 op）
+    - streamed (tuple): 流式参数名，每条记录提供这些参数的值
+    - stages (list): 阶段列表，每个阶段是步骤下标列表
+    - select (list): 输出的结果名
+
+    关键方法：
+    - run(records, overrides, token): 返回逐条产生结果的迭代器
+    """
+
+    def __init__(self, program, streamed, select=None, chunkSize=CHUNK_SIZE, queueSize=QUEUE_SIZE, plan=None):
+        """
+        参数：
+            program (GraphProgram): 图程序
+            streamed (iterable): 流式参数名（GraphProgram.params 中的名称）
+            select (list): 输出的结果名，默认为随记录变化的结果
+            chunkSize (int): 每块的记录数
+            queueSize (int): 相邻阶段之间最多排队的块数
+            plan (CompiledPlan): 按 program 编译的计划（如 PlanCache.get() 的结果，不能融合），默认编译 program
+
+        异常：
+            KeyError: 参数名或结果名不存在
+        """
+        super(StreamPipeline, self).__init__()
+        paramSlots = {param.name: param.slot for param in program.params}
+        self.streamed = tuple(streamed)
+        for name in self.streamed:
+            if name not in paramSlots:
+                raise KeyError(name)
+        self.program = program
+        # 阶段按步骤下标执行 op：不能融合
+        self.plan = plan if plan is not None else compilePlan(program)
+        indices, slots = streamingSteps(program, self.streamed)
+        self.stages = partitionStages(program, indices)
+        streaming = set(indices)
+        self._constantOps = [op for index, op in enumerate(self.plan.ops) if index not in streaming]
+        self._streamedSlots = {name: paramSlots[name] for name in self.streamed}
+        if select is None:
+            select = [name for name, slot in program.results.items() if slot in slots]
+        for name in select:
+            if name not in program.results:
+                raise KeyError(name)
+        self.select = list(select)
+        self.chunkSize = max(1, chunkSize)
+        self.queueSize = max(1, queueSize)
+
+    def _baseValues(self, overrides):
+        """参数默认值和常量步骤的结果（每条记录从它的副本开始）"""
+        overrides = dict(overrides or {})
+        defaults = self.plan.paramDefaults()
+        values = [None] * self.program.slotCount
+        for param in self.program.params:
+            values[param.slot] = overrides.pop(param.name, defaults[param.name])
+        if overrides:
+            raise KeyError(next(iter(overrides)))
+        for op in self._constantOps:
+            op(values)
+        return values
+
+    def run(self, records, overrides=None, token=None):
+        """
+        流式求值
+
+        参数：
+            records (iterable): 记录迭代器（可以是无界的），每条记录是 流式参数名 -> 值；
+                缺少的流式参数使用图中保存的值
+            overrides (dict): 非流式参数名 -> 值，对所有记录相同
+            token (CancellationToken): 可选的取消令牌，每块之前检查
+
+        返回：
+            iterator: 逐条产生 结果名 -> 值（select 中的结果），顺序与输入相同；
+                迭代开始时才启动阶段线程
+
+        异常：
+            KeyError: overrides 中的参数名不存在（立即抛出）
+            StreamError: 记录中有非流式参数或节点计算出错（迭代时抛出）
+            TaskCancelled: 令牌被取消（迭代时抛出）
+        """
+        base = self._baseValues(overrides)
+        return self._consume(iter(records), base, token)
+
+    def _consume(self, records, base, token):
+        stop = threading.Event()
+        channels = [queue.Queue(self.queueSize) for _ in range(len(self.stages) + 1)]
+        source = threading.Thread(
+            target=self._produce, args=(records, base, token, channels[0], stop), name="DemoStreamSource", daemon=True
+        )
+        workers = [
+            threading.Thread(
+                target=_runStage,
+                args=([self.plan.ops[index] for index in stage], token, channels[i], channels[i + 1], stop),
+                name=f"DemoStreamStage-{i}",
+                daemon=True,
+            )
+            for i, stage in enumerate(self.stages)
+        ]
+        slots = [(name, self.program.results[name]) for name in self.select]
+        source.start()
+        for worker in workers:
+            worker.start()
+        try:
+            while True:
+                item = channels[-1].get()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                for values in item[1]:
+                    yield {name: values[slot] for name, slot in slots}
+        finally:
+            stop.set()
+            # 输入迭代器可能阻塞在外部数据源上，不等待读取线程
+            for worker in workers:
+                worker.join()
+
+    def _produce(self, records, base, token, out, stop):
+        streamedSlots = self._streamedSlots
+        start = 0
+        try:
+            while not stop.is_set():
+                if token is not None:
+                    token.raiseIfCancelled()
+                chunk = []
+                for record in islice(records, self.chunkSize):
+                    values = base.copy()
+                    for name, value in record.items():
+                        slot = streamedSlots.get(name)
+                        if slot is None:
+                            raise StreamError(start + len(chunk), f"{name!r} is not a streamed input")
+                        values[slot] = value
+                    chunk.append(values)
+                if not chunk:
+                    break
+                if not _put(out, (start, chunk), stop):
+                    return
+                start += len(chunk)
+        except Exception as e:
+            _put(out, _Failure(e), stop)
+            return
+        _put(out, _END, stop)
+
+
+def _runStage(ops, token, inbox, out, stop):
+    """阶段线程：依次对块中的每条记录执行本阶段的 op"""
+    while True:
+        item = _get(inbox, stop)
+        if item is None:
+            return
+        if item is _END or isinstance(item, _Failure):
+            _put(out, item, stop)
+            return
+        index, chunk = item
+        try:
+            if token is not None:
+                token.raiseIfCancelled()
+            for values in chunk:
+                for op in ops:
+                    op(values)
+                index += 1
+        except TaskCancelled as e:
+            _put(out, _Failure(e), stop)
+            return
+        except Exception as e:
+            _put(out, _Failure(StreamError(index, f"{type(e).__name__}: {e}")), stop)
+            return
+        if not _put(out, item, stop):
+            return
+
+
+def streamRecords(snapshot, records, streamed, select=None, overrides=None, token=None, **options):
+    """
+    在快照上流式求值（一次性的流水线，多次运行请复用 StreamPipeline）
+
+    参数：
+        snapshot (GraphSnapshot): 图快照
+        records (iterable): 记录迭代器，每条记录是 流式参数名 -> 值
+        streamed (iterable): 流式参数名
+        select (list): 输出的结果名，默认为随记录变化的结果
+        overrides (dict): 非流式参数名 -> 值
+        token (CancellationToken): 可选的取消令牌
+        **options: chunkSize、queueSize（见 StreamPipeline）
+
+    返回：
+        iterator: 逐条产生 结果名 -> 值
+    """
+    plan = _plans.get(snapshot)
+    pipeline = StreamPipeline(plan.program, streamed, select, plan=plan, **options)
+    return pipeline.run(records, overrides, token)
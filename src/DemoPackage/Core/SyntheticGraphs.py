@@ -0,0 +1,239 @@
+"""
+SyntheticGraphs - 合成测试图生成器
+
+生成由 DemoNode、DemoLib.demoLibGreet 和 DemoLib.describePayload（DemoPin 数据）组成的快照，
+用于基准测试和压力测试。生成结果是纯数据（GraphSnapshot），
+既可以直接交给导出器/求值器，也可以通过 GraphBuilder 在画布上创建。
+
+图的形状：
+- makeChain / makeChains: 一条或多条 DemoNode 串联链
+- makeTree: DemoNode 树，每个节点的 out 连接 fanOut 个子节点
+- makeRandomDag: 随机 DAG，可配置扇入和扇出（见函数说明）
+- makeLayered: 分层结构（基准测试使用）
+
+分层结构（makeLayered）：
+- 分层结构：共 depth 层，每层宽度约为 size / depth
+- DemoNode 的 inp 连接上一层某个节点的 out
+- fanOut 控制每个输出最多连接下一层多少个节点
+- greetRatio 比例的节点是 demoLibGreet，按执行链（inExec/outExec）串联
+- payloadRatio 比例的节点是 DemoLib.describePayload，其 DemoPin 类型的 "payload" 输入引脚
+  值为 FakeTypeATWXP（用于测量自定义类型的序列化开销）；它们的字符串输出不连接下游
+
+生成结果完全由 seed 决定，同样的参数总是得到同样的图。
+"""
+
+import random
+
+from .GraphSnapshot import ConnectionRecord, GraphSnapshot, NodeRecord, PinRecord
+
+
+def _demoNode(uid, name, x, y, value):
+    pins = [PinRecord("inp", "in", "BoolPin", False, value), PinRecord("out", "out", "BoolPin")]
+    return NodeRecord(uid, name, "DemoNode", "DemoPackage", None, x, y, pins)
+
+
+def _greetNode(uid, name, x, y, word):
+    pins = [
+        PinRecord("inExec", "in", "ExecPin", True),
+        PinRecord("word", "in", "StringPin", False, word),
+        PinRecord("outExec", "out", "ExecPin", True),
+    ]
+    return NodeRecord(uid, name, "demoLibGreet", "DemoPackage", "DemoLib", x, y, pins)
+
+
+def _payloadNode(uid, name, x, y, payload):
+    pins = [PinRecord("payload", "in", "DemoPin", False, payload), PinRecord("out", "out", "StringPin")]
+    return NodeRecord(uid, name, "describePayload", "DemoPackage", "DemoLib", x, y, pins)
+
+
+def makeChain(count, name="chain"):
+    """
+    生成 count 个 DemoNode 串联的快照
+
+    参数：
+        count (int): 节点数量
+        name (str): 图名称
+
+    返回：
+        GraphSnapshot
+    """
+    nodes = [_demoNode(f"{i:08d}", f"DemoNode_{i}", i * 200.0, 0.0, i % 2 == 0) for i in range(count)]
+    connections = [ConnectionRecord(f"{i:08d}", "out", f"{i + 1:08d}", "inp") for i in range(count - 1)]
+    return GraphSnapshot(name, nodes, connections)
+
+
+def makeLayered(size, depth=10, fanOut=2, greetRatio=0.0, payloadRatio=0.0, seed=0, name="synthetic"):
+    """
+    生成分层的合成图
+
+    参数：
+        size (int): 节点总数
+        depth (int): 层数
+        fanOut (int): 每个输出最多连接的下游节点数
+        greetRatio (float): demoLibGreet 节点比例（0-1）
+        payloadRatio (float): 携带 DemoPin 数据的 describePayload 节点比例（0-1，与 greetRatio 之和不超过 1）
+        seed (int): 随机种子
+        name (str): 图名称
+
+    返回：
+        GraphSnapshot
+    """
+    rng = random.Random(seed)
+    depth = max(1, min(depth, size))
+    width = max(1, size // depth)
+    payloadType = None
+    if payloadRatio > 0:
+        # 延迟导入：只有需要 DemoPin 数据时才依赖 uflow
+        from ..Pins.DemoPin import FakeTypeATWXP as payloadType
+
+    nodes = []
+    connections = []
+    layers = []
+    greets = []
+    index = 0
+    for layer in range(depth):
+        count = width if layer < depth - 1 else size - width * (depth - 1)
+        current = []
+        for row in range(count):
+            uid = f"{index:08d}"
+            x, y = layer * 250.0, row * 120.0
+            kind = rng.random()
+            if kind < greetRatio:
+                greets.append(_greetNode(uid, f"demoLibGreet_{index}", x, y, f"word {index}"))
+                nodes.append(greets[-1])
+            elif kind < greetRatio + payloadRatio:
+                nodes.append(_payloadNode(uid, f"describePayload_{index}", x, y, payloadType(index)))
+            else:
+                node = _demoNode(uid, f"DemoNode_{index}", x, y, rng.random() < 0.5)
+                nodes.append(node)
+                current.append(node)
+            index += 1
+
+        if layers and layers[-1]:
+            # 每个上游输出最多连接 fanOut 个下游输入，每个输入只有一个来源
+            sources = layers[-1]
+            budget = {n.uid: fanOut for n in sources}
+            for node in current:
+                candidates = [s for s in sources if budget[s.uid] > 0]
+                if not candidates:
+                    break
+                src = rng.choice(candidates)
+                budget[src.uid] -= 1
+                connections.append(ConnectionRecord(src.uid, "out", node.uid, "inp"))
+        layers.append(current)
+
+    for a, b in zip(greets, greets[1:]):
+        connections.append(ConnectionRecord(a.uid, "outExec", b.uid, "inExec"))
+    return GraphSnapshot(name, nodes, connections)
+
+
+def makeChains(count, length, name="chains"):
+    """
+    生成 count 条并排的 DemoNode 链，每条 length 个节点
+
+    参数：
+        count (int): 链的数量
+        length (int): 每条链的节点数
+        name (str): 图名称
+
+    返回：
+        GraphSnapshot
+    """
+    nodes = []
+    connections = []
+    for chain in range(count):
+        for i in range(length):
+            index = chain * length + i
+            nodes.append(_demoNode(f"{index:08d}", f"DemoNode_{index}", i * 200.0, chain * 120.0, i % 2 == 0))
+            if i > 0:
+                connections.append(ConnectionRecord(f"{index - 1:08d}", "out", f"{index:08d}", "inp"))
+    return GraphSnapshot(name, nodes, connections)
+
+
+def makeTree(size, fanOut=2, name="tree"):
+    """
+    生成 DemoNode 树（按广度优先编号，节点 i 的父节点是 (i - 1) // fanOut）
+
+    参数：
+        size (int): 节点总数
+        fanOut (int): 每个节点的子节点数
+        name (str): 图名称
+
+    返回：
+        GraphSnapshot
+    """
+    fanOut = max(1, fanOut)
+    nodes = []
+    connections = []
+    depths = []
+    rows = {}
+    for i in range(size):
+        depth = depths[(i - 1) // fanOut] + 1 if i else 0
+        depths.append(depth)
+        row = rows[depth] = rows.get(depth, -1) + 1
+        nodes.append(_demoNode(f"{i:08d}", f"DemoNode_{i}", depth * 250.0, row * 120.0, i == 0))
+        if i:
+            connections.append(ConnectionRecord(f"{(i - 1) // fanOut:08d}", "out", f"{i:08d}", "inp"))
+    return GraphSnapshot(name, nodes, connections)
+
+
+def makeRandomDag(size, fanIn=1, fanOut=2, greetRatio=0.0, window=64, seed=0, name="dag"):
+    """
+    生成随机 DAG
+
+    连接只从编号小的节点指向编号大的节点，因此一定无环。
+    每个节点只在前 window 个节点中挑选上游，保持局部性（图不会退化成一团乱线）。
+
+    扇入/扇出受引脚连接规则约束：
+    - DemoNode 的数据输入 inp 只能有一个来源（数据扇入固定为 1），
+      数据输出 out 最多连接 fanOut 个下游
+    - demoLibGreet 的执行输入 inExec 可以接受多个来源，最多连接 fanIn 个上游 outExec；
+      执行输出 outExec 只能连接一个下游
+
+    参数：
+        size (int): 节点总数
+        fanIn (int): 执行输入的最大扇入
+        fanOut (int): 数据输出的最大扇出
+        greetRatio (float): demoLibGreet 节点比例（0-1）
+        window (int): 挑选上游时回看的节点数
+        seed (int): 随机种子
+        name (str): 图名称
+
+    返回：
+        GraphSnapshot
+    """
+    rng = random.Random(seed)
+    nodes = []
+    connections = []
+    depths = []
+    rows = {}
+    dataBudget = {}  # DemoNode 编号 -> 剩余扇出
+    freeExec = set()  # outExec 尚未连接的 demoLibGreet 编号
+    for i in range(size):
+        isGreet = rng.random() < greetRatio
+        if isGreet:
+            sources = [j for j in range(max(0, i - window), i) if j in freeExec]
+            # 扇入 0 的节点开始新的执行链，为后面的多路扇入提供空闲的 outExec
+            sources = rng.sample(sources, min(len(sources), rng.randint(0, max(1, fanIn))))
+            freeExec.difference_update(sources)
+            freeExec.add(i)
+            pins = ("outExec", "inExec")
+        else:
+            sources = [j for j in range(max(0, i - window), i) if dataBudget.get(j, 0) > 0]
+            sources = [rng.choice(sources)] if sources else []
+            for j in sources:
+                dataBudget[j] -= 1
+            dataBudget[i] = fanOut
+            pins = ("out", "inp")
+
+        depth = max((depths[j] + 1 for j in sources), default=0)
+        depths.append(depth)
+        row = rows[depth] = rows.get(depth, -1) + 1
+        uid, x, y = f"{i:08d}", depth * 250.0, row * 120.0
+        if isGreet:
+            nodes.append(_greetNode(uid, f"demoLibGreet_{i}", x, y, f"word {i}"))
+        else:
+            nodes.append(_demoNode(uid, f"DemoNode_{i}", x, y, rng.random() < 0.5))
+        for j in sources:
+            connections.append(ConnectionRecord(f"{j:08d}", pins[0], uid, pins[1]))
+    return GraphSnapshot(name, nodes, connections)
@@ -0,0 +1,434 @@
+"""
+Tasks - 后台任务与取消令牌
+
+把耗时操作（序列化、文件读写等）放到工作线程执行，
+并通过队列把进度和结果交回主线程（GUI 线程）处理。
+
+组成：
+- CancellationToken: 取消令牌，工作线程周期性检查
+- DeadlineToken: 带时间预算的取消令牌，超过截止时间视为已取消
+- TaskCancelled: 任务被取消时抛出的异常
+- BudgetExceeded: 超过时间预算时抛出的异常（TaskCancelled 的子类）
+- currentToken() / activateToken(): 当前上下文（线程、协程任务）中生效的令牌，节点计算中可以直接获取
+- BackgroundTask: 在工作线程中运行的任务，进度/结果经队列回传
+- TimeSlicedJob: 把生成器按时间片在主线程中分段执行
+- setMainThreadPump() / mainThreadPump(): 主线程事件泵的注册点，Core 中的代码可以把需要在主线程分发的对象交给它
+
+线程规则：
+- 工作线程中绝对不能访问 Qt 控件或图对象（节点、引脚）
+- 工作线程只处理快照等纯数据
+- 所有回调（onProgress、onFinished 等）都在调用 pollEvents() 的线程中执行，
+  通常由 UI/TaskPump.py 中的定时器在主线程调用
+
+注意：
+- 本模块不依赖 Qt，可以在无界面环境（命令行、服务）中使用
+"""
+
+import contextlib
+import contextvars
+import queue
+import threading
+import time
+
+#: 超过预算后仍未结束的后台任务在这段时间（秒）之后被放弃
+ABANDON_GRACE = 1.0
+
+
+class TaskCancelled(Exception):
+    """任务被取消时抛出（由 CancellationToken.raiseIfCancelled 触发）"""
+
+
+class BudgetExceeded(TaskCancelled):
+    """超过时间预算（由 DeadlineToken.raiseIfCancelled 或求值器的耗时检查触发）"""
+
+    def __init__(self, label, seconds):
+        super(BudgetExceeded, self).__init__(f"{label} exceeded its {seconds:g} s budget")
+        self.label = label
+        self.seconds = seconds
+
+    def __reduce__(self):
+        return (type(self), (self.label, self.seconds))
+
+
+class CancellationToken(object):
+    """
+    取消令牌
+
+    由任务发起方持有并调用 cancel()，执行方周期性调用
+    isCancelled() 或 raiseIfCancelled() 检查是否需要中止。
+
+    线程安全：
+    - 内部使用 threading.Event，可在任意线程调用
+    """
+
+    def __init__(self):
+        super(CancellationToken, self).__init__()
+        self._event = threading.Event()
+
+    def cancel(self):
+        """请求取消（可重复调用）"""
+        self._event.set()
+
+    def isCancelled(self):
+        """
+        是否已请求取消
+
+        返回：
+            bool: True 表示已请求取消
+        """
+        return self._event.is_set()
+
+    def raiseIfCancelled(self):
+        """如果已请求取消，抛出 TaskCancelled"""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class DeadlineToken(CancellationToken):
+    """
+    带时间预算的取消令牌
+
+    以下任一情况视为已取消：
+    - 调用了 cancel()
+    - 父令牌被取消（或父令牌的截止时间已到）
+    - 超过自己的截止时间（创建时刻 + seconds）
+
+    截止时间到达时 raiseIfCancelled() 抛出 BudgetExceeded，说明是哪一个预算被用完；
+    父令牌的取消原因原样传递（例如整次求值的预算先用完时抛出父令牌的 BudgetExceeded）。
+
+    典型用途：
+    - 整次求值的预算：DeadlineToken(30, parent=task.token, label="Evaluation")
+    - 单个节点的预算：每个步骤执行前创建 DeadlineToken(2, parent=求值令牌, label="Node 'X'")
+    """
+
+    def __init__(self, seconds, parent=None, label="Task"):
+        """
+        参数：
+            seconds (float): 时间预算（秒），从创建时开始计时
+            parent (CancellationToken): 可选的父令牌
+            label (str): 出现在 BudgetExceeded 信息中的名称
+        """
+        super(DeadlineToken, self).__init__()
+        self.seconds = seconds
+        self.parent = parent
+        self.label = label
+        self.deadline = time.perf_counter() + seconds
+
+    def remaining(self):
+        """
+        距截止时间的秒数
+
+        返回：
+            float: 剩余时间（已超时为负数）
+        """
+        return self.deadline - time.perf_counter()
+
+    def isCancelled(self):
+        if self._event.is_set() or time.perf_counter() >= self.deadline:
+            return True
+        return self.parent is not None and self.parent.isCancelled()
+
+    def raiseIfCancelled(self):
+        """被取消时抛出 TaskCancelled，截止时间已到时抛出 BudgetExceeded"""
+        if self.parent is not None:
+            self.parent.raiseIfCancelled()
+        if self._event.is_set():
+            raise TaskCancelled()
+        if time.perf_counter() >= self.deadline:
+            raise BudgetExceeded(self.label, self.seconds)
+
+
+_idleToken = CancellationToken()
+_activeToken = contextvars.ContextVar("DemoActiveToken", default=None)
+
+
+def currentToken():
+    """
+    当前上下文中生效的取消令牌
+
+    在节点的 compute 或语义的 evaluate 中调用，长时间的循环应周期性检查：
+        token = currentToken()
+        for i, item in enumerate(items):
+            if i % 1000 == 0:
+                token.raiseIfCancelled()
+
+    生效的令牌由求值器设置（后台求值、执行链调度、带预算的步骤，见 activateToken）；
+    没有设置时返回一个永远不会被取消的令牌，节点行为不变。
+
+    返回：
+        CancellationToken
+    """
+    token = _activeToken.get()
+    return token if token is not None else _idleToken
+
+
+@contextlib.contextmanager
+def activateToken(token):
+    """
+    在 with 语句范围内把 token 设为当前令牌（基于 contextvars，线程和协程任务之间互不影响）
+
+    参数：
+        token (CancellationToken): 令牌，None 表示不改变
+    """
+    if token is None:
+        yield
+        return
+    reset = _activeToken.set(token)
+    try:
+        yield
+    finally:
+        _activeToken.reset(reset)
+
+
+_mainThreadPump = None
+
+
+def setMainThreadPump(watch):
+    """
+    注册主线程事件泵（UI/TaskPump.py 在导入时注册）
+
+    参数：
+        watch (callable): watch(task)，之后在主线程中周期性调用 task.pollEvents()，
+            直到它返回 False；None 表示取消注册
+    """
+    global _mainThreadPump
+    _mainThreadPump = watch
+
+
+def mainThreadPump():
+    """
+    已注册的主线程事件泵
+
+    返回：
+        callable: watch(task)；无界面环境中没有注册时返回 None
+    """
+    return _mainThreadPump
+
+
+class BackgroundTask(object):
+    """
+    后台任务
+
+    在守护线程中执行 fn(token, report)：
+    - token (CancellationToken): 取消令牌（执行期间也是 currentToken()）
+    - report (callable): report(done, total, message="") 上报进度
+
+    fn 的返回值作为结果交给 onFinished 回调。
+
+    时间预算（budget）：
+    - token 是 DeadlineToken，截止时间到达后检查令牌的代码抛出 BudgetExceeded，交给 onFailed
+    - 不检查令牌的代码（失控的节点）无法从外部中止：超过预算 ABANDON_GRACE 秒后仍未结束时，
+      pollEvents() 放弃该任务并调用 onFailed(BudgetExceeded)，工作线程之后的结果被丢弃，
+      主线程可以继续工作，不需要结束进程
+
+    回调（均在调用 pollEvents() 的线程中执行）：
+    - onProgress(done, total, message)
+    - onFinished(result)
+    - onFailed(exception)
+    - onCancelled()
+
+    进度节流：
+    - 两次进度上报间隔小于 progressInterval 秒时会被合并，
+      避免工作线程上报过快拖慢主线程
+    """
+
+    def __init__(self, fn, name="DemoBackgroundTask", progressInterval=0.05, budget=None):
+        """
+        初始化任务（不会立即启动）
+
+        参数：
+            fn (callable): 工作函数 fn(token, report)
+            name (str): 线程名称（便于调试）
+            progressInterval (float): 进度上报最小间隔（秒）
+            budget (float): 可选的时间预算（秒），从创建任务时开始计时
+        """
+        super(BackgroundTask, self).__init__()
+        self._fn = fn
+        self._name = name
+        self._progressInterval = progressInterval
+        self._lastReport = 0.0
+        self._events = queue.SimpleQueue()
+        self._thread = None
+        self._done = False
+        self.budget = budget
+        self.token = DeadlineToken(budget, label=name) if budget else CancellationToken()
+
+        self.onProgress = None
+        self.onFinished = None
+        self.onFailed = None
+        self.onCancelled = None
+
+    def start(self):
+        """启动工作线程"""
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """请求取消任务"""
+        self.token.cancel()
+
+    def isDone(self):
+        """
+        任务是否已结束且所有事件都已分发
+
+        返回：
+            bool: True 表示不再需要调用 pollEvents()
+        """
+        return self._done
+
+    def wait(self, timeout=None):
+        """
+        阻塞等待工作线程结束（主要用于无界面环境）
+
+        参数：
+            timeout (float): 超时时间（秒），None 表示一直等待
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def report(self, done, total, message=""):
+        """
+        上报进度（在工作线程中调用）
+
+        参数：
+            done (int): 已完成的工作量
+            total (int): 总工作量
+            message (str): 可选的状态文本
+        """
+        now = time.perf_counter()
+        if done < total and now - self._lastReport < self._progressInterval:
+            return
+        self._lastReport = now
+        self._events.put(("progress", (done, total, message)))
+
+    def _run(self):
+        try:
+            with activateToken(self.token):
+                result = self._fn(self.token, self.report)
+            # 工作函数没有检查令牌就返回时，仍按取消或超时处理
+            self.token.raiseIfCancelled()
+        except BudgetExceeded as e:
+            self._events.put(("failed", (e,)))
+        except TaskCancelled:
+            self._events.put(("cancelled", ()))
+        except Exception as e:
+            self._events.put(("failed", (e,)))
+        else:
+            self._events.put(("finished", (result,)))
+        finally:
+            # 求值中的协程节点可能为这个线程创建了事件循环（Core/AsyncEvaluation.py），随任务一起关闭
+            from .AsyncEvaluation import closeThreadLoop
+
+            closeThreadLoop()
+
+    def pollEvents(self):
+        """
+        分发已排队的事件（在主线程中调用）
+
+        返回：
+            bool: True 表示任务仍在进行，需要继续轮询
+        """
+        if self._done:
+            return False
+        while True:
+            try:
+                kind, args = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind != "progress":
+                self._done = True
+            callback = {
+                "progress": self.onProgress,
+                "finished": self.onFinished,
+                "failed": self.onFailed,
+                "cancelled": self.onCancelled,
+            }[kind]
+            if callback is not None:
+                callback(*args)
+        if not self._done and self.budget and self.token.remaining() < -ABANDON_GRACE:
+            # 工作线程没有响应截止时间（失控的节点）：放弃它，之后的结果不再分发
+            self._done = True
+            if self.onFailed is not None:
+                self.onFailed(BudgetExceeded(self._name, self.budget))
+        return not self._done
+
+
+class TimeSlicedJob(object):
+    """
+    时间片任务
+
+    把一个生成器分段执行：每次 step() 最多运行 budget 秒，
+    然后把控制权交还事件循环，保持界面响应。
+
+    生成器约定：
+    - 每完成一个小的工作单元就 yield 一次
+    - 可以 yield (done, total) 元组上报进度
+    - 生成器结束即任务完成，生成器的返回值保存在 result 属性中
+
+    典型用途：
+    - 导入时在主线程中分批创建节点和连接
+    """
+
+    def __init__(self, generator, budget=0.008, token=None):
+        """
+        初始化时间片任务
+
+        参数：
+            generator: 要执行的生成器
+            budget (float): 每个时间片的预算（秒），默认 8 毫秒
+            token (CancellationToken): 可选的取消令牌
+        """
+        super(TimeSlicedJob, self).__init__()
+        self._generator = generator
+        self.budget = budget
+        self.token = token if token is not None else CancellationToken()
+        self.progress = (0, 0)
+        self.finished = False
+        self.result = None
+
+        self.onProgress = None
+        self.onFinished = None
+        self.onFailed = None
+        self.onCancelled = None
+
+    def cancel(self):
+        """请求取消（在下一个时间片开始时生效）"""
+        self.token.cancel()
+
+    def step(self):
+        """
+        执行一个时间片
+
+        返回：
+            bool: True 表示还有剩余工作
+        """
+        if self.finished:
+            return False
+        if self.token.isCancelled():
+            self._finish(self.onCancelled)
+            return False
+
+        deadline = time.perf_counter() + self.budget
+        try:
+            while time.perf_counter() < deadline:
+                item = next(self._generator)
+                if isinstance(item, tuple):
+                    self.progress = item
+        except StopIteration as e:
+            self.result = e.value
+            self._finish(self.onFinished)
+            return False
+        except Exception as e:
+            self._finish(self.onFailed, e)
+            return False
+
+        if self.onProgress is not None:
+            self.onProgress(*self.progress)
+        return True
+
+    def _finish(self, callback, *args):
+        self.finished = True
+        self._generator.close()
+        if callback is not None:
+            callback(*args)
@@ -0,0 +1,191 @@
+"""
+Tracing - 执行追踪记录器（Chrome trace-event 格式）
+
+作为 Instrumentation 的监听器，记录图求值期间每次节点 compute 和
+每次执行引脚调用（包括 DemoNode 和 DemoLib.demoLibGreet）的开始时间、
+持续时间和线程 id，导出为 Chrome trace-event JSON，
+可以在 https://ui.perfetto.dev 或 chrome://tracing 中查看。
+
+快照求值（DemoShelfTool 的后台求值、批量任务、场景扫描、图服务等）不调用框架节点的 compute，
+记录的是求值器报告的步骤事件（step，见 Core/Instrumentation.py），在执行步骤的工作线程中。
+
+事件格式：
+- 每次执行导出为一个 "X"（complete）事件，同时包含开始（ts）和结束（ts + dur）
+- cat 为事件类型：compute、exec-in、exec-out、step
+- 每个线程额外导出一个 thread_name 元数据事件
+
+低干扰：
+- 记录写入预分配的 array 缓冲区，记录过程中不分配新对象、不做格式化
+- 名称字符串只在第一次出现时登记，之后用整数编号
+- 缓冲区写满后停止记录并统计丢弃数量，不会扩容
+- JSON 只在 dump() 时生成
+
+线程安全：
+- 后台求值的工作线程（step 事件）和界面中的执行引脚调用可能同时记录：槽位编号和名称编号在一个短锁中分配，
+  每个槽位只由取得它的线程写入，事件不会互相覆盖
+
+使用方式：
+    recorder = traceRecorder()
+    recorder.start()
+    ...  # 求值图
+    recorder.stop()
+    recorder.dump("trace.json")
+"""
+
+import json
+import os
+import threading
+from array import array
+
+from . import Instrumentation
+
+_KINDS = ("compute", "exec-in", "exec-out", Instrumentation.STEP_KIND)
+
+
+class TraceRecorder(object):
+    """
+    追踪记录器
+
+    关键方法：
+    - start()/stop(): 开始/停止记录
+    - clear(): 清空缓冲区
+    - eventCount()/dropped(): 已记录/已丢弃的事件数
+    - toChromeTrace(): 生成 trace-event 字典
+    - dump(path): 写出 JSON 文件
+    """
+
+    def __init__(self, capacity=1 << 18):
+        """
+        初始化记录器
+
+        参数：
+            capacity (int): 缓冲区容量（事件数，默认 262144，约占 8.6 MB）
+        """
+        super(TraceRecorder, self).__init__()
+        self.capacity = capacity
+        self._starts = array("q", bytes(8 * capacity))
+        self._durations = array("q", bytes(8 * capacity))
+        self._threads = array("q", bytes(8 * capacity))
+        self._names = array("q", bytes(8 * capacity))
+        self._kinds = array("b", bytes(capacity))
+        self._count = 0
+        self._dropped = 0
+        self._nameIds = {}
+        self._nameList = []
+        self._kindIds = {k: i for i, k in enumerate(_KINDS)}
+        self._lock = threading.Lock()
+
+    def start(self):
+        """开始记录"""
+        Instrumentation.addListener(self)
+
+    def stop(self):
+        """停止记录"""
+        Instrumentation.removeListener(self)
+
+    def isRecording(self):
+        """是否正在记录"""
+        return Instrumentation.hasListener(self)
+
+    def clear(self):
+        """清空已记录的事件"""
+        with self._lock:
+            self._count = 0
+            self._dropped = 0
+
+    def eventCount(self):
+        """返回已记录的事件数"""
+        return min(self._count, self.capacity)
+
+    def dropped(self):
+        """返回缓冲区写满后丢弃的事件数"""
+        return self._dropped
+
+    def record(self, node, kind, name, startNs, durationNs, selfNs, threadId):
+        """插桩监听器接口：记录一个事件"""
+        with self._lock:
+            index = self._count
+            if index >= self.capacity:
+                self._dropped += 1
+                return
+            self._count = index + 1
+            nameId = self._nameIds.get(name)
+            if nameId is None:
+                nameId = self._nameIds[name] = len(self._nameList)
+                self._nameList.append(name)
+        # 槽位已被本线程独占，写入不需要持有锁
+        self._starts[index] = startNs
+        self._durations[index] = durationNs
+        self._threads[index] = threadId
+        self._names[index] = nameId
+        self._kinds[index] = self._kindIds[kind]
+
+    def toChromeTrace(self):
+        """
+        生成 Chrome trace-event 格式的数据
+
+        返回：
+            dict: {"traceEvents": [...], "displayTimeUnit": "ms", ...}
+        """
+        pid = os.getpid()
+        count = self.eventCount()
+        origin = min(self._starts[:count]) if count else 0
+        threadNames = {t.ident: t.name for t in threading.enumerate()}
+
+        events = []
+        tids = set()
+        for i in range(count):
+            tid = self._threads[i]
+            tids.add(tid)
+            events.append(
+                {
+                    "name": self._nameList[self._names[i]],
+                    "cat": _KINDS[self._kinds[i]],
+                    "ph": "X",
+                    "ts": (self._starts[i] - origin) / 1000.0,
+                    "dur": self._durations[i] / 1000.0,
+                    "pid": pid,
+                    "tid": tid,
+                }
+            )
+        for tid in sorted(tids):
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": threadNames.get(tid, str(tid))}}
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"producer": "DemoPackage", "dropped": self._dropped},
+        }
+
+    def dump(self, path):
+        """
+        写出 trace JSON 文件
+
+        参数：
+            path (str): 目标文件路径
+
+        返回：
+            int: 写出的事件数
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.toChromeTrace(), f)
+        return self.eventCount()
+
+
+_recorder = None
+
+
+def traceRecorder():
+    """
+    获取进程内共享的追踪记录器
+
+    DemoTraceShelfTool（追踪开关按钮）和 DemoDockTool（Trace 标签页）控制的是同一个记录器。
+
+    返回：
+        TraceRecorder
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = TraceRecorder()
+    return _recorder
@@ -20,17 +20,25 @@ DemoExporter - 导入导出器示例
 接口：IDataExporter
 """
 
+import os
 from datetime import datetime
 from uflow.UI.UIInterfaces import IDataExporter
 from uflow.Core.version import Version
 
+from ..Core.Codecs import CODECS, normalizeLevel
+from ..Core.DemoGraphFormat import DemoFormatError, readSnapshot, verifyFile, writeSnapshot
+from ..Core.GraphBuilder import GraphBuilder, activeGraph
+from ..Core.GraphSnapshot import GraphSnapshot
+from ..Core.Tasks import BackgroundTask, TimeSlicedJob
+from ..UI.TaskPump import TaskPump
+
 
 class DemoExporter(IDataExporter):
     """
     演示导入导出器
 
-    提供自定义格式的导入导出功能示例。
-    当前实现仅打印消息，实际应用中需要实现文件读写逻辑。
+    提供自定义格式（*.demo）的导入导出功能示例。
+    序列化和文件读写在工作线程中进行，界面保持响应。
 
     继承层次：
     IDataExporter <- DemoExporter
@@ -41,6 +49,8 @@ class DemoExporter(IDataExporter):
     - version(): 导出器版本
     - doExport(): 执行导出操作
     - doImport(): 执行导入操作
+    - exportSnapshot()/importSnapshot(): 无界面的文件读写（可在工作线程中调用）
+    - verifyFile(): 仅校验文件完整性，不构建图
     - createImporterMenu(): 是否在导入菜单中显示
     """
 
@@ -118,9 +128,9 @@ class DemoExporter(IDataExporter):
         - 修订版本(patch): 向后兼容的问题修复
 
         效果：
-        - 当前版本: 1.0.0
+        - 当前版本: 1.3.0（分部分校验和）
         """
-        return Version(1, 0, 0)
+        return Version(1, 3, 0)
 
     @staticmethod
     def toolTip():
@@ -157,6 +167,136 @@ class DemoExporter(IDataExporter):
         """
         return "Demo exporter"
 
+    @staticmethod
+    def _progressDialog(title, token):
+        """
+        创建非模态进度对话框
+
+        参数：
+            title (str): 对话框标题
+            token (CancellationToken): 点击 "Cancel" 时取消的令牌
+
+        返回：
+            QProgressDialog: 进度对话框
+        """
+        from qtpy.QtWidgets import QProgressDialog
+
+        dialog = QProgressDialog(title, "Cancel", 0, 100)
+        dialog.setWindowTitle(DemoExporter.displayName())
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(True)
+        dialog.canceled.connect(token.cancel)
+        return dialog
+
+    @staticmethod
+    def _updateProgress(dialog, done, total, message=""):
+        if total > 0:
+            dialog.setValue(int(done * 100 / total))
+        if message:
+            dialog.setLabelText(f"{message} {done}/{total}")
+
+    @staticmethod
+    def compressionSettings():
+        """
+        读取首选项中的压缩设置
+
+        返回：
+            tuple: (codec, level)，例如 ("zlib", 6)
+
+        作用：
+        - 从 DemoPrefs 首选项面板保存的设置中读取编码和级别
+        - 设置不存在或无效时使用 ("zlib", 默认级别)
+
+        说明：
+        - 导入时不需要此设置，编码和级别从文件头自动识别
+        """
+        from uflow.ConfigManager import ConfigManager
+
+        codec = ConfigManager().getPrefsValue("PREFS", "DemoPrefs/ExportCodec") or "zlib"
+        level = ConfigManager().getPrefsValue("PREFS", "DemoPrefs/ExportLevel")
+        if codec not in CODECS:
+            codec = "zlib"
+        return codec, normalizeLevel(codec, level)
+
+    @staticmethod
+    def exportSnapshot(filePath, snapshot, codec="zlib", level=None, token=None, report=None):
+        """
+        把快照写入文件（可在工作线程中调用）
+
+        参数：
+            filePath (str): 目标文件路径
+            snapshot (GraphSnapshot): 图快照
+            codec (str): 压缩编码（"none"、"zlib"、"bz2"、"lzma"）
+            level (int): 压缩级别，None 表示默认级别
+            token (CancellationToken): 可选的取消令牌
+            report (callable): 可选的进度回调
+
+        返回：
+            int: 写入的记录数量
+
+        说明：
+        - 先写入临时文件 "<filePath>.part"，成功后原子替换
+        - 取消或失败时删除临时文件，原文件保持不变
+        - 压缩是流式进行的，不会在内存中保留完整的未压缩内容
+        """
+        tmpPath = filePath + ".part"
+        try:
+            with open(tmpPath, "wb") as f:
+                count = writeSnapshot(
+                    snapshot, f, DemoExporter.creationDateString(), codec, level, token, report
+                )
+            os.replace(tmpPath, filePath)
+        except BaseException:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+            raise
+        return count
+
+    @staticmethod
+    def verifyFile(filePath, token=None):
+        """
+        仅校验文件完整性，不构建图（可在工作线程中调用）
+
+        参数：
+            filePath (str): 文件路径
+            token (CancellationToken): 可选的取消令牌
+
+        返回：
+            list: 损坏的部分名称，空列表表示文件完好
+
+        异常：
+            DemoFormatError: 文件头或索引损坏
+        """
+        return [r.name for r in verifyFile(filePath, token=token) if not r.ok]
+
+    @staticmethod
+    def importSnapshot(filePath, token=None, report=None):
+        """
+        从文件读取快照（可在工作线程中调用）
+
+        参数：
+            filePath (str): 文件路径
+            token (CancellationToken): 可选的取消令牌
+            report (callable): 可选的进度回调
+
+        返回：
+            GraphSnapshot: 读取到的快照
+
+        异常：
+            DemoFormatError: 文件格式错误或校验和不匹配
+
+        说明：
+        - 先并行校验各部分的校验和，任何部分损坏都会在解析之前拒绝整个文件
+        - 压缩编码从文件头自动识别，边解压边解析
+        """
+        if report is not None:
+            report(0, 1, "Verifying")
+        corrupt = DemoExporter.verifyFile(filePath, token)
+        if corrupt:
+            raise DemoFormatError(f"Corrupt sections: {', '.join(corrupt)}")
+        with open(filePath, "rb") as f:
+            return readSnapshot(f, token, report)
+
     @staticmethod
     def doImport(uflowInstance):
         """
@@ -166,77 +306,59 @@ class DemoExporter(IDataExporter):
             uflowInstance: uflow 应用实例
 
         作用：
-        - 从文件导入图数据
+        - 从 *.demo 文件导入图数据
         - 解析自定义格式
         - 重建节点和连接
 
         实现步骤：
         1. 显示文件选择对话框
-        2. 读取文件内容
-        3. 解析数据格式
-        4. 创建图、节点、连接
-        5. 设置节点属性和数据
+        2. 在工作线程中并行校验各部分的校验和，然后读取并解析文件（得到 GraphSnapshot）
+        3. 回到主线程，按时间片（每片约 8 毫秒）创建节点、连接并设置引脚值
+        4. 全程显示进度对话框，可随时取消
 
-        当前实现：
-        - 仅打印消息（示例）
+        取消行为：
+        - 校验失败：不会创建任何节点
+        - 读取阶段取消：不会创建任何节点
+        - 重建阶段取消：删除本次已创建的节点，图恢复原状
 
-        完整实现示例（已注释）：
+        效果：
+        - 导入大文件时界面保持响应
         """
-        # 当前实现：简单打印
-        print("DemoExporter import!")
-
-        # ====================================================================
-        # 完整导入实现示例（已注释）
-        # ====================================================================
-
-        # from qtpy.QtWidgets import QFileDialog
-        # import json
-        #
-        # # 1. 显示文件选择对话框
-        # filePath, _ = QFileDialog.getOpenFileName(
-        #     None,
-        #     "Import from Demo Format",
-        #     "",
-        #     "Demo Files (*.demo);;All Files (*)"
-        # )
-        #
-        # if not filePath:
-        #     return  # 用户取消
-        #
-        # try:
-        #     # 2. 读取文件
-        #     with open(filePath, 'r') as f:
-        #         data = json.load(f)
-        #
-        #     # 3. 获取图管理器
-        #     graphManager = uflowInstance.graphManager
-        #     graph = graphManager.activeGraph()
-        #
-        #     # 4. 清空当前图（可选）
-        #     # graph.clear()
-        #
-        #     # 5. 创建节点
-        #     nodes = {}
-        #     for node_data in data.get('nodes', []):
-        #         node = graph.createNode(
-        #             node_data['type'],
-        #             name=node_data['name']
-        #         )
-        #         nodes[node_data['id']] = node
-        #
-        #     # 6. 创建连接
-        #     for conn_data in data.get('connections', []):
-        #         src_node = nodes[conn_data['source_node']]
-        #         dst_node = nodes[conn_data['target_node']]
-        #         src_pin = src_node.getPin(conn_data['source_pin'])
-        #         dst_pin = dst_node.getPin(conn_data['target_pin'])
-        #         if src_pin and dst_pin:
-        #             src_pin.connectTo(dst_pin)
-        #
-        #     print(f"Imported from {filePath}")
-        #
-        # except Exception as e:
-        #     print(f"Import failed: {e}")
+        from qtpy.QtWidgets import QFileDialog
+
+        filePath, _ = QFileDialog.getOpenFileName(
+            None, "Import from Demo Format", "", "Demo Files (*.demo);;All Files (*)"
+        )
+        if not filePath:
+            return  # 用户取消
+
+        task = BackgroundTask(lambda token, report: DemoExporter.importSnapshot(filePath, token, report))
+        dialog = DemoExporter._progressDialog("Reading...", task.token)
+
+        def onRead(snapshot):
+            builder = GraphBuilder(uflowInstance, snapshot)
+            job = TimeSlicedJob(builder.build(), token=task.token)
+
+            def onBuilt():
+                dialog.reset()
+                print(f"Imported {len(snapshot.nodes)} nodes from {filePath}")
+
+            def onAborted(error=None):
+                builder.rollback()
+                dialog.reset()
+                print(f"Import failed: {error}" if error is not None else "Import cancelled")
+
+            job.onProgress = lambda done, total: DemoExporter._updateProgress(dialog, done, total, "Building")
+            job.onFinished = onBuilt
+            job.onFailed = onAborted
+            job.onCancelled = onAborted
+            TaskPump.instance().schedule(job)
+
+        task.onProgress = lambda *args: DemoExporter._updateProgress(dialog, *args)
+        task.onFinished = onRead
+        task.onFailed = lambda e: (dialog.reset(), print(f"Import failed: {e}"))
+        task.onCancelled = lambda: (dialog.reset(), print("Import cancelled"))
+        TaskPump.instance().watch(task.start())
 
     @staticmethod
     def doExport(uflowInstance):
@@ -247,82 +369,45 @@ class DemoExporter(IDataExporter):
             uflowInstance: uflow 应用实例
 
         作用：
-        - 将当前图导出为文件
+        - 将当前图导出为 *.demo 文件
         - 序列化图数据
-        - 保存为自定义格式
+        - 保存为自定义格式（见 Core/DemoGraphFormat.py）
 
         实现步骤：
         1. 显示文件保存对话框
-        2. 收集图数据（节点、连接、属性）
-        3. 序列化为自定义格式
-        4. 写入文件
+        2. 在主线程中创建图快照（GraphSnapshot.capture，只复制纯数据，开销很小）
+        3. 在工作线程中序列化快照并写入文件
+        4. 全程显示进度对话框，可随时取消
+
+        压缩：
+        - 编码和级别在首选项 "Demo section" 中选择（默认 zlib）
+        - 编码和级别记录在文件头中，导入时自动识别
 
-        当前实现：
-        - 仅打印消息（示例）
+        快照一致性：
+        - 快照与图完全解耦，导出期间用户可以继续编辑，
+          文件内容始终是点击导出那一刻的图状态
 
-        完整实现示例（已注释）：
+        效果：
+        - 导出大图时界面保持响应
+        - 取消导出不会留下不完整的文件
         """
-        # 当前实现：简单打印
-        print("DemoExporter export!")
-
-        # ====================================================================
-        # 完整导出实现示例（已注释）
-        # ====================================================================
-
-        # from qtpy.QtWidgets import QFileDialog
-        # import json
-        #
-        # # 1. 显示文件保存对话框
-        # filePath, _ = QFileDialog.getSaveFileName(
-        #     None,
-        #     "Export to Demo Format",
-        #     "",
-        #     "Demo Files (*.demo);;All Files (*)"
-        # )
-        #
-        # if not filePath:
-        #     return  # 用户取消
-        #
-        # try:
-        #     # 2. 获取当前图
-        #     graphManager = uflowInstance.graphManager
-        #     graph = graphManager.activeGraph()
-        #
-        #     # 3. 收集节点数据
-        #     nodes_data = []
-        #     for node in graph.nodes.values():
-        #         nodes_data.append({
-        #             'id': node.uid,
-        #             'name': node.getName(),
-        #             'type': node.__class__.__name__,
-        #             'position': [node.x, node.y]
-        #         })
-        #
-        #     # 4. 收集连接数据
-        #     connections_data = []
-        #     for node in graph.nodes.values():
-        #         for pin in node.outputs.values():
-        #             for connection in pin.connections:
-        #                 connections_data.append({
-        #                     'source_node': node.uid,
-        #                     'source_pin': pin.getName(),
-        #                     'target_node': connection.destination.owningNode().uid,
-        #                     'target_pin': connection.destination.getName()
-        #                 })
-        #
-        #     # 5. 组装数据
-        #     export_data = {
-        #         'version': str(DemoExporter.version()),
-        #         'created': DemoExporter.creationDateString(),
-        #         'nodes': nodes_data,
-        #         'connections': connections_data
-        #     }
-        #
-        #     # 6. 写入文件
-        #     with open(filePath, 'w') as f:
-        #         json.dump(export_data, f, indent=2)
-        #
-        #     print(f"Exported to {filePath}")
-        #
-        # except Exception as e:
-        #     print(f"Export failed: {e}")
+        from qtpy.QtWidgets import QFileDialog
+
+        filePath, _ = QFileDialog.getSaveFileName(
+            None, "Export to Demo Format", "", "Demo Files (*.demo);;All Files (*)"
+        )
+        if not filePath:
+            return  # 用户取消
+
+        snapshot = GraphSnapshot.capture(activeGraph(uflowInstance))
+        codec, level = DemoExporter.compressionSettings()
+
+        task = BackgroundTask(
+            lambda token, report: DemoExporter.exportSnapshot(filePath, snapshot, codec, level, token, report)
+        )
+        dialog = DemoExporter._progressDialog("Writing...", task.token)
+        task.onProgress = lambda *args: DemoExporter._updateProgress(dialog, *args)
+        task.onFinished = lambda count: (dialog.reset(), print(f"Exported to {filePath}"))
+        task.onFailed = lambda e: (dialog.reset(), print(f"Export failed: {e}"))
+        task.onCancelled = lambda: (dialog.reset(), print("Export cancelled"))
+        TaskPump.instance().watch(task.start())
@@ -0,0 +1,124 @@
+"""
+DemoPythonExporter - 图到 Python 代码的导出器
+
+把当前图编译为一个 Python 模块（见 Core/PythonCodeGen.py）。
+生成的模块按拓扑顺序直接调用节点逻辑（DemoNode 的取反、DemoLib 的函数），
+没有引脚对象、脏标记和分发，适合在无界面环境中对同一张图反复高速求值。
+只含 DemoNode 的图生成的模块只依赖标准库；含 DemoLib 节点时模块导入 DemoLib，
+运行环境需要安装 DemoPackage 和 uflow（不需要启动编辑器）。
+
+生成模块的用法：
+    import my_graph
+    result = my_graph.evaluate(DemoNode_inp=False)
+    # result: {"DemoNode.out": True}
+
+限制：
+- 图中所有节点类型都必须在 Core/NodeSemantics.py 中注册了语义
+- 只执行从执行链起点可达的 Callable 节点
+
+接口：IDataExporter（只支持导出）
+"""
+
+from datetime import datetime
+from uflow.UI.UIInterfaces import IDataExporter
+from uflow.Core.version import Version
+
+from ..Core.GraphBuilder import activeGraph
+from ..Core.GraphProgram import GraphProgram
+from ..Core.GraphSnapshot import GraphSnapshot
+from ..Core.PythonCodeGen import generateModule
+
+
+class DemoPythonExporter(IDataExporter):
+    """
+    Python 代码导出器
+
+    继承层次：
+    IDataExporter <- DemoPythonExporter
+
+    关键方法：
+    - doExport(): 选择文件并写出生成的模块
+    - compileSnapshot(): 无界面的编译入口
+    """
+
+    def __init__(self):
+        super(DemoPythonExporter, self).__init__()
+
+    @staticmethod
+    def createImporterMenu():
+        """
+        是否在导入菜单中创建入口
+
+        效果：
+        - False: 生成的代码无法再导入为图，只在导出菜单中显示
+        """
+        return False
+
+    @staticmethod
+    def version():
+        """导出器版本（当前 1.0.0）"""
+        return Version(1, 0, 0)
+
+    @staticmethod
+    def toolTip():
+        """导出器的提示文本"""
+        return "Compile graph to a standalone Python module."
+
+    @staticmethod
+    def displayName():
+        """导出器的显示名称"""
+        return "Demo Python module"
+
+    @staticmethod
+    def compileSnapshot(snapshot):
+        """
+        把快照编译为 Python 模块源代码
+
+        参数：
+            snapshot (GraphSnapshot): 图快照
+
+        返回：
+            str: 模块源代码
+
+        异常：
+            UnsupportedNodeError: 存在未注册语义的节点
+            GraphCycleError: 图中存在环
+        """
+        program = GraphProgram.build(snapshot)
+        return generateModule(program, snapshot.name, datetime.now().strftime("%I:%M%p on %B %d, %Y"))
+
+    @staticmethod
+    def doImport(uflowInstance):
+        """不支持导入（createImporterMenu 返回 False，不会被调用）"""
+
+    @staticmethod
+    def doExport(uflowInstance):
+        """
+        执行导出操作
+
+        参数：
+            uflowInstance: uflow 应用实例
+
+        实现步骤：
+        1. 显示文件保存对话框
+        2. 创建图快照并编译
+        3. 写出 .py 文件
+
+        效果：
+        - 编译失败（如存在不支持的节点）时打印原因，不写文件
+        """
+        from qtpy.QtWidgets import QFileDialog
+
+        filePath, _ = QFileDialog.getSaveFileName(
+            None, "Export to Python module", "", "Python Files (*.py);;All Files (*)"
+        )
+        if not filePath:
+            return  # 用户取消
+
+        try:
+            source = DemoPythonExporter.compileSnapshot(GraphSnapshot.capture(activeGraph(uflowInstance)))
+            with open(filePath, "w", encoding="utf-8") as f:
+                f.write(source)
+            print(f"Exported to {filePath}")
+        except Exception as e:
+            print(f"Export failed: {e}")
@@ -107,6 +107,129 @@ class DemoLib(FunctionLibraryBase):
         # - meta: {NodeMeta.CATEGORY: '分类', NodeMeta.KEYWORDS: ['关键词']}
         # ====================================================================
 
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("StringPin", ""),
+        nodeType=NodeTypes.Pure,
+        meta={
+            NodeMeta.CATEGORY: "DemoLib|Data",
+            NodeMeta.KEYWORDS: ["payload", "describe", "DemoPin"],
+        },
+    )
+    def describePayload(payload=("DemoPin", None)):
+        """Describe the value carried by a DemoPin.
+
+        **Parameters:**
+
+        - payload: Custom data from a DemoPin
+
+        **Returns:**
+
+        Text representation of the wrapped value.
+        """
+        # ====================================================================
+        # 开发者注释：
+        # - 使用自定义引脚（Pins/DemoPin.py）作为输入的函数节点示例
+        # - SyntheticGraphs.makeLayered 的 payload 节点（测量自定义类型的序列化开销）
+        # ====================================================================
+        return repr(getattr(payload, "value", payload))
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("StringPin", ""),
+        nodeType=NodeTypes.Callable,
+        meta={
+            NodeMeta.CATEGORY: "DemoLib|Remote",
+            NodeMeta.KEYWORDS: ["server", "remote", "evaluate", "graph"],
+        },
+    )
+    def evaluateOnServer(
+        address=("StringPin", "127.0.0.1:8765"),
+        graph=("StringPin", ""),
+        inputs=("StringPin", "{}"),
+    ):
+        """Evaluate a graph on a local graph server.
+
+        Sends the inputs to a running demo-serve process and returns the results as JSON text.
+
+        **Parameters:**
+
+        - address: Server address, HOST:PORT or unix:PATH
+        - graph: Name of the graph on the server
+        - inputs: JSON object of graph inputs, or a JSON list of objects to evaluate several records
+
+        **Returns:**
+
+        JSON text of the results (a list when inputs is a list), or an empty string on error.
+        """
+        # ====================================================================
+        # 开发者注释：
+        # - 同一进程中的节点共用 getClient(address) 的连接池，连接保持打开
+        # - inputs 是列表时用 evaluateMany() 在一个连接上流水线发送
+        # - 服务端见 Core/GraphServer.py（python -m DemoPackage.Core.GraphServer）
+        # ====================================================================
+        import json
+
+        from ..Core.DemoGraphFormat import encodeValue
+        from ..Core.GraphServer import GraphServerError, getClient
+
+        try:
+            records = json.loads(inputs or "{}")
+            client = getClient(address)
+            if isinstance(records, list):
+                results = client.evaluateMany(graph, records)
+            else:
+                results = client.evaluate(graph, records)
+        except (ValueError, OSError, GraphServerError) as e:
+            print(f"evaluateOnServer: {e}")
+            return ""
+        return json.dumps(encodeValue(results), ensure_ascii=False)
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("AnyPin", None),
+        nodeType=NodeTypes.Callable,
+        meta={
+            NodeMeta.CATEGORY: "DemoLib|Scenarios",
+            NodeMeta.KEYWORDS: ["scenario", "sweep", "parallel", "batch"],
+        },
+    )
+    def scenarioSweep(
+        path=("StringPin", ""),
+        scenarios=("AnyPin", [], {PinSpecifires.STRUCTURE: StructureType.Array}),
+        workers=("IntPin", 0),
+    ):
+        """Evaluate a saved graph for many input scenarios in parallel.
+
+        Each scenario is a dictionary of graph input names to values. The graph is compiled once
+        in every worker process, and the worker processes stay alive between executions.
+
+        **Parameters:**
+
+        - path: Saved graph file (*.demo)
+        - scenarios: List of dictionaries, graph input name to value
+        - workers: Number of worker processes, 0 uses one per CPU core
+
+        **Returns:**
+
+        Dictionary of result name to a column of values, one value per scenario in order.
+        Numeric and boolean columns are packed arrays (booleans as 0 and 1).
+        An empty dictionary on error.
+        """
+        # ====================================================================
+        # 开发者注释：
+        # - 同一文件共用 scenarioPoolForFile() 的进程池，文件修改后自动重新读取（拓扑不变时不重新编译）
+        # - 结果按列返回，数值列和布尔列是 array.array（见 Core/Scenarios.py 的 toColumn）
+        # - 代替 "逐个修改引脚再求值" 的循环：不经过引脚和脏标记传播
+        # ====================================================================
+        from ..Core.Scenarios import scenarioPoolForFile
+
+        try:
+            return scenarioPoolForFile(path, workers or None).evaluate(list(scenarios or []))
+        except Exception as e:
+            print(f"scenarioSweep: {type(e).__name__}: {e}")
+            return {}
+
 
 # ============================================================================
 # 下面是更多函数节点的示例，展示不同的参数和返回值模式
@@ -189,3 +312,29 @@ class DemoLib(FunctionLibraryBase):
 #     - 默认值为空列表 []
 #     """
 #     return sum(arr) if arr else 0
+
+# 示例 5：可取消的耗时节点
+# @staticmethod
+# @IMPLEMENT_NODE(
+#     returns='IntPin',
+#     nodeType=NodeTypes.Callable,
+#     meta={NodeMeta.CATEGORY: 'DemoLib|Array'}
+# )
+# def slowSum(arr=('AnyPin', [], {PinSpecifires.STRUCTURE: StructureType.Array})):
+#     """逐个累加，期间检查取消请求
+#
+#     取消：
+#     - 由 DemoRunChainsShelfTool（Core/ExecScheduler.py）调度执行时，
+#       currentToken() 返回执行链的取消令牌，raiseIfCancelled() 会中止整条执行链
+#     - 后台求值（Core/Evaluation.py）时返回求值令牌；设置了时间预算时是 DeadlineToken，
+#       超过整次求值或单个节点的预算时 raiseIfCancelled() 抛出 BudgetExceeded
+#     - 同步执行时返回永远不会被取消的令牌，节点行为不变
+#     """
+#     from ..Core.Tasks import currentToken
+#     token = currentToken()
+#     total = 0
+#     for i, value in enumerate(arr):
+#         if i % 1000 == 0:
+#             token.raiseIfCancelled()
+#         total += value
+#     return total
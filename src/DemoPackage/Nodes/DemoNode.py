@@ -34,8 +34,20 @@ class DemoNode(NodeBase):
     1. __init__: 创建节点实例，初始化引脚
     2. compute: 每当输入数据变化时被调用
     3. 当节点被删除时，框架自动清理资源
+
+    快照求值（后台求值、批量任务、图服务、编译计划等）：
+    - 节点的语义由 compute 生成（Core/NodeSemantics.py 中的 classSemantics），
+      求值时运行的就是这里的 compute，不需要在别处再写一遍
+    - computeInputs/computeOutputs: compute 读写的数据引脚名称
+    - computeExpression: compute 的表达式写法，编译计划和生成代码把它内联以避免函数调用；
+      修改 compute 时必须同时修改（注册语义时会用 True/False 两个输入核对，不一致时报错），
+      或者设为 None，编译路径改为调用 compute
     """
 
+    computeInputs = ("inp",)
+    computeOutputs = ("out",)
+    computeExpression = "(not {inp})"
+
     def __init__(self, name):
         """
         初始化节点
@@ -228,6 +240,32 @@ class DemoNode(NodeBase):
                 self.out.setData(not inputData)
             except Exception as e:
                 print(f"Error in DemoNode.compute: {e}")
+
+        长时间计算（取消和时间预算）：
+        - 在循环中周期性检查 currentToken()（Core/Tasks.py），用户取消或超过时间预算
+          （首选项 "Evaluation budget"/"Node budget"）时抛出 TaskCancelled/BudgetExceeded，
+          求值中止且不写回任何引脚；不检查令牌的节点只能在返回之后才被中止
+
+            from ..Core.Tasks import currentToken
+            token = currentToken()
+            for i, item in enumerate(items):
+                if i % 1000 == 0:
+                    token.raiseIfCancelled()
+
+        异步计算（I/O 密集的节点，如读文件、调用本地服务）：
+        - 继承 Core/AsyncEvaluation.py 中的 AsyncComputeMixin，compute 可以声明为 async def，
+          框架同步调用时会执行到完成
+        - 声明 computeInputs/computeOutputs 后，按 compute 自动注册协程语义：
+          在快照上求值时（DemoShelfTool）直接 await compute，互不依赖的节点会同时等待
+          （compute 只能通过 self.<引脚名> 的 getData/setData 访问声明过的引脚）：
+
+            class FileReaderNode(AsyncComputeMixin, NodeBase):
+                computeInputs = ("path",)
+                computeOutputs = ("out",)
+
+                async def compute(self, *args, **kwargs):
+                    text = await asyncio.to_thread(readText, self.path.getData())
+                    self.out.setData(text)
         """
         # 获取输入引脚的数据
         inputData = self.inp.getData()
@@ -25,6 +25,8 @@ from qtpy.QtWidgets import *
 from uflow.UI.Widgets.PropertiesFramework import CollapsibleFormWidget
 from uflow.UI.Widgets.PreferencesWindow import CategoryWidgetBase
 
+from ..Core.Codecs import CODECS, LEVELS
+
 
 class DemoPrefs(CategoryWidgetBase):
     """
@@ -87,6 +89,37 @@ class DemoPrefs(CategoryWidgetBase):
         # 第一个参数是标签文本，第二个参数是控件
         demoSection.addWidget("Example property", self.exampleProperty)
 
+        # 导出压缩设置（DemoExporter 使用）
+        self.exportCodec = QComboBox()
+        self.exportCodec.addItems(list(CODECS))
+        self.exportCodec.currentTextChanged.connect(self._onCodecChanged)
+        demoSection.addWidget("Export codec", self.exportCodec)
+
+        self.exportLevel = QSpinBox()
+        demoSection.addWidget("Compression level", self.exportLevel)
+
+        # 持久化结果缓存（DemoShelfTool 后台求值使用，见 Core/ResultCache.py）
+        self.resultCache = QCheckBox()
+        demoSection.addWidget("Result cache", self.resultCache)
+
+        self.resultCacheSize = QSpinBox()
+        self.resultCacheSize.setRange(16, 65536)
+        self.resultCacheSize.setSuffix(" MB")
+        demoSection.addWidget("Result cache size", self.resultCacheSize)
+
+        # 时间预算（DemoShelfTool 后台求值和 DemoRunChainsShelfTool 执行链使用，0 表示不限制）
+        self.evaluationBudget = QDoubleSpinBox()
+        self.evaluationBudget.setRange(0.0, 86400.0)
+        self.evaluationBudget.setSuffix(" s")
+        self.evaluationBudget.setSpecialValueText("No limit")
+        demoSection.addWidget("Evaluation budget", self.evaluationBudget)
+
+        self.nodeBudget = QDoubleSpinBox()
+        self.nodeBudget.setRange(0.0, 86400.0)
+        self.nodeBudget.setSuffix(" s")
+        self.nodeBudget.setSpecialValueText("No limit")
+        demoSection.addWidget("Node budget", self.nodeBudget)
+
         # 将设置区域添加到主布局
         self.layout.addWidget(demoSection)
 
@@ -119,6 +152,18 @@ class DemoPrefs(CategoryWidgetBase):
         #
         # self.layout.addWidget(anotherSection)
 
+    def _onCodecChanged(self, codec):
+        """
+        切换压缩编码时更新级别范围
+
+        参数：
+            codec (str): 新的编码名称
+        """
+        low, high, default = LEVELS.get(codec, LEVELS["none"])
+        self.exportLevel.setRange(low, high)
+        self.exportLevel.setValue(default)
+        self.exportLevel.setEnabled(codec != "none")
+
     def initDefaults(self, settings):
         """
         初始化默认设置值
@@ -144,6 +189,12 @@ class DemoPrefs(CategoryWidgetBase):
         - 设置 "ExampleProperty" 的默认值为 "property value"
         """
         settings.setValue("ExampleProperty", "property value")
+        settings.setValue("ExportCodec", "zlib")
+        settings.setValue("ExportLevel", LEVELS["zlib"][2])
+        settings.setValue("ResultCache", False)
+        settings.setValue("ResultCacheSize", 256)
+        settings.setValue("EvaluationBudget", 0.0)
+        settings.setValue("NodeBudget", 0.0)
 
         # 示例：设置更多默认值
         # settings.setValue("EnableFeature", True)
@@ -176,6 +227,12 @@ class DemoPrefs(CategoryWidgetBase):
         - 将 exampleProperty 文本框的值保存到 "ExampleProperty" 设置
         """
         settings.setValue("ExampleProperty", self.exampleProperty.text())
+        settings.setValue("ExportCodec", self.exportCodec.currentText())
+        settings.setValue("ExportLevel", self.exportLevel.value())
+        settings.setValue("ResultCache", self.resultCache.isChecked())
+        settings.setValue("ResultCacheSize", self.resultCacheSize.value())
+        settings.setValue("EvaluationBudget", self.evaluationBudget.value())
+        settings.setValue("NodeBudget", self.nodeBudget.value())
 
         # 示例：保存更多设置
         # settings.setValue("EnableFeature", self.enableFeature.isChecked())
@@ -210,6 +267,15 @@ class DemoPrefs(CategoryWidgetBase):
         # settings.value() 返回保存的值，如果不存在则返回 None
         self.exampleProperty.setText(settings.value("ExampleProperty"))
 
+        codec = settings.value("ExportCodec", "zlib")
+        self.exportCodec.setCurrentIndex(max(0, self.exportCodec.findText(codec)))
+        self._onCodecChanged(self.exportCodec.currentText())
+        self.exportLevel.setValue(settings.value("ExportLevel", LEVELS[self.exportCodec.currentText()][2], type=int))
+        self.resultCache.setChecked(settings.value("ResultCache", False, type=bool))
+        self.resultCacheSize.setValue(settings.value("ResultCacheSize", 256, type=int))
+        self.evaluationBudget.setValue(settings.value("EvaluationBudget", 0.0, type=float))
+        self.nodeBudget.setValue(settings.value("NodeBudget", 0.0, type=float))
+
         # 示例：加载更多设置
         # enableFeature = settings.value("EnableFeature", True, type=bool)
         # self.enableFeature.setChecked(enableFeature)
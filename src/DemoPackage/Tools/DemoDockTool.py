@@ -24,14 +24,26 @@ DockTool vs ShelfTool：
 """
 
 from qtpy import QtGui
+from qtpy.QtWidgets import QTabWidget
 from uflow.UI.Tool.Tool import DockTool
 
+from ..Core.GraphBuilder import activeGraph
+from ..UI.DataViewerWidget import DataViewerWidget
+from ..UI.MemoryWidget import MemoryWidget
+from ..UI.ProfilerWidget import ProfilerWidget
+from ..UI.TraceWidget import TraceWidget
+
 
 class DemoDockTool(DockTool):
     """
     演示停靠工具
 
     提供一个可停靠的面板示例，可以从菜单打开并停靠在主窗口周围。
+    面板内容是一组标签页，每个标签页是一个独立的调试/分析视图：
+    - Profiler: 节点性能分析（见 UI/ProfilerWidget.py）
+    - Trace: 执行追踪记录（见 UI/TraceWidget.py）
+    - Memory: 引脚数据内存占用（见 UI/MemoryWidget.py）
+    - Data: 虚拟化的引脚数据查看器（见 UI/DataViewerWidget.py）
 
     继承层次：
     QWidget <- DockTool <- DemoDockTool
@@ -64,11 +76,22 @@ class DemoDockTool(DockTool):
         - 设置样式
 
         效果：
-        - 创建一个空白的停靠面板
+        - 创建带标签页的停靠面板
         - 可以添加自定义 UI（见下方示例）
         """
         super(DemoDockTool, self).__init__()
 
+        self.tabs = QTabWidget()
+        self.profilerWidget = ProfilerWidget()
+        self.tabs.addTab(self.profilerWidget, "Profiler")
+        self.traceWidget = TraceWidget()
+        self.tabs.addTab(self.traceWidget, "Trace")
+        self.memoryWidget = MemoryWidget(self._activeGraph)
+        self.tabs.addTab(self.memoryWidget, "Memory")
+        self.dataWidget = DataViewerWidget(self._selectedNodes)
+        self.tabs.addTab(self.dataWidget, "Data")
+        self.setWidget(self.tabs)
+
         # ====================================================================
         # 以下是 UI 构建示例（已注释）
         # ====================================================================
@@ -89,6 +112,8 @@ class DemoDockTool(DockTool):
         # layout.addWidget(btn)
 
         # 示例 2：添加列表控件
+        # 注意：QListWidget/QTableWidget 为每个条目创建一个对象，只适合少量数据；
+        # 大数据请使用惰性的 QAbstractTableModel（见 UI/DataViewerWidget.py）
         # from qtpy.QtWidgets import QListWidget
         #
         # self.listWidget = QListWidget()
@@ -125,6 +150,34 @@ class DemoDockTool(DockTool):
     #     # 更新数据
     #     # self.refreshData()
 
+    def onDestroy(self):
+        """
+        工具关闭时调用
+
+        作用：
+        - 停止性能分析、卸载插桩钩子、恢复节点颜色
+        - 停止追踪面板的状态刷新（追踪记录本身由 DemoTraceShelfTool 共享，不在这里停止）
+        - 取消内存扫描并释放统计结果
+        - 释放数据查看器持有的引脚数据
+        """
+        self.profilerWidget.shutdown()
+        self.traceWidget.shutdown()
+        self.memoryWidget.shutdown()
+        self.dataWidget.shutdown()
+        super(DemoDockTool, self).onDestroy()
+
+    def _activeGraph(self):
+        """当前活动图（工具尚未关联 uflow 实例时返回 None）"""
+        if self.uflowInstance is None:
+            return None
+        return activeGraph(self.uflowInstance)
+
+    def _selectedNodes(self):
+        """画布上选中的核心节点"""
+        if self.uflowInstance is None:
+            return []
+        return [uiNode._rawNode for uiNode in self.uflowInstance.getCanvas().selectedNodes()]
+
     @staticmethod
     def getIcon():
         """
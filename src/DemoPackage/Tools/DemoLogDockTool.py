@@ -0,0 +1,54 @@
+"""
+DemoLogDockTool - 节点输出控制台停靠面板
+
+捕获图执行期间的节点输出（demoLibGreet 的 print、节点警告、异常）
+并以限速方式显示（见 UI/LogConsoleWidget.py 和 Core/LogCapture.py）。
+
+节点每秒打印上千行时，直接渲染到文本控件或终端会成为图执行的瓶颈；
+这里输出只写入环形缓冲区，界面按固定帧率批量追加，重复行合并显示，
+并可以按节点过滤。
+"""
+
+from qtpy import QtGui
+from uflow.UI.Tool.Tool import DockTool
+
+from ..UI.LogConsoleWidget import LogConsoleWidget
+
+
+class DemoLogDockTool(DockTool):
+    """
+    节点输出控制台
+
+    继承层次：
+    QWidget <- DockTool <- DemoLogDockTool
+    """
+
+    def __init__(self):
+        super(DemoLogDockTool, self).__init__()
+        self.console = LogConsoleWidget()
+        self.setWidget(self.console)
+
+    def onDestroy(self):
+        """
+        工具关闭时调用
+
+        作用：
+        - 停止捕获并恢复 sys.stdout/sys.stderr 等钩子
+        """
+        self.console.shutdown()
+        super(DemoLogDockTool, self).onDestroy()
+
+    @staticmethod
+    def getIcon():
+        """工具图标（砖块图标）"""
+        return QtGui.QIcon(":brick.png")
+
+    @staticmethod
+    def toolTip():
+        """工具提示"""
+        return "Captured node output (prints, warnings, errors)"
+
+    @staticmethod
+    def name():
+        """工具的唯一名称"""
+        return "DemoLogDockTool"
@@ -0,0 +1,81 @@
+"""
+DemoOptimizeShelfTool - 图优化按钮
+
+分析当前图并预览优化结果（见 Core/GraphOptimizer.py）：
+死节点消除、常量折叠、DemoNode 取反链合并和纯节点融合。
+
+使用方式：
+- 点击按钮，对话框显示将删除的节点数和估算的加速比（预览，不修改图）
+- 点击 "Apply" 原地应用，整个优化记录为一条撤销历史
+- 画布上选中的节点视为需要的输出：不会被删除，只有选中了节点时才执行死节点消除
+  （输出到达不了选中节点和有副作用节点的节点被删除）；没有选中时所有图的结果都保留
+"""
+
+from qtpy import QtGui
+from qtpy.QtWidgets import QMessageBox
+from uflow.UI.Tool.Tool import ShelfTool
+
+from ..Core.GraphBuilder import activeGraph
+from ..Core.GraphOptimizer import applyOptimization, optimizeSnapshot
+from ..Core.GraphSnapshot import GraphSnapshot
+
+
+class DemoOptimizeShelfTool(ShelfTool):
+    """
+    图优化按钮
+
+    继承层次：
+    ShelfTool <- DemoOptimizeShelfTool
+    """
+
+    def __init__(self):
+        super(DemoOptimizeShelfTool, self).__init__()
+
+    @staticmethod
+    def toolTip():
+        """鼠标悬停提示"""
+        return "Optimize the active graph (dead nodes, constant folding, negation chains)"
+
+    @staticmethod
+    def getIcon():
+        """工具图标（砖块图标）"""
+        return QtGui.QIcon(":brick.png")
+
+    @staticmethod
+    def name():
+        """工具的唯一名称"""
+        return "DemoOptimizeShelfTool"
+
+    def do(self):
+        """
+        预览优化结果，确认后原地应用
+
+        效果：
+        - 控制台打印优化报告
+        - 没有可优化的内容时只显示报告
+        """
+        from uflow.UI.EditorHistory import EditorHistory
+
+        if self.uflowInstance is None:
+            return
+        graph = activeGraph(self.uflowInstance)
+        keep = [str(uiNode.uid) for uiNode in self.uflowInstance.getCanvas().selectedNodes()]
+        try:
+            result = optimizeSnapshot(GraphSnapshot.capture(graph), keep=keep)
+        except Exception as e:
+            print(f"Optimization failed: {e}")
+            return
+
+        summary = result.report.summary()
+        print(summary)
+        if result.isEmpty():
+            QMessageBox.information(None, self.name(), f"Nothing to optimize.\n\n{summary}")
+            return
+        answer = QMessageBox.question(
+            None, self.name(), f"{summary}\n\nApply to the graph?", QMessageBox.Apply | QMessageBox.Cancel
+        )
+        if answer != QMessageBox.Apply:
+            return
+        applyOptimization(graph, result, self.uflowInstance)
+        EditorHistory().saveState("Optimize graph", modify=True)
+        print(f"Optimized graph: removed {result.report.removed} nodes")
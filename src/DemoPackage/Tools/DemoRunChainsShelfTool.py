@@ -0,0 +1,109 @@
+"""
+DemoRunChainsShelfTool - 按时间片执行执行链
+
+把执行链交给协作式调度器（见 Core/ExecScheduler.py）：
+每帧只执行约 8 毫秒的节点，其余时间交还 Qt 事件循环，长执行链运行期间编辑器保持响应。
+
+使用方式：
+- 选中节点后点击：从每个选中的 Callable 节点开始执行（先选中的优先级更高）
+- 没有选中节点时点击：从所有输入执行引脚没有连接的 Callable 节点开始执行
+- 执行期间再次点击：取消所有执行链
+- 首选项 "Evaluation budget"/"Node budget" 限制每条执行链和每个节点的耗时，超过时执行链失败并在控制台报告
+"""
+
+import time
+
+from qtpy import QtGui
+from uflow.UI.Tool.Tool import ShelfTool
+
+from ..Core.ExecScheduler import execScheduler
+from ..Core.GraphBuilder import activeGraph
+from ..Core.Tasks import CancellationToken
+from ..UI.TaskPump import TaskPump
+from .DemoShelfTool import DemoShelfTool
+
+
+def _startNodes(graph):
+    """输入执行引脚全部没有连接的 Callable 节点（执行链的起点）"""
+    starts = []
+    for node in graph.getNodesList():
+        execInputs = [p for p in node.orderedInputs.values() if p.isExec()]
+        if execInputs and not any(p.hasConnections() for p in execInputs):
+            starts.append(node)
+    return starts
+
+
+class DemoRunChainsShelfTool(ShelfTool):
+    """
+    执行链运行按钮
+
+    继承层次：
+    ShelfTool <- DemoRunChainsShelfTool
+    """
+
+    def __init__(self):
+        super(DemoRunChainsShelfTool, self).__init__()
+        self._token = None
+
+    @staticmethod
+    def toolTip():
+        """鼠标悬停提示"""
+        return "Run exec chains time-sliced (click again to cancel)"
+
+    @staticmethod
+    def getIcon():
+        """工具图标（砖块图标）"""
+        return QtGui.QIcon(":brick.png")
+
+    @staticmethod
+    def name():
+        """工具的唯一名称"""
+        return "DemoRunChainsShelfTool"
+
+    def do(self):
+        """
+        开始执行（或取消正在进行的执行）
+
+        效果：
+        - 每条执行链完成、失败或取消时在控制台打印步骤数
+        - 全部结束后打印总耗时
+        """
+        scheduler = execScheduler()
+        if self._token is not None and scheduler.hasTasks():
+            self._token.cancel()
+            print("Cancelling exec chains...")
+            return
+        if self.uflowInstance is None:
+            return
+
+        selected = [uiNode._rawNode for uiNode in self.uflowInstance.getCanvas().selectedNodes()]
+        starts = [n for n in selected if any(p.isExec() for p in n.orderedInputs.values())]
+        if not starts:
+            starts = _startNodes(activeGraph(self.uflowInstance))
+        if not starts:
+            print("No exec chains to run")
+            return
+
+        # 所有执行链共享一个令牌，再次点击时一起取消
+        token = self._token = CancellationToken()
+        budget, nodeBudget = DemoShelfTool.budgets()
+        started = time.perf_counter()
+        pending = [len(starts)]
+
+        def done(task, outcome):
+            print(f"{task.name}: {outcome} after {task.steps} steps")
+            pending[0] -= 1
+            if pending[0] == 0:
+                print(f"Exec chains finished in {time.perf_counter() - started:.3f}s")
+                if self._token is token:
+                    self._token = None
+
+        for index, node in enumerate(starts):
+            task = scheduler.submit(node, priority=len(starts) - index, token=token, budget=budget, nodeBudget=nodeBudget)
+            task.onFinished = lambda task=task: done(task, "finished")
+            task.onFailed = lambda error, task=task: done(task, f"failed ({error})")
+            task.onCancelled = lambda task=task: done(task, "cancelled")
+
+        pump = TaskPump.instance()
+        if not pump.isScheduled(scheduler):
+            pump.schedule(scheduler)
@@ -27,12 +27,21 @@ from uflow.Core.Common import Direction
 
 from qtpy import QtGui
 
+from ..Core.Evaluation import applyOutputValues, evaluateProgram
+from ..Core.GraphBuilder import activeGraph
+from ..Core.GraphProgram import GraphProgram
+from ..Core.GraphSnapshot import GraphSnapshot
+from ..Core.ResultCache import sharedCache
+from ..Core.Tasks import BackgroundTask
+from ..UI.TaskPump import TaskPump
+
 
 class DemoShelfTool(ShelfTool):
     """
     演示工具栏按钮
 
-    提供一个简单的工具栏按钮示例，点击时在控制台打印 "Greet!"。
+    提供一个简单的工具栏按钮示例，点击时在控制台打印 "Greet!"，
+    然后在工作线程中求值当前图（见 evaluateInBackground）。
 
     继承层次：
     ShelfTool <- DemoShelfTool
@@ -57,6 +66,8 @@ class DemoShelfTool(ShelfTool):
         - 大部分逻辑应在 do() 方法中实现
         """
         super(DemoShelfTool, self).__init__()
+        # 正在进行的后台求值（同一时间只运行一个）
+        self._task = None
 
     @staticmethod
     def toolTip():
@@ -141,11 +152,13 @@ class DemoShelfTool(ShelfTool):
 
         效果：
         - 点击按钮时在控制台打印 "Greet!"
+        - 在工作线程中求值当前图，结果写回引脚（见 evaluateInBackground）
 
         示例用法（已注释）见下方
         """
-        # 当前功能：简单打印
+        # 当前功能：简单打印 + 后台求值
         print("Greet!")
+        self.evaluateInBackground()
 
         # ====================================================================
         # 以下是更多操作示例（已注释）
@@ -172,6 +185,8 @@ class DemoShelfTool(ShelfTool):
         # QMessageBox.information(None, "Demo Tool", "Hello from DemoShelfTool!")
 
         # 示例 5：执行图
+        # 注意：graph.evaluate() 在界面线程中执行所有节点，长时间求值会冻结编辑器，
+        # 实际使用请参考 evaluateInBackground()
         # graph = uflowInstance.graphManager.activeGraph()
         # if graph:
         #     graph.evaluate()
@@ -181,6 +196,7 @@ class DemoShelfTool(ShelfTool):
         # uflowInstance.currentSoftware.saveGraph()
 
         # 示例 7：创建多个节点并连接它们
+        # 批量创建大量节点（一条撤销历史、一次重绘）见 DemoStressShelfTool.buildBatched()
         # graph = uflowInstance.graphManager.activeGraph()
         # if graph:
         #     # 创建两个节点
@@ -206,3 +222,128 @@ class DemoShelfTool(ShelfTool):
         # print(f"Selected {len(selected_nodes)} nodes")
         # for ui_node in selected_nodes:
         #     print(f"  - {ui_node.getName()}")
+
+    @staticmethod
+    def resultCache():
+        """
+        根据首选项获取结果缓存
+
+        返回：
+            ResultCache: 首选项 "Result cache" 开启时返回共享的缓存，否则返回 None
+
+        说明：
+        - 缓存数据库位于 defaultCachePath()，跨会话保留
+        - 大小上限来自首选项 "Result cache size"（MB）
+        """
+        from uflow.ConfigManager import ConfigManager
+
+        enabled = ConfigManager().getPrefsValue("PREFS", "DemoPrefs/ResultCache")
+        if str(enabled).lower() not in ("true", "1"):
+            return None
+        try:
+            size = int(ConfigManager().getPrefsValue("PREFS", "DemoPrefs/ResultCacheSize"))
+        except (TypeError, ValueError):
+            size = 256
+        return sharedCache(maxBytes=max(1, size) * 1024 * 1024)
+
+    @staticmethod
+    def budgets():
+        """
+        根据首选项获取时间预算
+
+        返回：
+            tuple: (整次求值的预算, 每个节点的预算)，单位秒；None 表示不限制
+
+        说明：
+        - 来自首选项 "Evaluation budget"/"Node budget"，0 表示不限制
+        - DemoRunChainsShelfTool 对执行链使用同样的预算
+        """
+        from uflow.ConfigManager import ConfigManager
+
+        result = []
+        for key in ("DemoPrefs/EvaluationBudget", "DemoPrefs/NodeBudget"):
+            try:
+                seconds = float(ConfigManager().getPrefsValue("PREFS", key))
+            except (TypeError, ValueError):
+                seconds = 0.0
+            result.append(seconds if seconds > 0 else None)
+        return tuple(result)
+
+    def evaluateInBackground(self):
+        """
+        在工作线程中求值当前图
+
+        实现步骤：
+        1. 在主线程中创建图快照（GraphSnapshot.capture，只复制纯数据）
+        2. 在工作线程中用 GraphProgram 求值快照（Core/Evaluation.py）
+        3. 求值完成后在主线程中把结果写回对应的输出引脚
+
+        只求值数据节点：执行链（Callable 节点，如 demoLibGreet、evaluateOnServer）不是由这个按钮触发的，
+        不在工作线程中运行，读取它们输出的下游节点使用引脚的当前值。
+        没有注册语义的节点（Core/NodeSemantics.py）被跳过并在控制台逐个列出，其余节点照常求值。
+
+        首选项开启结果缓存时，之前计算过的子图直接使用缓存的结果（Core/ResultCache.py）
+
+        首选项设置了时间预算时（budgets()），超过整次求值或单个节点的预算会中止求值并在控制台报告；
+        不响应令牌的失控节点在超时后被放弃（BackgroundTask），编辑器可以继续使用
+
+        效果：
+        - 求值期间编辑器保持响应，显示进度对话框，可随时取消
+        - 取消、失败或超过预算时不修改图
+        - 上一次求值还没完成时再次点击不会重复启动
+        """
+        from qtpy.QtWidgets import QProgressDialog
+
+        if self.uflowInstance is None or self._task is not None:
+            return
+        graph = activeGraph(self.uflowInstance)
+        if graph is None:
+            return
+        snapshot = GraphSnapshot.capture(graph)
+
+        cache = self.resultCache()
+        budget, nodeBudget = self.budgets()
+
+        def evaluate(token, report):
+            program = GraphProgram.build(snapshot, execRoots=(), skipUnsupported=True)
+            return program.skipped, evaluateProgram(program, token, report, cache, nodeBudget=nodeBudget)
+
+        task = BackgroundTask(
+            evaluate,
+            name="DemoEvaluate",
+            budget=budget,
+        )
+        dialog = QProgressDialog("Evaluating...", "Cancel", 0, 100)
+        dialog.setWindowTitle(self.name())
+        dialog.setMinimumDuration(300)
+        dialog.canceled.connect(task.token.cancel)
+
+        def onProgress(done, total, message=""):
+            if total > 0:
+                dialog.setValue(int(done * 100 / total))
+                dialog.setLabelText(f"{message} {done}/{total}")
+
+        def done(message):
+            self._task = None
+            dialog.reset()
+            print(message)
+
+        def onFinished(result):
+            unsupported, values = result
+            applied, skipped = applyOutputValues(graph, values)
+            for uid, reason in unsupported.items():
+                node = snapshot.getNode(uid)
+                print(f"Skipped node {node.name!r} ({node.type}): {reason}")
+            message = f"Evaluated {len(snapshot.nodes) - len(unsupported)} nodes, updated {applied} pins"
+            if unsupported:
+                message += f", skipped {len(unsupported)} unsupported nodes"
+            if skipped:
+                message += f" ({skipped} pins removed during evaluation)"
+            done(message)
+
+        task.onProgress = onProgress
+        task.onFinished = onFinished
+        task.onFailed = lambda e: done(f"Evaluation failed: {e}")
+        task.onCancelled = lambda: done("Evaluation cancelled")
+        self._task = task
+        TaskPump.instance().watch(task.start())
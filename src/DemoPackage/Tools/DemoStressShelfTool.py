@@ -0,0 +1,111 @@
+"""
+DemoStressShelfTool - 压力测试图生成按钮
+
+在当前图中生成大规模的合成图（DemoNode 链、树、随机 DAG），
+用于复现编辑器和求值器的扩展性问题。
+
+批量创建：
+- 节点和连接直接创建在核心图上（graph.addNode、connectPins），不经过画布：
+  画布的 createNode/connectPins 每次调用都会记录一条撤销历史
+- 全部创建完成后一次性创建 UI（canvas.createWrappersForGraph），关闭画布刷新，只重绘一次
+- 整个生成过程只记录一条撤销历史，一次撤销即可删除全部生成的节点
+- 创建失败时删除已创建的节点，不留下半张图
+- 完成后在控制台报告快照生成和创建耗时
+"""
+
+import time
+
+from qtpy import QtGui
+from uflow.UI.Tool.Tool import ShelfTool
+
+from ..Core.GraphBuilder import GraphBuilder, activeGraph
+from ..UI.StressGraphDialog import StressGraphDialog
+
+
+class DemoStressShelfTool(ShelfTool):
+    """
+    压力测试图生成按钮
+
+    继承层次：
+    ShelfTool <- DemoStressShelfTool
+    """
+
+    def __init__(self):
+        super(DemoStressShelfTool, self).__init__()
+
+    @staticmethod
+    def toolTip():
+        """鼠标悬停提示"""
+        return "Generate a large synthetic graph (chains, trees, random DAGs)"
+
+    @staticmethod
+    def getIcon():
+        """工具图标（砖块图标）"""
+        return QtGui.QIcon(":brick.png")
+
+    @staticmethod
+    def name():
+        """工具的唯一名称"""
+        return "DemoStressShelfTool"
+
+    def do(self):
+        """
+        显示参数对话框并生成图
+
+        效果：
+        - 生成的节点放在现有节点的右侧，不与现有节点重叠
+        """
+        if self.uflowInstance is None:
+            return
+        dialog = StressGraphDialog()
+        if not dialog.exec_():
+            return
+
+        start = time.perf_counter()
+        snapshot = dialog.snapshot()
+        generated = time.perf_counter() - start
+
+        graph = activeGraph(self.uflowInstance)
+        right = max((node.x for node in graph.getNodesList()), default=-400.0)
+        # 不传 uflow 实例：在核心图上创建，不经过画布（见 buildBatched）
+        builder = GraphBuilder(None, snapshot, graph=graph, offset=(right + 400.0, 0.0))
+        elapsed = self.buildBatched(builder)
+        if elapsed is None:
+            return
+        nodes, connections = len(snapshot.nodes), len(snapshot.connections)
+        print(
+            f"Generated {nodes} nodes and {connections} connections: "
+            f"snapshot {generated * 1000:.1f} ms, creation {elapsed * 1000:.1f} ms "
+            f"({nodes / max(elapsed, 1e-9):.0f} nodes/s)"
+        )
+
+    def buildBatched(self, builder):
+        """
+        一次性执行重建器：在核心图上创建节点和连接，然后一次性创建 UI，记录一条撤销历史并重绘一次
+
+        参数：
+            builder (GraphBuilder): 要执行的重建器（没有 uflow 实例，目标为 builder.graph）
+
+        返回：
+            float: 创建耗时（秒），失败时返回 None
+        """
+        from uflow.UI.EditorHistory import EditorHistory
+
+        canvas = self.uflowInstance.getCanvas()
+        canvas.setUpdatesEnabled(False)
+        start = time.perf_counter()
+        try:
+            for _ in builder.build():
+                pass
+            # 为新建的核心节点和连接创建 UI（已有 UI 的节点会被跳过）
+            canvas.createWrappersForGraph(builder.graph)
+        except Exception as e:
+            builder.rollback()
+            print(f"Stress graph generation failed: {e}")
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            canvas.setUpdatesEnabled(True)
+            canvas.viewport().update()
+        EditorHistory().saveState("Generate stress graph", modify=True)
+        return elapsed
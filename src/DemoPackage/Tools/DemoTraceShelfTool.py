@@ -0,0 +1,65 @@
+"""
+DemoTraceShelfTool - 执行追踪开关按钮
+
+工具栏上的追踪开关：
+- 第一次点击：清空缓冲区并开始记录执行追踪
+- 再次点击：停止记录，选择文件保存为 Chrome trace-event JSON
+
+与 DemoDockTool 的 "Trace" 标签页控制的是同一个记录器（见 Core/Tracing.py）。
+"""
+
+from qtpy import QtGui
+from qtpy.QtWidgets import QFileDialog
+from uflow.UI.Tool.Tool import ShelfTool
+
+from ..Core.Tracing import traceRecorder
+
+
+class DemoTraceShelfTool(ShelfTool):
+    """
+    追踪开关按钮
+
+    继承层次：
+    ShelfTool <- DemoTraceShelfTool
+    """
+
+    def __init__(self):
+        super(DemoTraceShelfTool, self).__init__()
+
+    @staticmethod
+    def toolTip():
+        """鼠标悬停提示"""
+        return "Start/stop recording an execution trace (Chrome trace-event JSON)"
+
+    @staticmethod
+    def getIcon():
+        """工具图标（砖块图标）"""
+        return QtGui.QIcon(":brick.png")
+
+    @staticmethod
+    def name():
+        """工具的唯一名称"""
+        return "DemoTraceShelfTool"
+
+    def do(self):
+        """
+        切换记录状态
+
+        效果：
+        - 未在记录：清空并开始记录
+        - 正在记录：停止记录并保存追踪文件
+        """
+        recorder = traceRecorder()
+        if not recorder.isRecording():
+            recorder.clear()
+            recorder.start()
+            print("Trace recording started")
+            return
+
+        recorder.stop()
+        filePath, _ = QFileDialog.getSaveFileName(None, "Save trace", "trace.json", "Trace Files (*.json)")
+        if filePath:
+            count = recorder.dump(filePath)
+            print(f"Saved {count} trace events to {filePath}")
+        else:
+            print(f"Trace recording stopped ({recorder.eventCount()} events kept)")
@@ -0,0 +1,260 @@
+"""
+DataViewerWidget - 引脚数据查看面板
+
+DemoDockTool 中的 "Data" 标签页，用于查看选中节点上某个引脚的大数据
+（例如百万行的数组）。
+
+虚拟化：
+- QListWidget/QTableWidget 为每个单元格创建一个条目对象，大数据时会卡死
+- 这里使用惰性的 QAbstractTableModel：只记录已加载的行数，
+  视图滚动到底部时通过 canFetchMore/fetchMore 按批增加行数
+- 单元格文字只在视图请求（可见）时由 DataView 按行读取并格式化，不复制数据
+
+搜索：
+- 在主线程中按时间片逐行查找（TimeSlicedJob + TaskPump），找到后滚动到该行
+"""
+
+import weakref
+
+from qtpy import QtCore
+from qtpy.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QSpinBox,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..Core.DataView import FORMAT_STYLES, DataView, formatCell, iterSearch
+from ..Core.Tasks import TimeSlicedJob
+from .TaskPump import TaskPump
+
+
+class LazyTableModel(QtCore.QAbstractTableModel):
+    """
+    惰性表格模型
+
+    关键方法：
+    - setView(view): 替换数据
+    - ensureLoaded(row): 确保某一行已加载（跳转到搜索结果时使用）
+    """
+
+    #: 每次 fetchMore 增加的行数
+    BATCH = 1000
+
+    def __init__(self, parent=None):
+        super(LazyTableModel, self).__init__(parent)
+        self.view = DataView(None)
+        self.style = "Auto"
+        self.precision = 6
+        self._loaded = 0
+
+    def setView(self, view):
+        """
+        替换数据
+
+        参数：
+            view (DataView): 表格视图
+        """
+        self.beginResetModel()
+        self.view = view
+        self._loaded = min(self.BATCH, view.rowCount())
+        self.endResetModel()
+
+    def setFormat(self, style, precision):
+        """
+        修改单元格格式（只刷新可见单元格）
+
+        参数：
+            style (str): FORMAT_STYLES 之一
+            precision (int): 浮点数精度
+        """
+        self.style = style
+        self.precision = precision
+        if self._loaded:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, self.columnCount() - 1))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.view.columnCount()
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self._loaded < self.view.rowCount()
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        self.ensureLoaded(self._loaded + self.BATCH - 1)
+
+    def ensureLoaded(self, row):
+        """确保第 row 行已加载"""
+        target = min(row + 1, self.view.rowCount())
+        if target > self._loaded:
+            self.beginInsertRows(QtCore.QModelIndex(), self._loaded, target - 1)
+            self._loaded = target
+            self.endInsertRows()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.view.header(section)
+        return str(section)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role not in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return None
+        try:
+            value = self.view.cell(index.row(), index.column())
+        except (IndexError, KeyError):
+            return "<changed>"  # 数据在查看期间变短或被修改
+        if role == QtCore.Qt.ToolTipRole:
+            return type(value).__name__
+        return formatCell(value, self.style, self.precision)
+
+
+class DataViewerWidget(QWidget):
+    """
+    引脚数据查看面板
+
+    关键方法：
+    - pickSelection(): 从画布选中的节点读取引脚列表
+    - showPin(index): 显示某个引脚的数据
+    - findNext(): 查找下一个匹配的行
+    """
+
+    def __init__(self, selectedNodes, parent=None):
+        """
+        初始化面板
+
+        参数：
+            selectedNodes: 无参数函数，返回画布上选中的核心节点列表
+        """
+        super(DataViewerWidget, self).__init__(parent)
+        self.selectedNodes = selectedNodes
+        self._pins = []
+        self._search = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        toolbar = QHBoxLayout()
+        pickButton = QPushButton("From selection")
+        pickButton.clicked.connect(self.pickSelection)
+        self.pinCombo = QComboBox()
+        self.pinCombo.setMinimumContentsLength(16)
+        self.pinCombo.currentIndexChanged.connect(self.showPin)
+        refreshButton = QPushButton("Refresh")
+        refreshButton.clicked.connect(lambda: self.showPin(self.pinCombo.currentIndex()))
+        self.styleCombo = QComboBox()
+        self.styleCombo.addItems(FORMAT_STYLES)
+        self.styleCombo.currentTextChanged.connect(self._onFormatChanged)
+        self.precisionSpin = QSpinBox()
+        self.precisionSpin.setRange(0, 17)
+        self.precisionSpin.setValue(6)
+        self.precisionSpin.valueChanged.connect(self._onFormatChanged)
+        toolbar.addWidget(pickButton)
+        toolbar.addWidget(self.pinCombo)
+        toolbar.addWidget(refreshButton)
+        toolbar.addWidget(self.styleCombo)
+        toolbar.addWidget(self.precisionSpin)
+        layout.addLayout(toolbar)
+
+        searchBar = QHBoxLayout()
+        self.searchEdit = QLineEdit()
+        self.searchEdit.setPlaceholderText("Search...")
+        self.searchEdit.returnPressed.connect(self.findNext)
+        findButton = QPushButton("Find next")
+        findButton.clicked.connect(self.findNext)
+        self.statusLabel = QLabel()
+        searchBar.addWidget(self.searchEdit)
+        searchBar.addWidget(findButton)
+        searchBar.addWidget(self.statusLabel)
+        layout.addLayout(searchBar)
+
+        self.model = LazyTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        # 固定行高：避免视图为计算行高而读取所有行
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        layout.addWidget(self.table)
+
+    def pickSelection(self):
+        """从画布选中的节点读取数据引脚列表"""
+        self._pins = []
+        self.pinCombo.blockSignals(True)
+        self.pinCombo.clear()
+        for node in self.selectedNodes():
+            for prefix, pins in (("out", node.orderedOutputs), ("in", node.orderedInputs)):
+                for pin in pins.values():
+                    if pin.isExec():
+                        continue
+                    self._pins.append(weakref.ref(pin))
+                    self.pinCombo.addItem(f"{node.getName()}.{pin.name} ({prefix})")
+        self.pinCombo.blockSignals(False)
+        self.showPin(0)
+
+    def showPin(self, index):
+        """
+        显示某个引脚的数据
+
+        参数：
+            index (int): 引脚列表中的位置
+        """
+        self.cancelSearch()
+        pin = self._pins[index]() if 0 <= index < len(self._pins) else None
+        view = DataView(pin.currentData() if pin is not None else None)
+        self.model.setView(view)
+        if pin is None:
+            self.statusLabel.setText("No pin selected")
+        else:
+            self.statusLabel.setText(f"{type(view.data).__name__}: {view.rowCount()} rows x {view.columnCount()} columns")
+
+    def _onFormatChanged(self, *args):
+        self.model.setFormat(self.styleCombo.currentText(), self.precisionSpin.value())
+
+    def findNext(self):
+        """从当前行的下一行开始查找"""
+        text = self.searchEdit.text()
+        view = self.model.view
+        if not text or view.rowCount() == 0:
+            return
+        self.cancelSearch()
+        current = self.table.currentIndex()
+        start = current.row() + 1 if current.isValid() else 0
+        job = TimeSlicedJob(iterSearch(view, text, start))
+
+        def onFinished():
+            self._search = None
+            if job.result < 0:
+                self.statusLabel.setText(f"'{text}' not found")
+                return
+            self.model.ensureLoaded(job.result)
+            index = self.model.index(job.result, 0)
+            self.table.setCurrentIndex(index)
+            self.table.scrollTo(index, QTableView.PositionAtCenter)
+            self.statusLabel.setText(f"Found at row {job.result}")
+
+        job.onProgress = lambda done, total: self.statusLabel.setText(f"Searching {done}/{total}...")
+        job.onFinished = onFinished
+        job.onFailed = lambda error: self.statusLabel.setText(f"Search failed: {error}")
+        self._search = job
+        TaskPump.instance().schedule(job)
+
+    def cancelSearch(self):
+        """取消正在进行的搜索"""
+        if self._search is not None:
+            self._search.cancel()
+            self._search = None
+
+    def shutdown(self):
+        """取消搜索并释放数据引用"""
+        self.cancelSearch()
+        self._pins = []
+        self.model.setView(DataView(None))
@@ -0,0 +1,182 @@
+"""
+LogConsoleWidget - 节点输出控制台
+
+DemoLogDockTool 的面板内容：显示 LogCapture 捕获的节点输出。
+
+限速渲染：
+- 执行线程只写入环形缓冲区（Core/LogCapture.py），不触发任何界面操作
+- 界面每 FRAME_MS 毫秒取出新条目，拼接后一次性追加到文本控件
+- 一帧内新条目过多时只显示最后 MAX_LINES_PER_FRAME 行
+- 连续重复的行显示为一行并附带重复次数，次数变化时只改写最后一行
+- 文本控件的行数上限等于缓冲区容量，旧行自动丢弃
+"""
+
+from qtpy import QtCore, QtGui
+from qtpy.QtWidgets import QCheckBox, QComboBox, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton, QVBoxLayout, QWidget
+
+from ..Core.LogCapture import logCapture
+
+ALL_NODES = "All nodes"
+NO_NODE = "(no node)"
+
+
+def formatEntry(entry):
+    """
+    格式化一条日志
+
+    参数：
+        entry (LogEntry): 日志条目
+
+    返回：
+        str: 例如 "[demoLibGreet] Greet!  (x120)"
+    """
+    prefix = f"[{entry.node}] " if entry.node else ""
+    level = f"{entry.level.upper()}: " if entry.level in ("warning", "error") else ""
+    suffix = f"  (x{entry.count})" if entry.count > 1 else ""
+    return f"{prefix}{level}{entry.text}{suffix}"
+
+
+class LogConsoleWidget(QWidget):
+    """
+    输出控制台
+
+    关键方法：
+    - setCapturing(bool): 开始/停止捕获
+    - flush(): 渲染新条目（由定时器调用）
+    - rebuild(): 按当前过滤条件重新渲染全部条目
+    """
+
+    #: 渲染间隔（毫秒，约 10 帧/秒）
+    FRAME_MS = 100
+
+    #: 每帧最多追加的行数
+    MAX_LINES_PER_FRAME = 2000
+
+    def __init__(self, parent=None):
+        super(LogConsoleWidget, self).__init__(parent)
+        self.capture = logCapture()
+        self._lastSeq = 0
+        self._lastEntry = None
+        self._lastCount = 0
+        self._knownNodes = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        toolbar = QHBoxLayout()
+        self.captureButton = QPushButton("Capture")
+        self.captureButton.setCheckable(True)
+        self.captureButton.toggled.connect(self.setCapturing)
+        clearButton = QPushButton("Clear")
+        clearButton.clicked.connect(self.clear)
+        self.echoCheck = QCheckBox("Echo to terminal")
+        self.echoCheck.toggled.connect(lambda on: setattr(self.capture, "echo", on))
+        self.nodeCombo = QComboBox()
+        self.nodeCombo.addItem(ALL_NODES)
+        self.nodeCombo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.nodeCombo.currentTextChanged.connect(lambda text: self.rebuild())
+        self.statusLabel = QLabel()
+        toolbar.addWidget(self.captureButton)
+        toolbar.addWidget(clearButton)
+        toolbar.addWidget(self.echoCheck)
+        toolbar.addWidget(self.nodeCombo)
+        toolbar.addStretch()
+        toolbar.addWidget(self.statusLabel)
+        layout.addLayout(toolbar)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setUndoRedoEnabled(False)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text.setMaximumBlockCount(self.capture.buffer.capacity)
+        self.text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        layout.addWidget(self.text)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.FRAME_MS)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+        self.captureButton.setChecked(self.capture.isCapturing())
+
+    def setCapturing(self, capturing):
+        """
+        开始/停止捕获
+
+        参数：
+            capturing (bool): True 开始，False 停止
+        """
+        self.captureButton.setText("Stop" if capturing else "Capture")
+        if capturing:
+            self.capture.start()
+        else:
+            self.capture.stop()
+            self.flush()
+
+    def _accepts(self, entry):
+        selected = self.nodeCombo.currentText()
+        if selected == ALL_NODES:
+            return True
+        return entry.node == ("" if selected == NO_NODE else selected)
+
+    def _atBottom(self):
+        bar = self.text.verticalScrollBar()
+        return bar.value() >= bar.maximum() - 2
+
+    def flush(self):
+        """渲染自上一帧以来的新条目"""
+        buffer = self.capture.buffer
+        entries = buffer.since(self._lastSeq)
+        follow = self._atBottom()
+
+        last = self._lastEntry
+        if last is not None and last.count != self._lastCount:
+            # 最后一行的重复次数变化：只改写最后一行
+            cursor = self.text.textCursor()
+            cursor.movePosition(QtGui.QTextCursor.End)
+            cursor.movePosition(QtGui.QTextCursor.StartOfBlock, QtGui.QTextCursor.KeepAnchor)
+            cursor.insertText(formatEntry(last))
+            self._lastCount = last.count
+
+        if entries:
+            self._lastSeq = entries[-1].seq
+            shown = [e for e in entries if self._accepts(e)][-self.MAX_LINES_PER_FRAME :]
+            if shown:
+                self.text.appendPlainText("\n".join(formatEntry(e) for e in shown))
+                self._lastEntry = shown[-1]
+                self._lastCount = shown[-1].count
+
+        if follow and (entries or last is not None):
+            self.text.verticalScrollBar().setValue(self.text.verticalScrollBar().maximum())
+        if len(buffer.nodes) != self._knownNodes:
+            self._updateNodes()
+        self.statusLabel.setText(f"{self.text.blockCount()} lines")
+
+    def _updateNodes(self):
+        nodes = sorted(self.capture.buffer.nodes)
+        self._knownNodes = len(nodes)
+        current = self.nodeCombo.currentText()
+        self.nodeCombo.blockSignals(True)
+        self.nodeCombo.clear()
+        self.nodeCombo.addItem(ALL_NODES)
+        self.nodeCombo.addItems([n or NO_NODE for n in nodes])
+        self.nodeCombo.setCurrentText(current)
+        self.nodeCombo.blockSignals(False)
+
+    def rebuild(self):
+        """按当前过滤条件重新渲染缓冲区中的全部条目"""
+        self.text.clear()
+        self._lastSeq = 0
+        self._lastEntry = None
+        self._lastCount = 0
+        self.flush()
+
+    def clear(self):
+        """清空缓冲区和控制台"""
+        self.capture.buffer.clear()
+        self._knownNodes = -1
+        self.rebuild()
+
+    def shutdown(self):
+        """停止渲染和捕获，恢复标准输出"""
+        self._timer.stop()
+        self.captureButton.setChecked(False)
+        self.capture.stop()
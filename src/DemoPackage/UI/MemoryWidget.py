@@ -0,0 +1,200 @@
+"""
+MemoryWidget - 引脚数据内存面板
+
+DemoDockTool 中的 "Memory" 标签页。点击 "Scan" 遍历活动图中所有引脚的当前数据，
+估算内存占用（见 Core/MemoryUsage.py），可以切换三种视图：
+- Largest pins: 占用最大的引脚
+- By node: 按节点汇总
+- By pin type: 按引脚数据类型汇总（如 DemoPin）
+
+扫描在主线程中按时间片执行（TimeSlicedJob + TaskPump），
+读取引脚数据不需要跨线程，大图扫描时界面也保持响应，可以随时取消。
+"""
+
+from qtpy import QtCore
+from qtpy.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPushButton, QTableView, QVBoxLayout, QWidget
+
+from ..Core.MemoryUsage import MemoryReport, formatSize, iterPinUsage
+from ..Core.Tasks import TimeSlicedJob
+from .TaskPump import TaskPump
+
+#: 视图名称 -> (列标题, 行数据函数)
+VIEWS = {
+    "Largest pins": (
+        ("Node", "Pin", "Direction", "Pin type", "Value type", "Size"),
+        lambda u: (u.nodeName, u.pinName, u.direction, u.dataType, u.valueType, u.size),
+    ),
+    "By node": (("Node", "Pins", "Size"), lambda g: (g.key, g.pins, g.size)),
+    "By pin type": (("Pin type", "Pins", "Size"), lambda g: (g.key, g.pins, g.size)),
+}
+
+
+class MemoryTableModel(QtCore.QAbstractTableModel):
+    """
+    内存统计表格模型
+
+    每行是一个元组，最后一列是字节数（显示时格式化，排序按原始数值）。
+    """
+
+    def __init__(self, parent=None):
+        super(MemoryTableModel, self).__init__(parent)
+        self._columns = ()
+        self._rows = []
+
+    def setRows(self, columns, rows):
+        """
+        替换表格数据
+
+        参数：
+            columns (tuple): 列标题
+            rows (list): 行元组列表
+        """
+        self.beginResetModel()
+        self._columns = columns
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self._columns[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        isSize = index.column() == len(self._columns) - 1
+        if role == QtCore.Qt.DisplayRole:
+            return formatSize(value) if isSize else str(value)
+        if role == QtCore.Qt.TextAlignmentRole and isinstance(value, int):
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._rows.sort(key=lambda row: row[column], reverse=order == QtCore.Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+
+class MemoryWidget(QWidget):
+    """
+    内存面板
+
+    关键方法：
+    - scan(): 开始扫描活动图
+    - cancel(): 取消正在进行的扫描
+    - showView(name): 切换视图
+    """
+
+    #: "Largest pins" 视图显示的行数
+    LARGEST_COUNT = 200
+
+    def __init__(self, graphProvider, parent=None):
+        """
+        初始化面板
+
+        参数：
+            graphProvider: 无参数函数，返回要扫描的图（没有活动图时返回 None）
+        """
+        super(MemoryWidget, self).__init__(parent)
+        self.graphProvider = graphProvider
+        self.report = MemoryReport()
+        self._job = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        toolbar = QHBoxLayout()
+        self.scanButton = QPushButton("Scan")
+        self.scanButton.clicked.connect(self.scan)
+        self.cancelButton = QPushButton("Cancel")
+        self.cancelButton.setEnabled(False)
+        self.cancelButton.clicked.connect(self.cancel)
+        self.viewCombo = QComboBox()
+        self.viewCombo.addItems(list(VIEWS))
+        self.viewCombo.currentTextChanged.connect(self.showView)
+        self.statusLabel = QLabel("Not scanned")
+        toolbar.addWidget(self.scanButton)
+        toolbar.addWidget(self.cancelButton)
+        toolbar.addWidget(self.viewCombo)
+        toolbar.addStretch()
+        toolbar.addWidget(self.statusLabel)
+        layout.addLayout(toolbar)
+
+        self.model = MemoryTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+    def scan(self):
+        """开始扫描活动图（按时间片执行）"""
+        graph = self.graphProvider()
+        if graph is None or self._job is not None:
+            return
+        report = MemoryReport()
+        total = len(graph.getNodesList())
+
+        def work():
+            done = 0
+            lastNode = None
+            for usage in iterPinUsage(graph):
+                report.add(usage)
+                if usage.nodeUid != lastNode:
+                    lastNode = usage.nodeUid
+                    done += 1
+                yield (done, total)
+
+        def finished():
+            self.report = report
+            self._setIdle(f"{len(report.pins)} pins, {formatSize(report.total)}")
+            self.showView(self.viewCombo.currentText())
+
+        self._job = TimeSlicedJob(work())
+        self._job.onProgress = lambda done, total: self.statusLabel.setText(f"Scanning {done}/{total} nodes...")
+        self._job.onFinished = finished
+        self._job.onCancelled = lambda: self._setIdle("Scan cancelled")
+        self._job.onFailed = lambda error: self._setIdle(f"Scan failed: {error}")
+        self.scanButton.setEnabled(False)
+        self.cancelButton.setEnabled(True)
+        TaskPump.instance().schedule(self._job)
+
+    def cancel(self):
+        """取消正在进行的扫描"""
+        if self._job is not None:
+            self._job.cancel()
+
+    def _setIdle(self, message):
+        self._job = None
+        self.scanButton.setEnabled(True)
+        self.cancelButton.setEnabled(False)
+        self.statusLabel.setText(message)
+
+    def showView(self, name):
+        """
+        切换视图
+
+        参数：
+            name (str): VIEWS 中的视图名称
+        """
+        columns, rowOf = VIEWS[name]
+        if name == "Largest pins":
+            items = self.report.largest(self.LARGEST_COUNT)
+        elif name == "By node":
+            items = self.report.byNode()
+        else:
+            items = self.report.byType()
+        self.model.setRows(columns, [rowOf(item) for item in items])
+
+    def shutdown(self):
+        """取消扫描并释放统计结果"""
+        self.cancel()
+        self.report = MemoryReport()
+        self.model.setRows((), [])
@@ -0,0 +1,200 @@
+"""
+ProfilerWidget - 节点性能分析面板
+
+DemoDockTool 中的 "Profiler" 标签页。显示 NodeProfiler 聚合的每节点统计：
+调用次数、总耗时、平均耗时、p95 耗时和自身耗时，表格可按任意列排序。
+
+刷新策略：
+- 采样在执行线程中写入环形缓冲区，不触发任何 UI 操作
+- 界面由 QTimer 每 REFRESH_MS 毫秒聚合一次并刷新表格
+
+热力图：
+- 勾选 "Heatmap" 后按总耗时给画布上的节点标题栏着色（绿 -> 红）
+- 取消勾选或停止分析时恢复节点原本的颜色
+"""
+
+from qtpy import QtCore, QtGui
+from qtpy.QtWidgets import QCheckBox, QHBoxLayout, QLabel, QPushButton, QTableView, QVBoxLayout, QWidget
+
+from ..Core.Profiler import NodeProfiler
+
+COLUMNS = ("Node", "Calls", "Total (ms)", "Mean (ms)", "p95 (ms)", "Self (ms)")
+FIELDS = ("name", "count", "total", "mean", "p95", "self")
+
+
+class ProfileTableModel(QtCore.QAbstractTableModel):
+    """
+    统计表格模型
+
+    只保存当前一次聚合的结果，排序在模型内部完成。
+    """
+
+    def __init__(self, parent=None):
+        super(ProfileTableModel, self).__init__(parent)
+        self._rows = []
+        self._sortColumn = 2
+        self._sortOrder = QtCore.Qt.DescendingOrder
+
+    def setRows(self, rows):
+        """
+        替换表格数据
+
+        参数：
+            rows (list): NodeStats 列表
+        """
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._applySort()
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = getattr(self._rows[index.row()], FIELDS[index.column()])
+        if role == QtCore.Qt.DisplayRole:
+            return f"{value:.3f}" if isinstance(value, float) else str(value)
+        if role == QtCore.Qt.TextAlignmentRole and index.column() > 0:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self._sortColumn = column
+        self._sortOrder = order
+        self.layoutAboutToBeChanged.emit()
+        self._applySort()
+        self.layoutChanged.emit()
+
+    def _applySort(self):
+        key = FIELDS[self._sortColumn]
+        self._rows.sort(key=lambda s: getattr(s, key), reverse=self._sortOrder == QtCore.Qt.DescendingOrder)
+
+
+class ProfilerWidget(QWidget):
+    """
+    性能分析面板
+
+    关键方法：
+    - setRunning(bool): 开始/停止采样
+    - refresh(): 聚合并刷新表格（由定时器调用）
+    - shutdown(): 停止采样并恢复节点颜色（面板关闭时调用）
+    """
+
+    #: 表格刷新间隔（毫秒）
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super(ProfilerWidget, self).__init__(parent)
+        self.profiler = NodeProfiler()
+        self._tinted = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        toolbar = QHBoxLayout()
+        self.runButton = QPushButton("Start")
+        self.runButton.setCheckable(True)
+        self.runButton.toggled.connect(self.setRunning)
+        resetButton = QPushButton("Reset")
+        resetButton.clicked.connect(self.reset)
+        self.heatmapCheck = QCheckBox("Heatmap")
+        self.heatmapCheck.toggled.connect(lambda on: self.refresh() if on else self.clearHeatmap())
+        self.statusLabel = QLabel("0 samples")
+        toolbar.addWidget(self.runButton)
+        toolbar.addWidget(resetButton)
+        toolbar.addWidget(self.heatmapCheck)
+        toolbar.addStretch()
+        toolbar.addWidget(self.statusLabel)
+        layout.addLayout(toolbar)
+
+        self.model = ProfileTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(2, QtCore.Qt.DescendingOrder)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def setRunning(self, running):
+        """
+        开始/停止采样
+
+        参数：
+            running (bool): True 开始，False 停止
+        """
+        self.runButton.setText("Stop" if running else "Start")
+        if running:
+            self.profiler.start()
+            self._timer.start()
+        else:
+            self.profiler.stop()
+            self._timer.stop()
+            self.refresh()
+
+    def reset(self):
+        """清空样本和表格"""
+        self.profiler.reset()
+        self.clearHeatmap()
+        self.refresh()
+
+    def refresh(self):
+        """聚合样本并刷新表格（和热力图）"""
+        stats = self.profiler.summary()
+        self.model.setRows(stats)
+        self.statusLabel.setText(f"{self.profiler.sampleCount()} samples")
+        if self.heatmapCheck.isChecked():
+            self.applyHeatmap(stats)
+
+    def applyHeatmap(self, stats):
+        """
+        按总耗时给节点着色
+
+        参数：
+            stats (list): NodeStats 列表
+        """
+        if not stats:
+            return
+        peak = max(s.total for s in stats) or 1.0
+        for s in stats:
+            uiNode = self._uiNode(s.uid)
+            if uiNode is None:
+                continue
+            if s.uid not in self._tinted:
+                self._tinted[s.uid] = uiNode.headColorOverride
+            heat = s.total / peak
+            uiNode.headColorOverride = QtGui.QColor.fromHsvF((1.0 - heat) / 3.0, 0.8, 0.9)
+            uiNode.update()
+
+    def clearHeatmap(self):
+        """恢复被着色节点的原始颜色"""
+        for uid, original in self._tinted.items():
+            uiNode = self._uiNode(uid)
+            if uiNode is not None:
+                uiNode.headColorOverride = original
+                uiNode.update()
+        self._tinted.clear()
+
+    def _uiNode(self, uid):
+        node = self.profiler.nodeByUid(uid)
+        return node.getWrapper() if node is not None else None
+
+    def shutdown(self):
+        """停止采样、定时器并恢复节点颜色"""
+        self.runButton.setChecked(False)
+        self.profiler.stop()
+        self._timer.stop()
+        self.clearHeatmap()
@@ -0,0 +1,89 @@
+"""
+StressGraphDialog - 压力测试图参数对话框
+
+DemoStressShelfTool 使用的参数对话框：选择图的形状和规模，
+生成对应的合成快照（见 Core/SyntheticGraphs.py）。
+"""
+
+from qtpy.QtWidgets import QComboBox, QDialog, QDialogButtonBox, QDoubleSpinBox, QFormLayout, QSpinBox
+
+from ..Core.SyntheticGraphs import makeChains, makeRandomDag, makeTree
+
+SHAPES = ("Chains", "Tree", "Random DAG")
+
+
+class StressGraphDialog(QDialog):
+    """
+    压力测试图参数对话框
+
+    关键方法：
+    - snapshot(): 按当前参数生成快照
+    """
+
+    def __init__(self, parent=None):
+        super(StressGraphDialog, self).__init__(parent)
+        self.setWindowTitle("Generate stress graph")
+        layout = QFormLayout(self)
+
+        self.shapeCombo = QComboBox()
+        self.shapeCombo.addItems(SHAPES)
+        self.shapeCombo.currentTextChanged.connect(self._onShapeChanged)
+        self.sizeSpin = self._spin(1, 1000000, 1000)
+        self.chainsSpin = self._spin(1, 10000, 10)
+        self.fanInSpin = self._spin(1, 64, 2)
+        self.fanOutSpin = self._spin(1, 64, 2)
+        self.greetSpin = QDoubleSpinBox()
+        self.greetSpin.setRange(0.0, 1.0)
+        self.greetSpin.setSingleStep(0.05)
+        self.seedSpin = self._spin(0, 2 ** 31 - 1, 0)
+
+        layout.addRow("Shape", self.shapeCombo)
+        layout.addRow("Nodes", self.sizeSpin)
+        layout.addRow("Chains", self.chainsSpin)
+        layout.addRow("Exec fan-in", self.fanInSpin)
+        layout.addRow("Data fan-out", self.fanOutSpin)
+        layout.addRow("Greet ratio", self.greetSpin)
+        layout.addRow("Seed", self.seedSpin)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+        self._onShapeChanged(self.shapeCombo.currentText())
+
+    @staticmethod
+    def _spin(low, high, value):
+        spin = QSpinBox()
+        spin.setRange(low, high)
+        spin.setValue(value)
+        return spin
+
+    def _onShapeChanged(self, shape):
+        self.chainsSpin.setEnabled(shape == "Chains")
+        self.fanInSpin.setEnabled(shape == "Random DAG")
+        self.fanOutSpin.setEnabled(shape != "Chains")
+        self.greetSpin.setEnabled(shape == "Random DAG")
+        self.seedSpin.setEnabled(shape == "Random DAG")
+
+    def snapshot(self):
+        """
+        按当前参数生成快照
+
+        返回：
+            GraphSnapshot: 合成图（Chains 形状下节点总数会向下取整为链数的整数倍）
+        """
+        shape = self.shapeCombo.currentText()
+        size = self.sizeSpin.value()
+        if shape == "Chains":
+            count = self.chainsSpin.value()
+            return makeChains(count, max(1, size // count), name="stress")
+        if shape == "Tree":
+            return makeTree(size, self.fanOutSpin.value(), name="stress")
+        return makeRandomDag(
+            size,
+            fanIn=self.fanInSpin.value(),
+            fanOut=self.fanOutSpin.value(),
+            greetRatio=self.greetSpin.value(),
+            seed=self.seedSpin.value(),
+            name="stress",
+        )
@@ -0,0 +1,104 @@
+"""
+TaskPump - 主线程任务泵
+
+用一个 QTimer 在主线程中周期性地：
+- 分发后台任务（BackgroundTask）排队的进度和结果事件
+- 推进时间片任务（TimeSlicedJob）
+
+这样工作线程永远不会直接调用 Qt 控件，所有 UI 更新都发生在主线程。
+没有待处理任务时定时器自动停止，不占用 CPU。
+
+导入本模块时把 watch 注册为 Core 的主线程事件泵（Core/Tasks.py 的 setMainThreadPump），
+不依赖 Qt 的 Core 代码（如 Core/ProcessOffload.py 的节点混入）可以把结果交回主线程。
+
+使用方式：
+    pump = TaskPump.instance()
+    pump.watch(backgroundTask)
+    pump.schedule(timeSlicedJob)
+"""
+
+from qtpy import QtCore
+
+from ..Core.Tasks import setMainThreadPump
+
+
+class TaskPump(QtCore.QObject):
+    """
+    主线程任务泵（单例）
+
+    关键方法：
+    - instance(): 获取单例
+    - watch(task): 开始轮询后台任务的事件
+    - schedule(job): 开始按时间片执行任务
+    - isScheduled(job): 任务是否仍在执行
+    """
+
+    _instance = None
+
+    #: 定时器间隔（毫秒）
+    INTERVAL_MS = 15
+
+    def __init__(self, parent=None):
+        super(TaskPump, self).__init__(parent)
+        self._tasks = []
+        self._jobs = []
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    @staticmethod
+    def instance():
+        """
+        获取任务泵单例
+
+        返回：
+            TaskPump: 单例对象
+        """
+        if TaskPump._instance is None:
+            TaskPump._instance = TaskPump()
+        return TaskPump._instance
+
+    def watch(self, task):
+        """
+        轮询后台任务的事件
+
+        参数：
+            task (BackgroundTask): 已启动的后台任务
+        """
+        self._tasks.append(task)
+        self._timer.start()
+
+    def schedule(self, job):
+        """
+        按时间片执行任务
+
+        参数：
+            job (TimeSlicedJob): 时间片任务
+        """
+        self._jobs.append(job)
+        self._timer.start()
+
+    def isScheduled(self, job):
+        """
+        任务是否仍在按时间片执行
+
+        参数：
+            job: 之前传给 schedule() 的任务
+
+        返回：
+            bool: True 表示任务还没有结束
+        """
+        return any(j is job for j in self._jobs)
+
+    def _tick(self):
+        self._tasks = [t for t in self._tasks if t.pollEvents()]
+        self._jobs = [j for j in self._jobs if j.step()]
+        if not self._tasks and not self._jobs:
+            self._timer.stop()
+
+
+def _watch(task):
+    TaskPump.instance().watch(task)
+
+
+setMainThreadPump(_watch)
@@ -0,0 +1,86 @@
+"""
+TraceWidget - 执行追踪面板
+
+DemoDockTool 中的 "Trace" 标签页，控制进程内共享的 TraceRecorder：
+开始/停止记录、清空缓冲区、保存为 Chrome trace-event JSON。
+
+与 DemoTraceShelfTool（工具栏上的追踪开关）控制的是同一个记录器，
+状态标签每 REFRESH_MS 毫秒刷新一次。
+"""
+
+from qtpy import QtCore
+from qtpy.QtWidgets import QFileDialog, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+
+from ..Core.Tracing import traceRecorder
+
+
+class TraceWidget(QWidget):
+    """
+    追踪控制面板
+
+    关键方法：
+    - toggle(): 开始/停止记录
+    - save(): 保存追踪文件
+    """
+
+    #: 状态刷新间隔（毫秒）
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super(TraceWidget, self).__init__(parent)
+        self.recorder = traceRecorder()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        toolbar = QHBoxLayout()
+        self.recordButton = QPushButton()
+        self.recordButton.clicked.connect(self.toggle)
+        clearButton = QPushButton("Clear")
+        clearButton.clicked.connect(self.recorder.clear)
+        saveButton = QPushButton("Save...")
+        saveButton.clicked.connect(self.save)
+        toolbar.addWidget(self.recordButton)
+        toolbar.addWidget(clearButton)
+        toolbar.addWidget(saveButton)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        self.statusLabel = QLabel()
+        self.statusLabel.setWordWrap(True)
+        layout.addWidget(self.statusLabel)
+        layout.addWidget(QLabel("Open saved traces in https://ui.perfetto.dev or chrome://tracing"))
+        layout.addStretch()
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.updateStatus)
+        self._timer.start()
+        self.updateStatus()
+
+    def toggle(self):
+        """开始/停止记录"""
+        if self.recorder.isRecording():
+            self.recorder.stop()
+        else:
+            self.recorder.start()
+        self.updateStatus()
+
+    def save(self):
+        """选择文件并保存追踪数据"""
+        filePath, _ = QFileDialog.getSaveFileName(self, "Save trace", "trace.json", "Trace Files (*.json)")
+        if filePath:
+            count = self.recorder.dump(filePath)
+            print(f"Saved {count} trace events to {filePath}")
+
+    def updateStatus(self):
+        """刷新按钮文字和状态标签"""
+        recording = self.recorder.isRecording()
+        self.recordButton.setText("Stop" if recording else "Record")
+        text = f"{'Recording' if recording else 'Idle'}: {self.recorder.eventCount()} / {self.recorder.capacity} events"
+        if self.recorder.dropped():
+            text += f", {self.recorder.dropped()} dropped (buffer full)"
+        self.statusLabel.setText(text)
+
+    def shutdown(self):
+        """停止状态刷新（面板关闭时调用，不影响记录器本身）"""
+        self._timer.stop()